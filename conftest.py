@@ -8,6 +8,7 @@ pytest_plugins = [
     'pytest_plugins.disable_rp_params',
     'pytest_plugins.external_logging',
     'pytest_plugins.fixture_markers',
+    'pytest_plugins.func_locker_metrics',
     'pytest_plugins.infra_dependent_markers',
     'pytest_plugins.issue_handlers',
     'pytest_plugins.logging_hooks',
@@ -25,6 +26,8 @@ pytest_plugins = [
     'pytest_plugins.jira_comments',
     'pytest_plugins.select_random_tests',
     'pytest_plugins.capsule_n-minus',
+    'pytest_plugins.xdist_scheduler',
+    'pytest_plugins.duration_store',
     # Fixtures
     'pytest_fixtures.core.broker',
     'pytest_fixtures.core.sat_cap_factory',
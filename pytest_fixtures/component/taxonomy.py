@@ -4,6 +4,7 @@ import pytest
 
 from robottelo.config import settings
 from robottelo.constants import DEFAULT_LOC, DEFAULT_ORG
+from robottelo.utils.decorators.func_shared import shared_fixture
 from robottelo.utils.manifest import clone
 
 
@@ -95,6 +96,20 @@ def module_sca_manifest_org(module_org, module_sca_manifest, module_target_sat):
     return module_org
 
 
+@pytest.fixture(scope='module')
+@shared_fixture
+def shared_sca_manifest_org(module_target_sat):
+    """Creates an organization and uploads an SCA mode manifest generated with manifester
+
+    The organization is shared by the xdist workers using the same Satellite when
+    ``shared_function.enabled`` is set, tests must not change it.
+    """
+    org = module_target_sat.api.Organization().create()
+    with Manifester(manifest_category=settings.manifest.golden_ticket) as manifest:
+        module_target_sat.upload_manifest(org.id, manifest.content)
+        yield org
+
+
 @pytest.fixture(scope='class')
 def class_sca_manifest_org(class_org, class_sca_manifest, class_target_sat):
     """Creates an organization and uploads an SCA mode manifest generated with manifester"""
@@ -10,7 +10,7 @@ import pytest
 
 from robottelo import constants
 from robottelo.config import settings
-from robottelo.hosts import ContentHost, Satellite
+from robottelo.hosts import ContentHost, HostGroup, Satellite
 
 
 def host_conf(request):
@@ -113,7 +113,7 @@ def content_hosts(request):
     """A function-level fixture that provides two rhel content hosts object"""
     with Broker(**host_conf(request), host_class=ContentHost, _count=2) as hosts:
         hosts[0].set_infrastructure_type('physical')
-        yield hosts
+        yield HostGroup(hosts)
 
 
 @pytest.fixture(scope='module')
@@ -121,18 +121,22 @@ def mod_content_hosts(request):
     """A module-level fixture that provides two rhel content hosts object"""
     with Broker(**host_conf(request), host_class=ContentHost, _count=2) as hosts:
         hosts[0].set_infrastructure_type('physical')
-        yield hosts
+        yield HostGroup(hosts)
 
 
 @pytest.fixture
 def registered_hosts(request, target_sat, module_org, module_ak_with_cv):
     """Fixture that registers content hosts to Satellite, based on rh_cloud setup"""
+
+    def register(vm):
+        repo = settings.repos['SATCLIENT_REPO'][f'RHEL{vm.os_version.major}']
+        return vm.register(
+            module_org, None, module_ak_with_cv.name, target_sat, repo_data=f'repo={repo}'
+        )
+
     with Broker(**host_conf(request), host_class=ContentHost, _count=2) as hosts:
-        for vm in hosts:
-            repo = settings.repos['SATCLIENT_REPO'][f'RHEL{vm.os_version.major}']
-            vm.register(
-                module_org, None, module_ak_with_cv.name, target_sat, repo_data=f'repo={repo}'
-            )
+        hosts = HostGroup(hosts)
+        hosts.run(register).raise_for_errors()
         yield hosts
 
 
@@ -182,12 +186,16 @@ def rex_contenthost(request, module_org, target_sat, module_ak_with_cv):
 @pytest.fixture
 def rex_contenthosts(request, module_org, target_sat, module_ak_with_cv):
     request.param['no_containers'] = True
+
+    def register(host):
+        repo = settings.repos['SATCLIENT_REPO'][f'RHEL{host.os_version.major}']
+        return host.register(
+            module_org, None, module_ak_with_cv.name, target_sat, repo_data=f'repo={repo}'
+        )
+
     with Broker(**host_conf(request), host_class=ContentHost, _count=2) as hosts:
-        for host in hosts:
-            repo = settings.repos['SATCLIENT_REPO'][f'RHEL{host.os_version.major}']
-            host.register(
-                module_org, None, module_ak_with_cv.name, target_sat, repo_data=f'repo={repo}'
-            )
+        hosts = HostGroup(hosts)
+        hosts.run(register).raise_for_errors()
         yield hosts
 
 
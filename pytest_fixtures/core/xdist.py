@@ -48,7 +48,9 @@ def align_to_satellite(request, worker_id, satellite_factory):
         elif settings.server.hostnames and worker_pos < len(settings.server.hostnames):
             settings.set("server.hostname", settings.server.hostnames[worker_pos])
         elif settings.server.xdist_behavior == 'balance' and settings.server.hostnames:
-            settings.set("server.hostname", random.choice(settings.server.hostnames))
+            # spread the workers evenly, each Satellite gets the same share of the tests
+            hostnames = settings.server.hostnames
+            settings.set("server.hostname", hostnames[worker_pos % len(hostnames)])
         # get current satellite information
         elif settings.server.xdist_behavior == 'on-demand':
             on_demand_sat = satellite_factory()
@@ -0,0 +1,87 @@
+"""Record the durations of every run in the duration store.
+
+The processes running tests, the xdist workers or the single pytest process,
+record the duration and outcome of the setup, call and teardown phases of
+every test and the setup time of every fixture, with the worker id and the
+Satellite hostname. The rows are written in one transaction at the end of the
+session to the SQLite database of :func:`robottelo.utils.durations.get_store`,
+``scripts/duration_report.py`` reports the trends and regressions.
+"""
+
+import sqlite3
+import time
+import uuid
+
+import pytest
+
+from robottelo.config import settings
+from robottelo.logging import logger
+from robottelo.utils.durations import get_store
+
+_run = {}
+_phases = []
+_fixtures = []
+
+
+def _is_recording(config):
+    """Only the processes running tests record them, not the xdist controller"""
+    return hasattr(config, 'workerinput') or not getattr(config.option, 'numprocesses', None)
+
+
+def _hostname():
+    return settings.server.hostname
+
+
+def pytest_configure(config):
+    if not _is_recording(config):
+        return
+    workerinput = getattr(config, 'workerinput', {})
+    # all the workers of a run share the run id of the controller
+    _run.update(
+        run_id=workerinput.get('testrunuid') or uuid.uuid4().hex,
+        worker=workerinput.get('workerid', 'master'),
+        started_at=time.time(),
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    start = time.monotonic()
+    yield
+    if _run:
+        _fixtures.append(
+            (
+                request.node.nodeid,
+                fixturedef.argname,
+                fixturedef.scope,
+                time.monotonic() - start,
+                _run['worker'],
+                _hostname(),
+            )
+        )
+
+
+def pytest_runtest_logreport(report):
+    if _run:
+        _phases.append(
+            (
+                report.nodeid,
+                report.when,
+                report.duration,
+                report.outcome,
+                _run['worker'],
+                _hostname(),
+            )
+        )
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Write the durations of the session to the duration store"""
+    if not _run or not _phases:
+        return
+    try:
+        get_store().record(_run['run_id'], _run['started_at'], _phases, _fixtures)
+    except sqlite3.Error as err:
+        logger.warning(f'Could not record the test durations: {err}')
+    else:
+        logger.debug(f'Recorded {len(_phases)} test phases of run {_run["run_id"]}')
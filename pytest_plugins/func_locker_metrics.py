@@ -0,0 +1,64 @@
+"""Report the contention of the function locks at the end of the session.
+
+xdist workers send the wait and hold time histograms of their locks to the
+controller, which merges them, dumps them to ``func_locker_metrics.json`` in
+the robottelo tmp dir and lists the most waited for locks in the terminal
+summary.
+"""
+
+import json
+
+import pytest
+
+from robottelo.config import robottelo_tmp_dir
+from robottelo.logging import logger
+from robottelo.utils.decorators.func_locker import (
+    METRICS_BUCKETS,
+    get_lock_metrics,
+    merge_lock_metrics,
+)
+
+METRICS_FILE_NAME = 'func_locker_metrics.json'
+# number of locks listed in the terminal summary
+SUMMARY_SIZE = 10
+
+_workers_metrics = {}
+
+
+def _is_worker(config):
+    return hasattr(config, 'workerinput')
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Send the lock metrics of a worker to the controller"""
+    if _is_worker(session.config):
+        session.config.workeroutput['func_locker_metrics'] = json.dumps(get_lock_metrics())
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Merge the lock metrics sent by a worker"""
+    if metrics := getattr(node, 'workeroutput', {}).get('func_locker_metrics'):
+        merge_lock_metrics(_workers_metrics, json.loads(metrics))
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Dump the lock metrics of the session and list the most waited for locks"""
+    if _is_worker(config):
+        return
+    metrics = merge_lock_metrics(merge_lock_metrics({}, _workers_metrics), get_lock_metrics())
+    if not metrics:
+        return
+    metrics_file = robottelo_tmp_dir.joinpath(METRICS_FILE_NAME)
+    metrics_file.write_text(json.dumps({'buckets': METRICS_BUCKETS, 'locks': metrics}, indent=2))
+    logger.info(f'Function lock metrics dumped to {metrics_file}')
+    terminalreporter.section('function lock contention')
+    ranked = sorted(metrics.items(), key=lambda item: item[1]['wait']['total'], reverse=True)
+    for name, entry in ranked[:SUMMARY_SIZE]:
+        wait, hold = entry['wait'], entry['hold']
+        terminalreporter.write_line(
+            f'{name}: {wait["count"]} acquisitions, {entry["timeouts"]} timeouts, '
+            f'wait total {wait["total"]:.1f}s max {wait["max"]:.1f}s, '
+            f'hold total {hold["total"]:.1f}s max {hold["max"]:.1f}s'
+        )
+    terminalreporter.write_line(f'all locks: {metrics_file}')
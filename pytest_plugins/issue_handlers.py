@@ -1,18 +1,17 @@
 from collections import defaultdict
 from datetime import datetime
-import inspect
 import json
-import re
 
 import pytest
 
 from robottelo.config import settings
 from robottelo.logging import collection_logger as logger
-from robottelo.utils import slugify_component
+from robottelo.utils import metadata_index, slugify_component
 from robottelo.utils.issue_handlers import (
     add_workaround,
     bugzilla,
     is_open,
+    jira,
     should_deselect,
 )
 from robottelo.utils.version import VersionEncoder, search_version_key
@@ -100,35 +99,6 @@ def pytest_collection_modifyitems(session, items, config):
     items[:] = selected
 
 
-IS_OPEN = re.compile(
-    # To match `if is_open('BZ:123456'):`
-    r"\s*if\sis_open\(\S(?P<src>\D{2})\s*:\s*(?P<num>\d*)\S\)\d*"
-)
-
-NOT_IS_OPEN = re.compile(
-    # To match `if not is_open('BZ:123456'):`
-    r"\s*if\snot\sis_open\(\S(?P<src>\D{2})\s*:\s*(?P<num>\d*)\S\)\d*"
-)
-
-COMPONENT = re.compile(
-    # To match :CaseComponent: FooBar
-    r"\s*:CaseComponent:\s*(?P<component>\S*)",
-    re.IGNORECASE,
-)
-
-IMPORTANCE = re.compile(
-    # To match :CaseImportance: Critical
-    r"\s*:CaseImportance:\s*(?P<importance>\S*)",
-    re.IGNORECASE,
-)
-
-BZ = re.compile(
-    # To match :BZ: 123456, 456789
-    r"\s*:BZ:\s*(?P<bz>.*\S*)",
-    re.IGNORECASE,
-)
-
-
 def generate_issue_collection(items, config):  # pragma: no cover
     """Generates a dictionary with the usage of Issue blockers
 
@@ -189,6 +159,7 @@ def generate_issue_collection(items, config):  # pragma: no cover
             )
 
     deselect_data = {}  # a local cache for deselected tests
+    index = metadata_index.get_index()
 
     test_modules = set()
 
@@ -206,8 +177,8 @@ def generate_issue_collection(items, config):  # pragma: no cover
         test_modules.add(item.module)
         # Find matches from docstrings top-down from: module, class, function.
         mod_cls_fun = (item.module, getattr(item, 'cls', None), item.function)
-        for docstring in [d for d in map(inspect.getdoc, mod_cls_fun) if d is not None]:
-            bz_matches = BZ.findall(docstring)
+        for tokens in map(index.tokens, mod_cls_fun):
+            bz_matches = tokens.get('bz')
             if bz_matches:
                 bz_marks_to_add.extend(b.strip() for b in bz_matches[-1].split(','))
 
@@ -241,8 +212,7 @@ def generate_issue_collection(items, config):  # pragma: no cover
                 bz_marks_to_add.append(issue_key.split(':')[-1])
 
         # Then take the workarounds using `is_open` helper.
-        source = inspect.getsource(item.function)
-        if 'is_open(' in source:
+        if workarounds := index.is_open_sites(item.function):
             kwargs = {
                 'filepath': filepath,
                 'lineno': lineno,
@@ -251,8 +221,9 @@ def generate_issue_collection(items, config):  # pragma: no cover
                 'importance': importance_mark,
                 'component_mark': component_slug,
             }
-            add_workaround(collected_data, IS_OPEN.findall(source), 'is_open', **kwargs)
-            add_workaround(collected_data, NOT_IS_OPEN.findall(source), 'not is_open', **kwargs)
+            for usage in ('is_open', 'not is_open'):
+                matches = [site[1:] for site in workarounds if site[0] == usage]
+                add_workaround(collected_data, matches, usage, **kwargs)
 
         # Add BZs from tokens as a marker to enable filter e.g: "--BZ 123456"
         if bz_marks_to_add:
@@ -260,12 +231,8 @@ def generate_issue_collection(items, config):  # pragma: no cover
 
     # Take uses of `is_open` from outside of test cases e.g: SetUp methods
     for test_module in test_modules:
-        module_source = inspect.getsource(test_module)
-        component_matches = COMPONENT.findall(module_source)
-        module_component = None
-        if component_matches:
-            module_component = component_matches[0]
-        if 'is_open(' in module_source:
+        module_component = index.component(test_module)
+        if workarounds := index.is_open_sites(test_module):
             kwargs = {
                 'filepath': test_module.__file__,
                 'lineno': 1,
@@ -276,24 +243,21 @@ def generate_issue_collection(items, config):  # pragma: no cover
             def validation(data, issue, usage, **kwargs):
                 return issue not in data
 
-            add_workaround(
-                collected_data,
-                IS_OPEN.findall(module_source),
-                'is_open',
-                validation=validation,
-                **kwargs,
-            )
-            add_workaround(
-                collected_data,
-                NOT_IS_OPEN.findall(module_source),
-                'not is_open',
-                validation=validation,
-                **kwargs,
-            )
+            for usage in ('is_open', 'not is_open'):
+                add_workaround(
+                    collected_data,
+                    [site[1:] for site in workarounds if site[0] == usage],
+                    usage,
+                    validation=validation,
+                    **kwargs,
+                )
 
     # --- Collect BUGZILLA data ---
     bugzilla.collect_data_bz(collected_data, cached_data)
 
+    # --- Collect JIRA data ---
+    jira.collect_data_jira(collected_data, cached_data)
+
     # --- add deselect markers dynamically ---
     for item in items:
         issue = deselect_data.get(item.location)
@@ -5,6 +5,7 @@ import logzero
 import pytest
 from xdist import is_xdist_worker
 
+from robottelo.cli import response_cache
 from robottelo.logging import (
     DEFAULT_DATE_FORMAT,
     broker_log_setup,
@@ -76,3 +77,9 @@ def pytest_runtest_logreport(report):
     """Process the TestReport produced for each of the setup,
     call and teardown runtest phases of an item."""
     logger.info('Finished %s for test: %s, result: %s', report.when, report.nodeid, report.outcome)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Log the counters of the hammer response caches of this process"""
+    for hostname, stats in response_cache.stats().items():
+        logger.info(f'Hammer response cache of {hostname}: {stats}')
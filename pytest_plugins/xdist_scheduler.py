@@ -0,0 +1,63 @@
+"""Schedule tests on xdist workers by module, longest modules first.
+
+With ``--dist-by-duration`` the tests of a module are sent to a single worker,
+so module scoped fixtures are set up once, and workers asking for work get the
+module with the longest estimated duration left. Long modules start first and
+workers do not idle while a long module runs at the end of the session.
+
+The durations are estimated from the previous runs recorded in the duration
+store by :mod:`pytest_plugins.duration_store`, see :mod:`robottelo.utils.durations`.
+"""
+
+import pytest
+from xdist.scheduler import LoadScopeScheduling
+
+from robottelo.logging import logger
+from robottelo.utils.durations import get_estimates
+
+
+def pytest_addoption(parser):
+    """Add the --dist-by-duration option"""
+    parser.addoption(
+        '--dist-by-duration',
+        action='store_true',
+        default=False,
+        help='Distribute test modules to xdist workers, longest estimated duration first',
+    )
+
+
+class DurationScopeScheduling(LoadScopeScheduling):
+    """Load scope scheduling by module, assigning the longest module first
+
+    :param estimates: :class:`robottelo.utils.durations.DurationEstimates`
+    """
+
+    def __init__(self, config, log=None, estimates=None):
+        super().__init__(config, log)
+        self.estimates = estimates if estimates is not None else get_estimates()
+        self._scope_durations = {}
+
+    def _split_scope(self, nodeid):
+        """Group the tests by module, whatever their class"""
+        return nodeid.split('::', 1)[0]
+
+    def _scope_duration(self, scope):
+        if scope not in self._scope_durations:
+            self._scope_durations[scope] = sum(
+                self.estimates.estimate(nodeid) for nodeid in self.workqueue[scope]
+            )
+        return self._scope_durations[scope]
+
+    def _assign_work_unit(self, node):
+        """Assign the longest work unit left to a node"""
+        scope = max(self.workqueue, key=self._scope_duration)
+        self.workqueue.move_to_end(scope, last=False)
+        logger.debug(f'Scheduling {scope}, estimated to {self._scope_duration(scope):.0f}s')
+        super()._assign_work_unit(node)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if config.getoption('dist_by_duration'):
+        return DurationScopeScheduling(config, log)
+    return None
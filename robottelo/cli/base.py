@@ -5,11 +5,10 @@ import re
 from wait_for import wait_for
 
 from robottelo import ssh
-from robottelo.cli import hammer
+from robottelo.cli import hammer, hammer_shell, response_cache
 from robottelo.config import settings
 from robottelo.exceptions import CLIDataBaseError, CLIError, CLIReturnCodeError
 from robottelo.logging import logger
-from robottelo.utils.ssh import get_client
 
 
 class Base:
@@ -24,6 +23,9 @@ class Base:
     command_end = None  # extending commands like for directory to pass
     command_requires_org = False  # True when command requires organization-id
     hostname = None  # Now used for Satellite class hammer execution
+    use_hammer_shell = False  # run commands through a resident hammer process
+    create_output_fields = None  # skip info after create when its output has these fields
+    response_cache = None  # robottelo.cli.response_cache.ResponseCache for read subcommands
     logger = logger
     _db_error_regex = re.compile(r'.*INSERT INTO|.*SELECT .*FROM|.*violates foreign key')
 
@@ -33,7 +35,7 @@ class Base:
 
         Check for a non-zero return code or any stderr contents.
 
-        :param response: a result object, returned by :mod:`robottelo.utils.ssh.command`.
+        :param response: a result object, returned by :mod:`robottelo.ssh.command`.
         :param ignore_stderr: indicates whether to throw a warning in logs if
             ``stderr`` is not empty.
         :return: contents of ``stdout``.
@@ -97,6 +99,9 @@ class Base:
 
         # Extract new object ID if it was successfully created
         if len(result) > 0 and 'id' in result[0]:
+            # the create output may already carry everything the caller needs
+            if cls.create_output_fields and set(cls.create_output_fields) <= result[0].keys():
+                return result
             obj_id = result[0]['id']
 
             # Fetch new object
@@ -172,6 +177,20 @@ class Base:
 
         return (username, password)
 
+    @classmethod
+    def _hammer_arguments(cls, command, user=None, password=None, output_format=None):
+        """Build the hammer arguments, including credentials and output format"""
+        if cls.omitting_credentials:
+            user, password = None, None
+        else:
+            user, password = cls._get_username_password(user, password)
+        return '-v {} {} {} {}'.format(
+            f'-u {user}' if user else "--interactive no",
+            f'-p {password}' if password else "",
+            f'--output={output_format}' if output_format else "",
+            command,
+        )
+
     @classmethod
     def execute(
         cls,
@@ -185,36 +204,86 @@ class Base:
         return_raw_response=None,
     ):
         """Executes the cli ``command`` on the server via ssh"""
-        if cls.omitting_credentials:
-            user, password = None, None
-        else:
-            user, password = cls._get_username_password(user, password)
         time_hammer = settings.performance.time_hammer
-
-        # add time to measure hammer performance
-        cmd = 'LANG={} {} hammer -v {} {} {} {}'.format(
-            settings.robottelo.locale,
-            'time -p' if time_hammer else '',
-            f'-u {user}' if user else "--interactive no",
-            f'-p {password}' if password else "",
-            f'--output={output_format}' if output_format else "",
-            command,
-        )
-        response = ssh.command(
-            cmd,
-            hostname=hostname or cls.hostname or settings.server.hostname,
-            output_format=output_format,
-            timeout=timeout,
-        )
+        hostname = hostname or cls.hostname or settings.server.hostname
+        arguments = cls._hammer_arguments(command, user, password, output_format)
+        response = None
+        if cls.use_hammer_shell and not time_hammer:
+            # falls back to one-shot execution below when it returns None
+            response = hammer_shell.command(
+                arguments,
+                hostname=hostname,
+                credentials=(
+                    None if cls.omitting_credentials else cls._get_username_password(user, password)
+                ),
+                output_format=output_format,
+                timeout=timeout,
+                locale=settings.robottelo.locale,
+            )
+        if response is None:
+            # add time to measure hammer performance
+            cmd = 'LANG={} {} hammer {}'.format(
+                settings.robottelo.locale,
+                'time -p' if time_hammer else '',
+                arguments,
+            )
+            response = ssh.command(
+                cmd,
+                hostname=hostname,
+                output_format=output_format,
+                timeout=timeout,
+            )
+        if (
+            cls.response_cache is not None
+            and cls.command_sub not in response_cache.READ_SUBCOMMANDS
+        ):
+            # anything but a read may change the entities of this command
+            cls.response_cache.invalidate(cls.command_base)
         if return_raw_response:
             return response
         return cls._handle_response(response, ignore_stderr=ignore_stderr)
 
+    @classmethod
+    def _cached_read(cls, read, options=None, output_format=None):
+        """Return the response of the current read subcommand from the response cache
+
+        :param read: callable running the subcommand, its result is cached on a miss
+        """
+        if cls.response_cache is None:
+            return read()
+        user = None if cls.omitting_credentials else cls._get_username_password()[0]
+        key = cls.response_cache.key(cls.command_sub, options, output_format, user)
+        found, response = cls.response_cache.get(cls.command_base, key)
+        if not found:
+            response = read()
+            cls.response_cache.set(cls.command_base, key, response)
+        return response
+
+    @classmethod
+    def iter_execute(
+        cls, command, hostname=None, user=None, password=None, output_format='csv', timeout=None
+    ):
+        """Executes the cli ``command`` on the server via ssh, parsing its output
+        while it is read
+
+        :param str output_format: ``csv`` or ``json``, the output has to be a list
+        :return: generator of the rows of the output
+        :raises robottelo.exceptions.CLIReturnCodeError: If return code is
+            different from zero.
+        """
+        hostname = hostname or cls.hostname or settings.server.hostname
+        arguments = cls._hammer_arguments(command, user, password, output_format)
+        cmd = f'LANG={settings.robottelo.locale} hammer {arguments}'
+        response = ssh.stream_command(cmd, hostname=hostname, timeout=timeout)
+        parse = hammer.iter_json if output_format == 'json' else hammer.iter_csv
+        yield from parse(response)
+        cls._handle_response(response)
+
     @classmethod
     def sm_execute(cls, command, hostname=None, timeout=None, **kwargs):
         """Executes the satellite-maintain cli commands on the server via ssh"""
         env_var = kwargs.get('env_var') or ''
-        client = get_client(hostname=hostname or cls.hostname)
+        client = ssh.get_client(hostname=hostname or cls.hostname)
         return client.execute(f'{env_var} satellite-maintain {command}', timeout=timeout)
 
     @classmethod
@@ -252,14 +321,19 @@ class Base:
         if cls.command_requires_org and 'organization-id' not in options:
             raise CLIError(f'organization-id option is required for {cls.__name__}.info')
 
-        result = cls.execute(
-            command=cls._construct_command(options),
-            output_format=output_format,
-            return_raw_response=return_raw_response,
-        )
-        if not return_raw_response and output_format != 'json':
-            result = hammer.parse_info(result)
-        return result
+        def read():
+            result = cls.execute(
+                command=cls._construct_command(options),
+                output_format=output_format,
+                return_raw_response=return_raw_response,
+            )
+            if not return_raw_response and output_format != 'json':
+                result = hammer.parse_info(result)
+            return result
+
+        if return_raw_response:
+            return read()
+        return cls._cached_read(read, options, output_format)
 
     @classmethod
     def list(cls, options=None, per_page=True, output_format='csv'):
@@ -282,7 +356,37 @@ class Base:
         # if cls.command_requires_org and 'organization-id' not in options:
         #     raise CLIError(f'organization-id option is required for {cls.__name__}.list')
 
-        return cls.execute(cls._construct_command(options), output_format=output_format)
+        return cls._cached_read(
+            lambda: cls.execute(cls._construct_command(options), output_format=output_format),
+            options,
+            output_format,
+        )
+
+    @classmethod
+    def iter_list(cls, options=None, per_page=1000, output_format='csv'):
+        """
+        List information page by page.
+
+        Unlike :meth:`list`, pages of ``per_page`` entities are only requested
+        when the previous page was consumed and rows are parsed while they are
+        read.
+
+        @param options: ID (sometimes name works as well) to retrieve info.
+        @return: generator of the listed entities
+        """
+        options = dict(options or {})
+        page = int(options.pop('page', 1))
+        options['per-page'] = per_page
+        while True:
+            cls.command_sub = 'list'
+            command = cls._construct_command({**options, 'page': page})
+            count = 0
+            for row in cls.iter_execute(command, output_format=output_format):
+                count += 1
+                yield row
+            if count < per_page:
+                return
+            page += 1
 
     @classmethod
     def puppetclasses(cls, options=None):
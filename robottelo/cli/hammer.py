@@ -1,17 +1,28 @@
 """Helpers to interact with hammer command line utility."""
 
 import csv
+from functools import lru_cache
 import json
 import re
 
 from robottelo.logging import logger
 
 
+@lru_cache(maxsize=1024)
 def _normalize(header):
     """Replace empty spaces with '-' and lower all chars"""
     return header.replace(' ', '-').lower()
 
 
+def _normalize_pairs(pairs):
+    """Build a dictionary with normalized keys while decoding JSON"""
+    return {_normalize(key): value for key, value in pairs}
+
+
+# ints are kept as strings to conform to csv parser
+_json_decoder = json.JSONDecoder(object_pairs_hook=_normalize_pairs, parse_int=str)
+
+
 def parse_json(stdout):
     """Parse JSON output from Hammer CLI and convert it to python dictionary
     while normalizing keys.
@@ -19,37 +30,107 @@ def parse_json(stdout):
     new_object_index = stdout.find('\n}\n{')
     if new_object_index > -1:
         stdout = stdout[new_object_index + 3 :]  # noqa: E203
-    parsed = json.loads(stdout)
-    return _normalize_obj(parsed)
-
-
-def _normalize_obj(obj):
-    """Normalize all dict's keys replacing empty spaces with "-" and lowering
-    chars
-    """
-    if isinstance(obj, dict):
-        return {_normalize(k): _normalize_obj(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [_normalize_obj(v) for v in obj]
-    # doing this to conform to csv parser
-    if isinstance(obj, int) and not isinstance(obj, bool):
-        return str(obj)
-    return obj
+    return _json_decoder.decode(stdout)
 
 
 def parse_csv(output):
     """Parse CSV output from Hammer CLI and return a Python dictionary."""
-    output = output.splitlines()
+    return list(iter_csv([output]))
+
+
+def _iter_lines(chunks):
+    """Split a stream of text chunks into lines, keeping the line endings"""
+    pending = ''
+    for chunk in chunks:
+        lines = (pending + chunk).splitlines(keepends=True)
+        # the last line may continue in the next chunk
+        pending = lines.pop() if lines and not lines[-1].endswith(('\n', '\r')) else ''
+        yield from lines
+    if pending:
+        yield pending
+
 
-    # Normalize the column names to use when generating the dictionary
+def iter_csv(chunks):
+    """Parse CSV output from Hammer CLI incrementally
+
+    :param chunks: iterable of text chunks or lines, e.g. a streamed stdout
+    :return: generator of rows as dictionaries keyed by normalized column names
+    """
+    lines = _iter_lines(chunks)
+    reader = csv.reader(lines)
     try:
-        keys = [_normalize(header) for header in next(csv.reader(output))]
-        return [value for value in csv.DictReader(output[1:], fieldnames=keys)]
+        # Normalize the column names once to use when generating the dictionaries
+        header = next(reader, None)
+        if header is None:
+            return
+        keys = [_normalize(column) for column in header]
+        yield from csv.DictReader(lines, fieldnames=keys)
     except csv.Error as err:
-        logger.error(f'Exception while parsing CSV output {output}: {err}')
+        logger.error(f'Exception while parsing CSV output: {err}')
         raise
 
 
+def iter_json(chunks):
+    """Parse a JSON list output from Hammer CLI incrementally
+
+    Items are decoded as soon as they are complete, with normalized keys like
+    :func:`parse_json`.
+
+    :param chunks: iterable of text chunks, e.g. a streamed stdout
+    :return: generator of the items of the top level JSON list
+    """
+    chunks = iter(chunks)
+    buffer = ''
+    position = 0
+    exhausted = False
+
+    def skip(chars):
+        # skip whitespace and ``chars``, reading more data when needed
+        nonlocal buffer, position, exhausted
+        while True:
+            while position < len(buffer) and (
+                buffer[position].isspace() or buffer[position] in chars
+            ):
+                position += 1
+            if position < len(buffer) or exhausted:
+                return
+            buffer, position = '', 0
+            try:
+                buffer = next(chunks)
+            except StopIteration:
+                exhausted = True
+
+    skip('')
+    if position >= len(buffer):
+        return
+    if buffer[position] != '[':
+        raise json.JSONDecodeError('Expecting a JSON list', buffer, position)
+    position += 1
+    while True:
+        skip(',')
+        if position >= len(buffer):
+            raise json.JSONDecodeError('Unterminated JSON list', buffer, position)
+        if buffer[position] == ']':
+            return
+        try:
+            item, end = _json_decoder.raw_decode(buffer, position)
+            # a number at the end of the buffer may continue in the next chunk
+            complete = end < len(buffer) or exhausted
+        except json.JSONDecodeError:
+            if exhausted:
+                raise
+            complete = False
+        if complete:
+            yield item
+            position = end
+            continue
+        try:
+            buffer = buffer[position:] + next(chunks)
+        except StopIteration:
+            buffer, exhausted = buffer[position:], True
+        position = 0
+
+
 def parse_help(output):
     """Parse the help output from a hammer command and return a dictionary
     mapping the subcommands and options accepted by that command.
@@ -169,6 +250,23 @@ def get_line_indentation_level(line, tab_spaces=4, indentation_spaces=4):
     return spaces // indentation_spaces + (1 if spaces % indentation_spaces > 0 else 0)
 
 
+# numbered values of a collection, e.g. ' 1) template1'
+_NUMBERED_VALUE = re.compile(r'\d+\)\s+(.+)$')
+# numbered keys of a list of dictionaries, e.g. ' 1) Repo Name: repo1'
+_NUMBERED_KEY = re.compile(r'(\d+)\)')
+
+
+def _indentation_level(line, stripped):
+    """Same as :func:`get_line_indentation_level` for ``line`` and its
+    whitespace stripped version, without walking the line char by char
+    """
+    if len(line) < 4:
+        return 0
+    indent = line[: len(line) - len(stripped)]
+    spaces = len(indent) + 3 * indent.count('\t')
+    return (spaces + 3) // 4
+
+
 def parse_info(output):
     """Parse the info output and returns a dict mapping the values."""
     # info dictionary
@@ -181,111 +279,109 @@ def parse_info(output):
         # skip empty lines and dividers
         if line == '' or line == '---':
             continue
-        current_indent_level = get_line_indentation_level(line)
+        current_indent_level = _indentation_level(line, line.lstrip(' \t'))
         if current_indent_level <= 1:
             # we are entering or leaving a second level from lower/upper levels
             # clear the second level key
             second_level_key = None
-        if line.startswith(' '):  # sub-properties are indented
-            # values are separated by ':' or '=>', but not by '::' which can be
-            # entity name like 'test::params::keys'
-            if line.find(':') != -1 and line.find('::') == -1:
-                key, value = line.lstrip().split(":", 1)
-            elif line.find('=>') != -1 and len(line.lstrip().split(" =>", 1)) == 2:
-                key, value = line.lstrip().split(" =>", 1)
-            else:
-                key = value = None
-
-            if key is None and value is None:
-                # Parse single attribute collection properties
-                # Template
-                #  1) template1
-                #  2) template2
-                #
-                # or
-                # Template
-                #  template1
-                #  template2
-                match = re.match(r'\d+\)\s+(.+)$', line.lstrip())
-
-                if match is None:
-                    match = re.match(r'(.*)$', line.lstrip())
-
-                value = match.group(1)
-
-                # adding list to 1 level, for example:
-                # {'template': ['template1', 'template2']}
-                if isinstance(contents[sub_prop], dict) and not contents[sub_prop]:
-                    contents[sub_prop] = []
-                    contents[sub_prop].append(value)
-                elif isinstance(contents[sub_prop], list):
-                    contents[sub_prop].append(value)
-                else:
-                    # adding list to 2 level, for example:
-                    # {'subscription-information':
-                    #      {'registered-by-activation-keys': ['ak1', 'ak2']}
-                    #  }
-                    last_key = list(contents[sub_prop].keys())[-1]
-                    if not contents[sub_prop][last_key]:
-                        contents[sub_prop][last_key] = [value]
-                    else:
-                        contents[sub_prop][last_key].append(value)
-            else:
-                # some properties have many numbered values
-                # Example:
-                # Content:
-                #  1) Repo Name: repo1
-                #     URL:       /custom/4f84fc90-9ffa-...
-                #  2) Repo Name: puppet1
-                #     URL:       /custom/4f84fc90-9ffa-...
-                starts_with_number = re.match(r'(\d+)\)', key)
-                if starts_with_number:
-                    # if this is a numbered list on level 2, do nothing - this script doesn't support it
-                    if current_indent_level >= 2:
-                        continue
-                    sub_num = int(starts_with_number.group(1))
-                    # no. 1) we need to change dict() to list()
-                    if sub_num == 1:
-                        contents[sub_prop] = []
-                    # remove number from key
-                    key = re.sub(r'\d+\)', '', key)
-                    # append empty dict to array
-                    contents[sub_prop].append({})
-
-                key = key.lstrip().replace(' ', '-').lower()
-                value = value.lstrip()
-                # add value to dictionary
-                if sub_num is not None:
-                    contents[sub_prop][-1][key] = value
-                else:
-                    # a third level is always represented as a dictionary and
-                    # we need to detect if we are at third level
-                    # example:
-                    # Content Information:
-                    #     Content View:
-                    #         ID:   10
-                    #         Name: Default Organization View
-                    # the "ID" and "Name" are located at third indent level
-                    # "content view" is located at second indent level
-                    if current_indent_level == 2 and second_level_key:
-                        # we are at third level indentation
-                        if not contents[sub_prop][second_level_key]:
-                            contents[sub_prop][second_level_key] = {}
-                        contents[sub_prop][second_level_key][key] = value
-                    else:
-                        contents[sub_prop][key] = value
-                    if current_indent_level == 1 and not value:
-                        # always set the last possible second level key
-                        # that can form a third level
-                        second_level_key = key
-        else:
+        if line[0] != ' ':
             sub_num = None  # new property implies no sub property
-            key, value = line.lstrip().split(":", 1)
-            key = key.lstrip().replace(' ', '-').lower()
-            if value.lstrip() == '':  # 'key:' no value, new sub-property
+            key, value = line.lstrip().split(':', 1)
+            key = _normalize(key.lstrip())
+            value = value.lstrip()
+            if value == '':  # 'key:' no value, new sub-property
                 sub_prop = key
                 contents[sub_prop] = {}
             else:  # 'key: value' line
-                contents[key] = value.lstrip()
+                contents[key] = value
+            continue
+
+        # sub-properties are indented
+        stripped = line.lstrip()
+        # values are separated by ':' or '=>', but not by '::' which can be
+        # entity name like 'test::params::keys'
+        if ':' in line and '::' not in line:
+            key, value = stripped.split(':', 1)
+        elif ' =>' in stripped:
+            key, value = stripped.split(' =>', 1)
+        else:
+            # Parse single attribute collection properties
+            # Template
+            #  1) template1
+            #  2) template2
+            #
+            # or
+            # Template
+            #  template1
+            #  template2
+            match = _NUMBERED_VALUE.match(stripped)
+            value = stripped if match is None else match.group(1)
+
+            collection = contents[sub_prop]
+            # adding list to 1 level, for example:
+            # {'template': ['template1', 'template2']}
+            if isinstance(collection, list):
+                collection.append(value)
+            elif not collection:
+                contents[sub_prop] = [value]
+            else:
+                # adding list to 2 level, for example:
+                # {'subscription-information':
+                #      {'registered-by-activation-keys': ['ak1', 'ak2']}
+                #  }
+                last_key = next(reversed(collection))
+                if not collection[last_key]:
+                    collection[last_key] = [value]
+                else:
+                    collection[last_key].append(value)
+            continue
+
+        # some properties have many numbered values
+        # Example:
+        # Content:
+        #  1) Repo Name: repo1
+        #     URL:       /custom/4f84fc90-9ffa-...
+        #  2) Repo Name: puppet1
+        #     URL:       /custom/4f84fc90-9ffa-...
+        starts_with_number = _NUMBERED_KEY.match(key)
+        if starts_with_number:
+            # if this is a numbered list on level 2, do nothing - this script doesn't support it
+            if current_indent_level >= 2:
+                continue
+            sub_num = int(starts_with_number.group(1))
+            # no. 1) we need to change dict() to list()
+            if sub_num == 1:
+                contents[sub_prop] = []
+            # remove number from key
+            key = _NUMBERED_KEY.sub('', key)
+            # append empty dict to array
+            contents[sub_prop].append({})
+
+        key = _normalize(key.lstrip())
+        value = value.lstrip()
+        # add value to dictionary
+        if sub_num is not None:
+            contents[sub_prop][-1][key] = value
+        else:
+            # a third level is always represented as a dictionary and
+            # we need to detect if we are at third level
+            # example:
+            # Content Information:
+            #     Content View:
+            #         ID:   10
+            #         Name: Default Organization View
+            # the "ID" and "Name" are located at third indent level
+            # "content view" is located at second indent level
+            if current_indent_level == 2 and second_level_key:
+                # we are at third level indentation
+                if not contents[sub_prop][second_level_key]:
+                    contents[sub_prop][second_level_key] = {}
+                contents[sub_prop][second_level_key][key] = value
+            else:
+                contents[sub_prop][key] = value
+            if current_indent_level == 1 and not value:
+                # always set the last possible second level key
+                # that can form a third level
+                second_level_key = key
 
     return contents
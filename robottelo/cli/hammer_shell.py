@@ -0,0 +1,316 @@
+"""Resident hammer process to amortize Ruby startup across hammer commands.
+
+A small Ruby driver is started once per Satellite, thread, credentials and
+locale over a pooled ssh channel. It loads hammer once and then runs every
+requested command in-process, reporting exit status, stdout and stderr of each
+command as a single framed JSON line. The hammer settings, context and
+environment are reset before each command, so nothing but the loaded code is
+shared between commands.
+"""
+
+import codecs
+import json
+import shlex
+import threading
+import time
+
+from broker.helpers import Result
+
+from robottelo import ssh
+from robottelo.cli import hammer
+from robottelo.exceptions import HammerShellError, HammerShellRequestError
+from robottelo.logging import logger
+
+RESPONSE_MARKER = '__ROBOTTELO_HAMMER__'
+DRIVER_PATH = '/var/tmp/robottelo_hammer_driver.rb'
+DRIVER_SCRIPT = f"""\
+require 'json'
+require 'stringio'
+
+hammer_bin = ARGV.shift
+STDOUT.sync = true
+BASE_ENV = ENV.to_h
+
+# drop what the previous command left behind, e.g. the settings holding its
+# credentials or the api connection cached in the context
+def reset_hammer
+  ENV.replace(BASE_ENV)
+  return unless defined?(HammerCLI)
+  HammerCLI::Settings.clear if defined?(HammerCLI::Settings) && HammerCLI::Settings.respond_to?(:clear)
+  HammerCLI.context.clear if HammerCLI.respond_to?(:context) && HammerCLI.context.respond_to?(:clear)
+end
+
+def respond(id, status, stdout, stderr)
+  STDOUT.puts('{RESPONSE_MARKER} ' + JSON.generate(
+    'id' => id, 'status' => status, 'stdout' => stdout.scrub, 'stderr' => stderr.scrub
+  ))
+end
+
+respond(0, 0, '', '')
+STDIN.each_line do |line|
+  request = JSON.parse(line)
+  out, err = StringIO.new, StringIO.new
+  status = 0
+  begin
+    reset_hammer
+    $stdout, $stderr = out, err
+    ARGV.replace(request['argv'])
+    load hammer_bin
+  rescue SystemExit => e
+    status = e.status
+  rescue Exception => e
+    err.puts("#{{e.class}}: #{{e.message}}")
+    status = 70
+  ensure
+    $stdout, $stderr = STDOUT, STDERR
+  end
+  respond(request['id'], status, out.string, err.string)
+end
+"""
+SHELL_METACHARACTERS = set('|&;<>()$`')
+# bytes read from the shell channel at once
+READ_SIZE = 65535
+# resident processes kept per thread, the least recently used one is stopped
+MAX_SHELLS = 3
+# seconds before starting a resident process is tried again on a host where it failed
+UNSUPPORTED_RETRY = 600
+
+
+class HammerShell:
+    """A long-lived hammer process on a single Satellite
+
+    :param client: a connected ssh client, e.g. from :func:`robottelo.ssh.get_client`
+    :param str locale: value for ``LANG`` in the resident process
+    """
+
+    def __init__(self, client, locale=None):
+        self.client = client
+        self.locale = locale
+        self._shell = None
+        self._buffer = ''
+        # multibyte characters may be split across reads
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._request_id = 0
+
+    @property
+    def running(self):
+        return self._shell is not None
+
+    def start(self):
+        """Upload the driver, start it and verify hammer can be run in-process"""
+        result = self.client.execute(
+            f"cat > {DRIVER_PATH} <<'ROBOTTELO_EOF'\n{DRIVER_SCRIPT}ROBOTTELO_EOF"
+        )
+        if result.status != 0:
+            raise HammerShellError(f'Unable to upload hammer driver: {result.stderr}')
+        try:
+            self._shell = self.client.session.shell()
+        except Exception as err:
+            raise HammerShellError(f'Unable to open a shell channel: {err}') from err
+        env = f'LANG={self.locale} ' if self.locale else ''
+        self._shell.send(f'exec env {env}ruby {DRIVER_PATH} "$(command -v hammer)"')
+        self._read_response(0)
+        probe = self.run(['--version'])
+        if probe.status != 0:
+            self.stop()
+            raise HammerShellError(f'hammer can not be run in-process: {probe.stderr}')
+
+    def stop(self):
+        """Terminate the resident process"""
+        if self._shell is not None:
+            try:
+                self._shell.close()
+            except Exception as err:
+                logger.debug(f'Error while closing hammer shell on {self.client.hostname}: {err}')
+        self._shell = None
+        self._buffer = ''
+        self._decoder.reset()
+
+    def _read_response(self, request_id):
+        while True:
+            line, sep, rest = self._buffer.partition('\n')
+            if sep:
+                self._buffer = rest
+                if not line.startswith(RESPONSE_MARKER):
+                    # anything hammer wrote around $stdout, e.g. directly to STDOUT
+                    logger.debug(f'Ignoring hammer shell output: {line}')
+                    continue
+                try:
+                    response = json.loads(line[len(RESPONSE_MARKER) :])
+                except json.JSONDecodeError as err:
+                    raise HammerShellError(f'Malformed hammer shell response: {line}') from err
+                if response.get('id') != request_id:
+                    raise HammerShellError(
+                        f'Expected response {request_id}, got {response.get("id")}'
+                    )
+                return response
+            try:
+                size, data = self._shell.read(READ_SIZE)
+            except Exception as err:
+                raise HammerShellError(f'Unable to read from hammer shell: {err}') from err
+            if size < 0:
+                raise HammerShellError(f'Unable to read from hammer shell: error {size}')
+            if not size:
+                raise HammerShellError('Hammer shell closed its output')
+            self._buffer += self._decoder.decode(data)
+
+    def run(self, argv, timeout=None):
+        """Run hammer with ``argv`` in the resident process
+
+        :param list argv: hammer arguments, without the ``hammer`` executable
+        :param timeout: time to wait for the command to finish
+        :return: a result object with ``status``, ``stdout`` and ``stderr``
+        :raises robottelo.exceptions.HammerShellError: if the shell is not running
+        :raises robottelo.exceptions.HammerShellRequestError: if the resident
+            process does not answer following the protocol once the command
+            was sent, the command may have run
+        """
+        if not self.running:
+            raise HammerShellError('Hammer shell is not running')
+        self._request_id += 1
+        # the ssh session is pooled, its timeout is restored for the other users
+        session = getattr(self.client.session, 'session', None)
+        previous_timeout = None
+        if timeout and hasattr(session, 'set_timeout'):
+            from broker.helpers import translate_timeout
+
+            previous_timeout = session.get_timeout()
+            session.set_timeout(translate_timeout(timeout))
+        try:
+            try:
+                self._shell.send(json.dumps({'id': self._request_id, 'argv': argv}))
+            except Exception as err:
+                # part of the request may have been written
+                raise HammerShellRequestError(f'Unable to write to hammer shell: {err}') from err
+            try:
+                response = self._read_response(self._request_id)
+            except HammerShellError as err:
+                raise HammerShellRequestError(str(err)) from err
+        finally:
+            if previous_timeout is not None:
+                session.set_timeout(previous_timeout)
+        return Result(
+            status=response['status'], stdout=response['stdout'], stderr=response['stderr']
+        )
+
+
+_shells = {}
+# hostname: time starting a resident process failed on it
+_unsupported = {}
+_lock = threading.Lock()
+
+
+def split_arguments(arguments):
+    """Split a hammer argument string the way the remote shell would
+
+    :return: a list of arguments or ``None`` if ``arguments`` relies on shell
+        features such as pipes, redirections or substitutions
+    """
+    lexer = shlex.shlex(arguments, posix=True, punctuation_chars=True)
+    lexer.whitespace_split = True
+    try:
+        argv = list(lexer)
+    except ValueError:
+        return None
+    if any(set(arg) <= SHELL_METACHARACTERS for arg in argv) or '$' in arguments:
+        return None
+    return argv
+
+
+def get_shell(hostname, credentials, locale=None):
+    """Return a running :class:`HammerShell` for ``hostname`` and the current thread
+
+    :param tuple credentials: username and password of the commands, processes
+        are not shared by different credentials
+    :return: the shell or ``None`` if a resident process can not be used on
+        ``hostname``
+    """
+    thread = threading.get_ident()
+    key = (hostname, thread, credentials, locale)
+    with _lock:
+        failed_at = _unsupported.get(hostname)
+        if failed_at is not None:
+            if time.monotonic() - failed_at < UNSUPPORTED_RETRY:
+                return None
+            del _unsupported[hostname]
+        shell = _shells.pop(key, None)
+        if shell is not None and shell.running:
+            # most recently used last
+            _shells[key] = shell
+            return shell
+    _stop_finished_threads()
+    shell = HammerShell(ssh.get_client(hostname=hostname), locale=locale)
+    try:
+        shell.start()
+    except HammerShellError as err:
+        logger.warning(f'Hammer shell unavailable on {hostname}, using one-shot hammer: {err}')
+        with _lock:
+            _unsupported[hostname] = time.monotonic()
+        return None
+    with _lock:
+        _shells[key] = shell
+        own = [other for other in _shells if other[1] == thread]
+        evicted = [_shells.pop(other) for other in own[: max(len(own) - MAX_SHELLS, 0)]]
+    for other in evicted:
+        other.stop()
+    return shell
+
+
+def _stop_finished_threads():
+    """Terminate resident hammer processes started by threads that have finished"""
+    alive = {thread.ident for thread in threading.enumerate()}
+    with _lock:
+        finished = [key for key in _shells if key[1] not in alive]
+        shells = [_shells.pop(key) for key in finished]
+    for shell in shells:
+        shell.stop()
+
+
+def stop_all():
+    """Terminate every resident hammer process of this process"""
+    with _lock:
+        shells = list(_shells.values())
+        _shells.clear()
+    for shell in shells:
+        shell.stop()
+
+
+def command(arguments, hostname, credentials=None, output_format=None, timeout=None, locale=None):
+    """Run hammer ``arguments`` through the resident process of ``hostname``
+
+    Mirrors :func:`robottelo.ssh.command` for hammer commands.
+
+    :param str arguments: hammer arguments, without the ``hammer`` executable
+    :param tuple credentials: username and password included in ``arguments``,
+        commands omitting credentials are never run by a resident process
+    :return: a result object or ``None`` when the command has to be run as a
+        one-shot hammer process instead
+    :raises robottelo.exceptions.HammerShellRequestError: if the resident process
+        failed once the command was sent to it, as the command may have run it is
+        not run again as a one-shot hammer process
+    """
+    if credentials is None:
+        return None
+    argv = split_arguments(arguments)
+    if argv is None:
+        return None
+    shell = get_shell(hostname, credentials, locale=locale)
+    if shell is None:
+        return None
+    try:
+        result = shell.run(argv, timeout=timeout)
+    except HammerShellRequestError as err:
+        logger.warning(f'Hammer shell on {hostname} failed running the command: {err}')
+        shell.stop()
+        raise
+    except HammerShellError as err:
+        logger.warning(f'Hammer shell on {hostname} failed, using one-shot hammer: {err}')
+        shell.stop()
+        return None
+
+    if output_format and result.status == 0:
+        if output_format == 'csv':
+            result.stdout = hammer.parse_csv(result.stdout) if result.stdout else {}
+        if output_format == 'json':
+            result.stdout = hammer.parse_json(result.stdout) if result.stdout else None
+    return result
@@ -0,0 +1,135 @@
+"""Cache for responses of read-only hammer subcommands.
+
+Parsed responses of ``info`` and ``list`` are kept per Satellite for a short
+time, keyed on the command, its options and the user running it. Executing
+any other subcommand of the same ``command_base`` through the same cache
+invalidates its cached responses.
+
+Changes done outside of hammer, e.g. through the API or the UI, are only
+picked up once the cached responses expire.
+"""
+
+from contextlib import contextmanager
+import copy
+import threading
+import time
+
+READ_SUBCOMMANDS = ('info', 'list')
+
+_local = threading.local()
+
+
+@contextmanager
+def bypass():
+    """Run hammer read subcommands of the current thread without the cache
+
+    Responses are neither read from nor stored in the cache, writes keep
+    invalidating it.
+    """
+    previous = getattr(_local, 'bypass', False)
+    _local.bypass = True
+    try:
+        yield
+    finally:
+        _local.bypass = previous
+
+
+def _freeze(value):
+    """Return a hashable representation of an options value"""
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _freeze(val)) for key, val in value.items()))
+    if isinstance(value, list | tuple | set):
+        return tuple(_freeze(val) for val in value)
+    return str(value)
+
+
+class ResponseCache:
+    """TTL cache of parsed hammer responses for a single Satellite
+
+    :param str hostname: the Satellite the responses come from
+    :param float ttl: seconds a response is served from the cache
+    """
+
+    def __init__(self, hostname, ttl):
+        self.hostname = hostname
+        self.ttl = ttl
+        self._responses = {}  # command_base -> {key: (expires, response)}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def stats(self):
+        """Return a dictionary with the cache counters"""
+        with self._lock:
+            size = sum(len(responses) for responses in self._responses.values())
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'size': size,
+        }
+
+    @staticmethod
+    def key(command_sub, options, output_format=None, user=None):
+        """Build the cache key of a read subcommand, ignoring the order of options"""
+        options = {key: val for key, val in (options or {}).items() if val is not None}
+        return (command_sub, _freeze(options), output_format, user)
+
+    def get(self, command_base, key):
+        """Return a copy of the cached response
+
+        :return: a tuple ``(found, response)``
+        """
+        if getattr(_local, 'bypass', False):
+            return False, None
+        with self._lock:
+            expires, response = self._responses.get(command_base, {}).get(key, (0, None))
+            if expires > time.monotonic():
+                self.hits += 1
+                return True, copy.deepcopy(response)
+            self.misses += 1
+        return False, None
+
+    def set(self, command_base, key, response):
+        """Cache a copy of ``response`` of a read subcommand of ``command_base``"""
+        if getattr(_local, 'bypass', False):
+            return
+        with self._lock:
+            self._responses.setdefault(command_base, {})[key] = (
+                time.monotonic() + self.ttl,
+                copy.deepcopy(response),
+            )
+
+    def invalidate(self, command_base=None):
+        """Drop the cached responses of ``command_base``, or all of them"""
+        with self._lock:
+            if command_base is None:
+                dropped = bool(self._responses)
+                self._responses.clear()
+            else:
+                dropped = self._responses.pop(command_base, None) is not None
+            if dropped:
+                self.invalidations += 1
+
+
+_caches = {}
+_lock = threading.Lock()
+
+
+def get_cache(hostname, ttl):
+    """Return the :class:`ResponseCache` of ``hostname``, shared by all its hosts objects"""
+    with _lock:
+        cache = _caches.get(hostname)
+        if cache is None:
+            cache = _caches[hostname] = ResponseCache(hostname, ttl)
+        cache.ttl = ttl
+        return cache
+
+
+def stats():
+    """Return the counters of every cache, keyed on hostname"""
+    with _lock:
+        caches = list(_caches.values())
+    return {cache.hostname: cache.stats for cache in caches}
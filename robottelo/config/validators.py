@@ -36,6 +36,9 @@ VALIDATORS = dict(
         Validator('server.ssh_password', default=None),
         Validator('server.verify_ca', default=False),
         Validator('server.is_ipv6', is_type_of=bool, default=False),
+        Validator('server.ssh_client.pool', is_type_of=bool, default=True),
+        Validator('server.ssh_client.pool_idle_timeout', is_type_of=int, default=600),
+        Validator('server.ssh_client.pool_health_check_interval', is_type_of=int, default=60),
         # validate http_proxy_ipv6_url only if is_ipv6 is True
         Validator(
             'server.http_proxy_ipv6_url',
@@ -76,6 +79,7 @@ VALIDATORS = dict(
     bugzilla=[
         Validator('bugzilla.url', default='https://bugzilla.redhat.com'),
         Validator('bugzilla.api_key', must_exist=True),
+        Validator('bugzilla.cache_ttl', is_type_of=int, default=3600),
     ],
     capsule=[
         Validator('capsule.version.release', must_exist=True),
@@ -131,6 +135,7 @@ VALIDATORS = dict(
         Validator(
             'fake_manifest.cert_url', 'fake_manifest.key_url', 'fake_manifest.url', must_exist=True
         ),
+        Validator('fake_manifest.clone_pool_size', default=2, is_type_of=int, gte=0),
     ],
     gce=[
         Validator(
@@ -186,6 +191,7 @@ VALIDATORS = dict(
         Validator('jira.comment_visibility', default="Red Hat Employee"),
         Validator('jira.enable_comment', default=False),
         Validator('jira.issue_status', default=["Review", "Release Pending"]),
+        Validator('jira.cache_ttl', is_type_of=int, default=3600),
     ],
     ldap=[
         Validator(
@@ -242,7 +248,12 @@ VALIDATORS = dict(
             must_exist=True,
         ),
     ],
-    performance=[Validator('performance.time_hammer', default=False)],
+    performance=[
+        Validator('performance.time_hammer', default=False),
+        Validator('performance.hammer_shell', is_type_of=bool, default=False),
+        Validator('performance.hammer_cache_ttl', is_type_of=int, default=0),
+        Validator('performance.host_facts_ttl', is_type_of=int, default=3600),
+    ],
     report_portal=[
         Validator(
             'report_portal.portal_url',
@@ -327,7 +338,7 @@ VALIDATORS = dict(
         ),
     ],
     shared_function=[
-        Validator('shared_function.storage', is_in=('file', 'redis'), default='file'),
+        Validator('shared_function.storage', is_in=('file', 'redis', 'sqlite'), default='file'),
         Validator('shared_function.share_timeout', lte=86400, default=86400),
         Validator('shared_function.scope', default=None),
         Validator('shared_function.enabled', default=False),
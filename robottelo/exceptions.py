@@ -67,6 +67,14 @@ class CLIError(Exception):
     """Indicates that a CLI command could not be run."""
 
 
+class HammerShellError(Exception):
+    """Indicates a protocol error while talking to a resident hammer process"""
+
+
+class HammerShellRequestError(HammerShellError):
+    """Indicates a resident hammer process failed after a command was sent to it"""
+
+
 class CapsuleHostError(Exception):
     """Indicates error in capsule configuration etc"""
 
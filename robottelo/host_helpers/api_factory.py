@@ -3,8 +3,10 @@ It is not meant to be used directly, but as part of a robottelo.hosts.Satellite
 example: my_satellite.api_factory.api_method()
 """
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from contextlib import contextmanager
 from datetime import datetime
+from functools import partial
 import time
 
 from fauxfactory import gen_ipaddr, gen_mac, gen_string
@@ -18,6 +20,10 @@ from robottelo.constants import (
     REPO_TYPE,
 )
 from robottelo.host_helpers.repository_mixins import initiate_repo_helpers
+from robottelo.logging import logger
+
+# maximum number of steps run concurrently by APIFactory.gather and APIFactory.run_steps
+API_MAX_WORKERS = 10
 
 
 class APIFactory:
@@ -26,6 +32,128 @@ class APIFactory:
     def __init__(self, satellite):
         self._satellite = satellite
         self.__dict__.update(initiate_repo_helpers(self._satellite))
+        # duration in seconds of each step run by gather/run_steps
+        self.step_timings = {}
+
+    def run_steps(self, steps, max_workers=None):
+        """Run a graph of dependent setup steps, each one as soon as its dependencies are done.
+
+        Independent steps, e.g. syncs of different repositories or publishes of content
+        views in different organizations, run concurrently in a bounded thread pool.
+        The duration of each step is recorded in ``step_timings``.
+
+        Example::
+
+            api_factory = target_sat.api_factory
+            results = api_factory.run_steps({
+                'rhel': (partial(api_factory.enable_sync_redhat_repo, rhel_repo, org.id), []),
+                'tools': (partial(api_factory.enable_sync_redhat_repo, tools_repo, org.id), []),
+                'cv': (
+                    lambda rhel, tools: api_factory.cv_publish_promote(repo_id=rhel, org_id=org.id),
+                    ['rhel', 'tools'],
+                ),
+            })
+
+        :param dict steps: maps a step name to a ``(callable, [dependency names])`` tuple;
+            the callable gets the results of its dependencies as keyword arguments
+        :param int max_workers: maximum number of steps run at the same time
+        :raises ValueError: if a step depends on an unknown step or the graph has a cycle
+        :return: a dictionary mapping step names to their results
+        """
+        for name, (_, dependencies) in steps.items():
+            if unknown := set(dependencies) - steps.keys():
+                raise ValueError(f'Step {name} depends on unknown steps {sorted(unknown)}')
+        results = {}
+        pending = dict(steps)
+        running = {}
+
+        def timed(name, func, **kwargs):
+            start = time.monotonic()
+            try:
+                return func(**kwargs)
+            finally:
+                self.step_timings[name] = time.monotonic() - start
+                logger.debug(f'Setup step {name} took {self.step_timings[name]:.2f}s')
+
+        with ThreadPoolExecutor(max_workers=max_workers or API_MAX_WORKERS) as executor:
+            while pending or running:
+                for name, (func, dependencies) in list(pending.items()):
+                    if all(dependency in results for dependency in dependencies):
+                        kwargs = {dependency: results[dependency] for dependency in dependencies}
+                        running[executor.submit(timed, name, func, **kwargs)] = name
+                        del pending[name]
+                if not running:
+                    raise ValueError(f'Steps {sorted(pending)} have cyclic dependencies')
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        # let already running steps finish, but do not start new ones
+                        pending.clear()
+                        wait(running)
+                        raise future.exception()
+                    results[name] = future.result()
+        return results
+
+    def gather(self, *calls, max_workers=None):
+        """Run independent callables concurrently.
+
+        Example::
+
+            api_factory = target_sat.api_factory
+            repo_ids = api_factory.gather(
+                partial(api_factory.enable_sync_redhat_repo, rhel_repo, org.id),
+                partial(api_factory.enable_sync_redhat_repo, tools_repo, org.id),
+            )
+
+        :param calls: callables taking no arguments, e.g. ``functools.partial`` objects
+        :param int max_workers: maximum number of callables run at the same time
+        :return: list with the result of each callable, in the order of ``calls``
+        """
+        names = [
+            f'{index}:{getattr(getattr(call, "func", call), "__name__", type(call).__name__)}'
+            for index, call in enumerate(calls)
+        ]
+        results = self.run_steps(
+            {name: (call, []) for name, call in zip(names, calls, strict=True)},
+            max_workers=max_workers,
+        )
+        return [results[name] for name in names]
+
+    def sync_repos(self, *repos, timeout=1500, max_workers=None):
+        """Sync several repositories concurrently.
+
+        :param repos: nailgun repository entities or repository ids
+        :param int timeout: time to wait for each sync, in seconds
+        :return: list with the sync response of each repository
+        """
+        return self.gather(
+            *(
+                partial(
+                    call_entity_method_with_timeout,
+                    self._satellite.api.Repository(id=getattr(repo, 'id', repo)).sync,
+                    timeout=timeout,
+                )
+                for repo in repos
+            ),
+            max_workers=max_workers,
+        )
+
+    def publish_content_views(self, *content_views, max_workers=None):
+        """Publish several content views concurrently, e.g. one per organization.
+
+        :param content_views: nailgun content view entities
+        :return: list of the re-read content views, in the order of ``content_views``
+        """
+
+        def publish(content_view):
+            content_view.publish()
+            return content_view.read()
+
+        return self.gather(
+            *(partial(publish, content_view) for content_view in content_views),
+            max_workers=max_workers,
+        )
 
     def make_http_proxy(self, org, http_proxy_type):
         """
@@ -394,11 +522,9 @@ class APIFactory:
         :param int from_when: Epoch Time (seconds in UTC) to limit number of returned tasks to investigate.
         :param int search_rate: Delay between searches.
         :param int max_tries: How many times search should be executed.
-        :param int poll_rate: Delay between the end of one task check-up and
-                the start of the next check-up. Parameter for
-                ``nailgun.entities.ForemanTask.poll()`` method.
+        :param int poll_rate: Unused, the satellite's task watcher adapts its polling rate.
+                Kept for backwards compatibility.
         :param int poll_timeout: Maximum number of seconds to wait until timing out.
-                Parameter for ``nailgun.entities.ForemanTask.poll()`` method.
         :return: Relevant errata applicability task.
         :raises: ``AssertionError``. If not tasks were found for given host until timeout.
         """
@@ -420,20 +546,22 @@ class APIFactory:
                 f' started_at >= "{long_format}" '
             )
             tasks = self._satellite.api.ForemanTask().search(query={'search': search_query})
-            tasks_finished = 0
-            for task in tasks:
+            host_tasks = [
+                task.id
+                for task in tasks
                 if (
                     task.label == 'Actions::Katello::Applicability::Hosts::BulkGenerate'
                     and 'host_ids' in task.input
                     and host_id in task.input['host_ids']
-                ) or (
+                )
+                or (
                     task.label == 'Actions::Katello::Host::UploadPackageProfile'
                     and 'host' in task.input
                     and host_id == task.input['host']['id']
-                ):
-                    task.poll(poll_rate=poll_rate, timeout=poll_timeout)
-                    tasks_finished += 1
-            if tasks_finished > 0:
+                )
+            ]
+            if host_tasks:
+                self._satellite.task_watcher.wait(host_tasks, timeout=poll_timeout)
                 break
             time.sleep(search_rate)
         else:
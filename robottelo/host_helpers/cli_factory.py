@@ -4,6 +4,7 @@ It is not meant to be used directly, but as part of a robottelo.hosts.Satellite
 example: my_satellite.cli_factory.make_org()
 """
 
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 from functools import lru_cache, partial
 import inspect
@@ -65,6 +66,9 @@ def create_object(cli_object, options, values=None, credentials=None, timeout=No
     return Box(result)
 
 
+# maximum number of entities created concurrently by CLIFactory.make_bulk
+BULK_MAX_WORKERS = 10
+
 """
 The following dictionary is used to define the simple make methods in this factory.
 Each key corresponds to the name of the entity (e.g. make_<entity_name>)
@@ -258,27 +262,87 @@ class CLIFactory:
         The keys in the dictionary above correspond to potential make_<key> methods
         These are all basic cases where the make method just need some default values.
         For more complex make methods, we define them in methods below.
+        make_<key>_bulk methods create several entities at once, see :meth:`make_bulk`.
         """
-        fields = ENTITY_FIELDS.get(name.replace('make_', ''))
-        if isinstance(fields, dict):
-            # someone is attempting to use a make_<entity> method
-            if setup := fields.get('_setup'):
-                # check for an evaluate _setup fields
-                fields['_setup_res'] = setup(
-                    *fields.get('_setup_args', []), **fields.get('_setup_kwargs', {})
-                )
-            # sometimes entity class names don't match the make_<entity> pattern
-            entity_cls = self._find_entity_class(
-                fields.get('_entity_cls', name.replace('make_', ''))
-            )
-            # some make_<entity> calls redirect to other methods
-            if redirect := fields.get('_redirect'):
-                return self.__getattr__(redirect)
-            # evaluate functions that provide default values
-            fields = self._evaluate_functions(fields)
-            return partial(create_object, entity_cls, fields)
+        if name.startswith('make_') and name.endswith('_bulk'):
+            entity_name = name.replace('make_', '', 1).removesuffix('_bulk')
+            if isinstance(ENTITY_FIELDS.get(entity_name), dict):
+                return partial(self.make_bulk, entity_name)
+        if (entity := self._entity_fields(name.replace('make_', ''))) is not None:
+            return partial(create_object, *entity)
         raise AttributeError(f'unknown factory method name: {name}')
 
+    def _entity_fields(self, name):
+        """Return the cli class and evaluated default options of an ENTITY_FIELDS entity"""
+        fields = ENTITY_FIELDS.get(name)
+        if not isinstance(fields, dict):
+            return None
+        if setup := fields.get('_setup'):
+            # check for an evaluate _setup fields
+            fields['_setup_res'] = setup(
+                *fields.get('_setup_args', []), **fields.get('_setup_kwargs', {})
+            )
+        # sometimes entity class names don't match the make_<entity> pattern
+        entity_cls = self._find_entity_class(fields.get('_entity_cls', name))
+        # some make_<entity> calls redirect to other methods
+        if redirect := fields.get('_redirect'):
+            return self._entity_fields(redirect)
+        # evaluate functions that provide default values
+        return entity_cls, self._evaluate_functions(fields)
+
+    def make_bulk(
+        self,
+        entity_name,
+        count,
+        options=None,
+        credentials=None,
+        timeout=None,
+        fields=('id', 'name'),
+        max_workers=None,
+    ):
+        """Create ``count`` entities of ``entity_name`` concurrently.
+
+        Also available as ``make_<entity>_bulk(count, options)`` for every entity of
+        ``ENTITY_FIELDS``. Creations run in a bounded thread pool, each thread using
+        its own pooled ssh connection.
+
+        :param str entity_name: an ``ENTITY_FIELDS`` key, e.g. ``org``
+        :param int count: number of entities to create
+        :param options: options used for every entity, or a list with the options of
+            each entity
+        :param list|tuple credentials: Username and password for non-default user.
+        :param fields: fields needed from each entity; the ``info`` call following
+            each ``create`` is skipped when the create output already has them.
+            Pass ``None`` to always read the full entity.
+        :param int max_workers: maximum number of concurrent creations
+        :raise robottelo.host_helpers.cli_factory.CLIFactoryError: Raise an exception if
+            any of the objects cannot be created.
+        :return: list of dictionaries representing the new entities, in creation order
+        """
+        if isinstance(options, list):
+            if len(options) != count:
+                raise CLIFactoryError(f'Expected {count} options, got {len(options)}')
+        else:
+            options = [options] * count
+        # defaults are generated up front, some of them share state in ENTITY_FIELDS
+        tasks = []
+        for entity_options in options:
+            entity = self._entity_fields(entity_name)
+            if entity is None:
+                raise CLIFactoryError(f'Unknown entity {entity_name}')
+            entity_cls, defaults = entity
+            # cli classes keep per-command state as class attributes, so every creation
+            # gets its own subclass to be safe to run concurrently
+            task_cls = type(entity_cls.__name__, (entity_cls,), {'create_output_fields': fields})
+            tasks.append((task_cls, defaults, dict(entity_options or {})))
+
+        def create(task):
+            return create_object(*task, credentials=credentials, timeout=timeout)
+
+        max_workers = min(max_workers or BULK_MAX_WORKERS, count) or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(create, tasks))
+
     def _evaluate_function(self, function):
         """Some functions may require an instance reference"""
         if 'self' in inspect.signature(function).parameters:
@@ -300,9 +364,9 @@ class CLIFactory:
     @lru_cache
     def _find_entity_class(self, entity_name):
         entity_name = entity_name.replace('_', '').lower()
-        for name, class_obj in self._satellite.cli.__dict__.items():
+        for name in dir(self._satellite.cli):
             if entity_name == name.lower():
-                return class_obj
+                return getattr(self._satellite.cli, name)
         return None
 
     def make_content_credential(self, options=None):
@@ -2,7 +2,6 @@ import contextlib
 from functools import lru_cache
 import io
 import os
-import random
 import re
 
 import requests
@@ -23,6 +22,7 @@ from robottelo.host_helpers.ui_factory import UIFactory
 from robottelo.logging import logger
 from robottelo.utils.installer import InstallerCommand
 from robottelo.utils.manifest import clone
+from robottelo.utils.port_leases import NoPortAvailable, get_port_leases
 
 
 class EnablePluginsSatellite:
@@ -236,18 +236,18 @@ class SystemInfo:
 
     @property
     def available_capsule_port(self):
-        """returns a list of unused ports dedicated for fake capsules on satellite.
+        """Lease an unused port dedicated for fake capsules on satellite.
 
-        This calls an ss command on the server prompting for a port range. ss
-        returns a list of ports which have a PID assigned (a list of ports
-        which are already used). This function then substracts unavailable ports
-        from the other ones and returns one of available ones randomly.
+        The ports of ``settings.fake_capsules.port_range`` used on the satellite
+        are scanned with ss once and shared by the xdist workers, see
+        :mod:`robottelo.utils.port_leases`. The lease is released when the
+        ``default_url_on_new_port`` context using the port exits.
 
         :param port_pool: A list of ports used for fake capsules (for RHEL7+: don't
             forget to set a correct selinux context before otherwise you'll get
             Connection Refused error)
 
-        :return: Random available port from interval <9091, 9190>.
+        :return: Available port from interval <9091, 9190>.
         :rtype: int
         """
         port_pool_range = settings.fake_capsules.port_range
@@ -260,6 +260,17 @@ class SystemInfo:
                 'Expected type of port_range is a tuple of 2 elements,'
                 f'got {type(port_pool_range)} instead'
             )
+        try:
+            return get_port_leases().lease(
+                self.hostname, port_pool, lambda: self._used_capsule_ports(port_pool)
+            )
+        except NoPortAvailable:
+            raise CapsuleTunnelError(
+                'Failed to create ssh tunnel: No more ports available for mapping'
+            ) from None
+
+    def _used_capsule_ports(self, port_pool):
+        """Return the set of ports of ``port_pool`` used on satellite"""
         # returns a list of strings
         ss_cmd = self.execute(
             f"ss -tnaH sport ge {port_pool[0]} sport le {port_pool[-1]}"
@@ -269,23 +280,17 @@ class SystemInfo:
             raise CapsuleTunnelError(
                 f'Failed to create ssh tunnel: Error getting port status: {ss_cmd.stderr}'
             )
-        # converts a List of strings to a List of integers
+        # converts a List of strings to a set of integers
+        lines = [
+            line.strip()
+            for line in ss_cmd.stdout.splitlines()
+            if line.strip() and not line.startswith('Cannot stat file')
+        ]
         try:
-            print(ss_cmd)
-            used_ports = map(
-                int, [val for val in ss_cmd.stdout.splitlines()[:-1] if val != 'Cannot stat file ']
-            )
-
+            return {int(line) for line in lines}
         except ValueError:
             raise CapsuleTunnelError(
-                f'Failed parsing the port numbers from stdout: {ss_cmd.stdout.splitlines()[:-1]}'
-            ) from None
-        try:
-            # take the list of available ports and return randomly selected one
-            return random.choice([port for port in port_pool if port not in used_ports])
-        except IndexError:
-            raise CapsuleTunnelError(
-                'Failed to create ssh tunnel: No more ports available for mapping'
+                f'Failed parsing the port numbers from stdout: {lines}'
             ) from None
 
     @contextlib.contextmanager
@@ -330,14 +335,18 @@ class SystemInfo:
                     # Something failed, so raise an exception.
                     raise CapsuleTunnelError(f'Starting ncat failed: {err}') from e
 
-        ncat_pid = start_ncat()
         try:
-            forward_url = f'https://{self.hostname}:{newport}'
-            logger.debug(f'Yielding capsule forward port url: {forward_url}')
-            yield forward_url
+            ncat_pid = start_ncat()
+            try:
+                forward_url = f'https://{self.hostname}:{newport}'
+                logger.debug(f'Yielding capsule forward port url: {forward_url}')
+                yield forward_url
+            finally:
+                logger.debug(f'Killing ncat pid: {ncat_pid}')
+                self.execute(f'kill {ncat_pid.pop()}')
         finally:
-            logger.debug(f'Killing ncat pid: {ncat_pid}')
-            self.execute(f'kill {ncat_pid.pop()}')
+            # the port was leased by available_capsule_port
+            get_port_leases().release(self.hostname, newport)
 
     def validate_pulp_filepath(
         self,
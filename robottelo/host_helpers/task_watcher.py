@@ -0,0 +1,172 @@
+"""Central watcher for Foreman tasks of a Satellite.
+
+Instead of every waiter polling its own tasks, all outstanding task ids are
+looked up with a single bulk ``foreman_tasks`` search per tick. Waiters block
+on futures that are resolved as soon as their task finishes. The interval
+between ticks backs off while nothing finishes and resets when new tasks are
+watched or a task finishes.
+
+It is not meant to be used directly, but as part of a robottelo.hosts.Satellite instance
+example: my_satellite.task_watcher.wait(task_ids)
+"""
+
+from collections import Counter
+from concurrent.futures import Future, wait
+import threading
+
+from nailgun.entity_mixins import TASK_TIMEOUT, TaskFailedError, TaskTimedOutError
+
+from robottelo.logging import logger
+
+FINISHED_STATES = ('paused', 'stopped')
+
+
+class ForemanTaskWatcher:
+    """Poll outstanding Foreman tasks of a Satellite in bulk
+
+    :param satellite: the Satellite the tasks run on
+    :param float min_interval: seconds between searches right after a change
+    :param float max_interval: maximum seconds between searches
+    :param float backoff: factor applied to the interval after a tick without changes
+    :param int chunk_size: maximum number of task ids per search request
+    :param int max_errors: consecutive failed searches before waiters are failed
+    """
+
+    def __init__(
+        self,
+        satellite,
+        min_interval=1,
+        max_interval=15,
+        backoff=1.5,
+        chunk_size=100,
+        max_errors=5,
+    ):
+        self._satellite = satellite
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.interval = min_interval
+        self.searches = 0
+        self._futures = {}
+        self._waiters = Counter()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def watch(self, task_id):
+        """Start watching ``task_id``
+
+        :return: a ``concurrent.futures.Future`` resolved with the task data once
+            the task is finished
+        """
+        with self._condition:
+            future = self._futures.get(task_id)
+            if future is None:
+                future = self._futures[task_id] = Future()
+                self.interval = self.min_interval
+                self._condition.notify()
+            self._waiters[task_id] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f'task-watcher-{self._satellite.hostname}', daemon=True
+                )
+                self._thread.start()
+        return future
+
+    def _release(self, task_ids):
+        """Stop watching tasks nobody is waiting for anymore"""
+        with self._condition:
+            for task_id in task_ids:
+                self._waiters[task_id] -= 1
+                if self._waiters[task_id] <= 0:
+                    del self._waiters[task_id]
+                    if (future := self._futures.pop(task_id, None)) is not None:
+                        future.cancel()
+
+    def wait(self, task_ids, timeout=None, must_succeed=True):
+        """Wait for all ``task_ids`` to finish
+
+        :param list task_ids: ids of the Foreman tasks to wait for
+        :param int timeout: maximum number of seconds to wait for all of the tasks,
+            defaults to nailgun's task timeout
+        :param bool must_succeed: raise if any task did not succeed
+        :return: list of task data, in the order of ``task_ids``
+        :raises nailgun.entity_mixins.TaskTimedOutError: if the tasks did not finish in time
+        :raises nailgun.entity_mixins.TaskFailedError: if ``must_succeed`` is set and a task
+            did not succeed
+        """
+        task_ids = list(task_ids)
+        # register all tasks before the next tick so they are searched together
+        with self._condition:
+            futures = [self.watch(task_id) for task_id in task_ids]
+        try:
+            _, not_done = wait(futures, timeout=timeout or TASK_TIMEOUT)
+            if not_done:
+                pending = [
+                    task_id
+                    for task_id, future in zip(task_ids, futures, strict=True)
+                    if future in not_done
+                ]
+                raise TaskTimedOutError(f'Timed out waiting for tasks {pending}', pending[0])
+            tasks = [future.result() for future in futures]
+        finally:
+            self._release(task_ids)
+        if must_succeed:
+            for task in tasks:
+                if task['result'] != 'success':
+                    raise TaskFailedError(
+                        f'Task {task["id"]} did not succeed. Task information: {task}', task['id']
+                    )
+        return tasks
+
+    def _search(self, task_ids):
+        """Look up ``task_ids`` with as few search requests as possible"""
+        tasks = {}
+        for start in range(0, len(task_ids), self.chunk_size):
+            chunk = task_ids[start : start + self.chunk_size]
+            ids = ', '.join(str(task_id) for task_id in chunk)
+            response = self._satellite.api.ForemanTask().search_json(
+                query={'search': f'id ^ ({ids})', 'per_page': len(chunk)}
+            )
+            self.searches += 1
+            tasks.update({task['id']: task for task in response['results']})
+        return tasks
+
+    def _run(self):
+        errors = 0
+        while True:
+            with self._condition:
+                if not self._futures:
+                    self._thread = None
+                    return
+                task_ids = list(self._futures)
+            try:
+                tasks = self._search(task_ids)
+                errors = 0
+            except Exception as err:  # failures are handed to the waiters
+                errors += 1
+                logger.warning(f'Foreman task search on {self._satellite.hostname} failed: {err}')
+                tasks = {}
+                if errors >= self.max_errors:
+                    with self._condition:
+                        for future in self._futures.values():
+                            future.set_exception(err)
+                        self._futures.clear()
+                    # waiters registering from now on get max_errors new attempts
+                    errors = 0
+                    continue
+            with self._condition:
+                finished = [
+                    task_id
+                    for task_id, task in tasks.items()
+                    if task['state'] in FINISHED_STATES and task_id in self._futures
+                ]
+                for task_id in finished:
+                    self._futures.pop(task_id).set_result(tasks[task_id])
+                if finished:
+                    self.interval = self.min_interval
+                else:
+                    self.interval = min(self.interval * self.backoff, self.max_interval)
+                if self._futures:
+                    self._condition.wait(timeout=self.interval)
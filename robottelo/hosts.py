@@ -1,38 +1,37 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from configparser import ConfigParser
 import contextlib
 from contextlib import contextmanager
 from datetime import datetime
-from functools import cached_property, lru_cache
+from functools import cached_property, lru_cache, partialmethod
 import importlib
 import io
 import json
 from pathlib import Path, PurePath
 import random
 import re
-from tempfile import NamedTemporaryFile
 import time
 from urllib.parse import urljoin, urlparse, urlunsplit
+import weakref
 
 import apypie
 from box import Box
 from broker import Broker
 from broker.hosts import Host
-from dynaconf.vendor.box.exceptions import BoxKeyError
 from fauxfactory import gen_alpha, gen_string
 from nailgun import entities
 from packaging.version import Version
 import requests
-from ssh2.exceptions import AuthenticationError
 from wait_for import TimedOutError, wait_for
 from wrapanapi.entities.vm import VmState
 import yaml
 
-from robottelo import constants
+from robottelo import constants, ssh
+from robottelo.cli import response_cache
 from robottelo.cli.base import Base
 from robottelo.config import (
     configure_airgun,
     configure_nailgun,
-    robottelo_tmp_dir,
     settings,
 )
 from robottelo.constants import (
@@ -49,11 +48,15 @@ from robottelo.constants import (
 )
 from robottelo.exceptions import CLIFactoryError, DownloadFileError, HostPingFailed
 from robottelo.host_helpers import CapsuleMixins, ContentHostMixins, SatelliteMixins
+from robottelo.host_helpers.task_watcher import ForemanTaskWatcher
 from robottelo.logging import logger
-from robottelo.utils import validate_ssh_pub_key
+from robottelo.utils import host_facts, validate_ssh_pub_key
 from robottelo.utils.datafactory import valid_emails_list
 from robottelo.utils.installer import InstallerCommand
 
+# maximum number of hosts a HostGroup runs an operation on at the same time
+HOST_GROUP_MAX_WORKERS = 10
+
 POWER_OPERATIONS = {
     VmState.RUNNING: 'running',
     VmState.STOPPED: 'stopped',
@@ -76,12 +79,13 @@ def lru_sat_ready_rhel(rhel_ver):
 
 
 def get_sat_version():
-    """Try to read sat_version from envvar SATELLITE_VERSION
-    if not available fallback to ssh connection to get it."""
+    """Read sat_version from the host facts of the Satellite
+    if not available fallback to robottelo configuration."""
 
-    try:
-        sat_version = Satellite().version
-    except (AuthenticationError, ContentHostError, BoxKeyError):
+    facts = host_facts.get_facts()
+    if facts and facts['version']:
+        sat_version = facts['version']
+    else:
         if sat_version := str(settings.server.version.get('release')) == 'stream':
             sat_version = str(settings.robottelo.get('satellite_version'))
         if not sat_version:
@@ -90,16 +94,16 @@ def get_sat_version():
 
 
 def get_sat_rhel_version():
-    """Try to read rhel_version from Satellite host
+    """Read rhel_version from the host facts of the Satellite
     if not available fallback to robottelo configuration."""
 
-    try:
-        return Satellite().os_version
-    except (AuthenticationError, ContentHostError, BoxKeyError):
-        if hasattr(settings.server.version, 'rhel_version'):
-            rhel_version = str(settings.server.version.rhel_version)
-        elif hasattr(settings.robottelo, 'rhel_version'):
-            rhel_version = settings.robottelo.rhel_version
+    facts = host_facts.get_facts()
+    if facts and facts['rhel_version']:
+        rhel_version = facts['rhel_version']
+    elif hasattr(settings.server.version, 'rhel_version'):
+        rhel_version = str(settings.server.version.rhel_version)
+    elif hasattr(settings.robottelo, 'rhel_version'):
+        rhel_version = settings.robottelo.rhel_version
     return Version(rhel_version)
 
 
@@ -123,9 +127,117 @@ class ProxyHostError(Exception):
     pass
 
 
+@lru_cache
+def cli_classes(prefix=''):
+    """Import the robottelo cli modules once per process and return their cli classes
+
+    :param str prefix: only consider modules whose name starts with ``prefix``
+    :return: a dictionary mapping class names to ``Base`` subclasses
+    """
+    classes = {}
+    for file in Path(__file__).parent.joinpath('cli').iterdir():
+        if file.suffix == '.py' and not file.name.startswith('_') and file.name.startswith(prefix):
+            cli_module = importlib.import_module(f'robottelo.cli.{file.stem}')
+            for name, obj in cli_module.__dict__.items():
+                if isinstance(obj, type) and issubclass(obj, Base):
+                    classes[name] = obj
+    return classes
+
+
+class HostAttribute:
+    """Class attribute reading its value from the host a cli class is bound to"""
+
+    def __init__(self, host, name, default=False):
+        self._host = weakref.ref(host)
+        self.name = name
+        self.default = default
+
+    def __get__(self, instance, owner):
+        host = self._host()
+        return getattr(host, self.name, self.default) if host is not None else self.default
+
+
+class CLINamespace:
+    """Lazily bound view over :func:`cli_classes`
+
+    Cli classes are subclassed on first attribute access, using ``attributes``
+    as class attributes of the subclass (e.g. ``hostname``), and memoized.
+
+    :param str prefix: only expose classes from modules starting with ``prefix``
+    """
+
+    def __init__(self, prefix='', **attributes):
+        self._prefix = prefix
+        self._attributes = attributes
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            cls = cli_classes(self._prefix)[name]
+        except KeyError as err:
+            raise AttributeError(f'No cli class named {name}') from err
+        # create a copy of the class and set our host attributes as class attributes
+        bound_cls = type(name, (cls,), dict(self._attributes))
+        setattr(self, name, bound_cls)
+        return bound_cls
+
+    def __dir__(self):
+        return sorted(cli_classes(self._prefix))
+
+
+class APINamespace:
+    """Lazily bound view over the nailgun entities
+
+    Entity classes are subclassed on first attribute access, injecting
+    ``server_config`` into their ``__init__``, and memoized.
+    """
+
+    def __init__(self, server_config):
+        self.server_config = server_config
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        from nailgun import entities as _entities  # use a private import
+        from nailgun.entity_mixins import Entity
+
+        cls = getattr(_entities, name, None)
+        if not (isinstance(cls, type) and issubclass(cls, Entity)):
+            raise AttributeError(f'No nailgun entity named {name}')
+        # create a copy of the class and inject our server config into the __init__
+        bound_cls = type(
+            name,
+            (cls,),
+            {'__init__': partialmethod(cls.__init__, server_config=self.server_config)},
+        )
+        setattr(self, name, bound_cls)
+        return bound_cls
+
+    def __dir__(self):
+        from nailgun import entities as _entities
+        from nailgun.entity_mixins import Entity
+
+        return sorted(
+            name
+            for name, obj in _entities.__dict__.items()
+            if isinstance(obj, type) and issubclass(obj, Entity)
+        )
+
+
+@lru_cache
+def api_namespace(url, auth, verify):
+    """Return the :class:`APINamespace` shared by all hosts with the same server config"""
+    from nailgun.config import ServerConfig
+
+    return APINamespace(ServerConfig(auth=auth, url=url, verify=verify))
+
+
 class ContentHost(Host, ContentHostMixins):
     run = Host.execute
     default_timeout = settings.server.ssh_client.command_timeout
+    _probed_facts = None
+    _subscription_facts = None
 
     def __init__(self, hostname, auth=None, **kwargs):
         """ContentHost object with optional ssh connection
@@ -167,6 +279,27 @@ class ContentHost(Host, ContentHostMixins):
             )
         return inv_hosts[0]
 
+    @property
+    def probed_facts(self):
+        """Release, addresses and architecture of the host read with a single ssh command,
+        see :func:`robottelo.utils.host_facts.probe_content_host`
+        """
+        if self._probed_facts is None:
+            self._probed_facts = host_facts.probe_content_host(self)
+        return self._probed_facts
+
+    @property
+    def subscription_facts(self):
+        """Registration of the host read with a single ssh command, see
+        :func:`robottelo.utils.host_facts.probe_subscription`
+
+        The snapshot is dropped by the helpers changing the registration, e.g.
+        ``register``, ``unregister`` or ``reset_rhsm``.
+        """
+        if self._subscription_facts is None:
+            self._subscription_facts = host_facts.probe_subscription(self)
+        return self._subscription_facts
+
     @property
     def satellite(self):
         if not self._satellite:
@@ -204,43 +337,41 @@ class ContentHost(Host, ContentHostMixins):
     @property
     def subscribed(self):
         """Boolean representation of a content host's subscription status"""
-        return 'Status: Unknown' not in self.execute('subscription-manager status').stdout
+        return self.subscription_facts.subscribed
 
     @property
     def identity(self):
         """A Dictionary containing RHSM identity attributes of the host"""
-        id_output = self.execute('subscription-manager identity').stdout
-        id_dict = {}
-        if id_output:
-            id_dict = {
-                i.split(':')[0].replace(' ', '_'): i.split(': ')[1]
-                for i in id_output.split('\n')[:-1]
-            }
-            regged_to = self.subscription_config['server']['hostname']
+        facts = self.subscription_facts
+        id_dict = dict(facts.identity)
+        if id_dict:
+            cp = ConfigParser()
+            cp.read_string(facts.rhsm_conf)
+            regged_to = cp['server']['hostname']
             if regged_to:
                 id_dict['registered_to'] = regged_to
         return id_dict
 
     @property
     def ip_addr(self):
-        ipv4, *ipv6 = self.execute('hostname -I').stdout.split()
+        ipv4, *ipv6 = self.probed_facts.ip_addresses
         return ipv4
 
     @cached_property
     def arch(self):
-        return self.get_facts().get('lscpu.architecture') or self.execute('uname -m').stdout.strip()
+        return self.probed_facts.arch or self.get_facts().get('lscpu.architecture')
 
     @cached_property
     def _redhat_release(self):
         """Process redhat-release file for distro and version information
         This is a fallback for when /etc/os-release is not available
         """
-        result = self.execute('cat /etc/redhat-release')
-        if result.status != 0:
-            raise ContentHostError(f'Not able to cat /etc/redhat-release "{result.stderr}"')
-        match = re.match(r'(?P<NAME>.+) release (?P<major>\d+)(.(?P<minor>\d+))?', result.stdout)
+        redhat_release = self.probed_facts.redhat_release
+        if redhat_release is None:
+            raise ContentHostError('Not able to cat /etc/redhat-release')
+        match = re.match(r'(?P<NAME>.+) release (?P<major>\d+)(.(?P<minor>\d+))?', redhat_release)
         if match is None:
-            raise ContentHostError(f'Not able to parse release string "{result.stdout}"')
+            raise ContentHostError(f'Not able to parse release string "{redhat_release}"')
         r_release = match.groupdict()
 
         # /etc/os-release compatibility layer
@@ -263,23 +394,11 @@ class ContentHost(Host, ContentHostMixins):
     @cached_property
     def _os_release(self):
         """Process os-release file for distro and version information"""
-        facts = {}
-        regex = r'^(["\'])(.*)(\1)$'
-        result = self.execute('cat /etc/os-release')
-        if result.status != 0:
-            logger.info(
-                f'Not able to cat /etc/os-release "{result.stderr}", '
-                'falling back to /etc/redhat-release'
-            )
+        os_release = self.probed_facts.os_release
+        if os_release is None:
+            logger.info('Not able to cat /etc/os-release, falling back to /etc/redhat-release')
             return self._redhat_release
-        for ln in [line for line in result.stdout.splitlines() if line.strip()]:
-            line = ln.strip()
-            if line.startswith('#'):
-                continue
-            key, value = line.split('=')
-            if key and value:
-                facts[key] = re.sub(regex, r'\2', value).replace('\\', '')
-        return facts
+        return os_release
 
     @property
     def os_distro(self):
@@ -302,7 +421,7 @@ class ContentHost(Host, ContentHostMixins):
     @cached_property
     def is_el(self):
         """Boolean representation of whether this host is an EL host"""
-        return self.execute('stat /etc/redhat-release').status == 0
+        return self.probed_facts.redhat_release is not None
 
     @property
     def is_rhel(self):
@@ -593,6 +712,7 @@ class ContentHost(Host, ContentHostMixins):
         self.execute(r'\cp -f /etc/rhsm/rhsm.conf{.bak,}')
         self.execute('subscription-manager clean')
         self._satellite = None
+        self._subscription_facts = None
 
     def install_cockpit(self):
         """Installs cockpit on the broker virtual machine.
@@ -710,6 +830,7 @@ class ContentHost(Host, ContentHostMixins):
                 raise CLIFactoryError(f'User {auth_username} doesn\'t exist')
         else:
             cmd = target.satellite.cli.HostRegistration.generate_command(options)
+        self._subscription_facts = None
         return self.execute(cmd.strip('\n'))
 
     def api_register(self, target, **kwargs):
@@ -722,6 +843,7 @@ class ContentHost(Host, ContentHostMixins):
         kwargs['insecure'] = kwargs.get('insecure', True)
         self._satellite = target.satellite
         command = target.satellite.api.RegistrationCommand(**kwargs).create()
+        self._subscription_facts = None
         return self.execute(command.strip('\n'))
 
     def register_contenthost(
@@ -799,6 +921,7 @@ class ContentHost(Host, ContentHostMixins):
         if baseurl:
             cmd += f' --baseurl {baseurl}'
 
+        self._subscription_facts = None
         return self.execute(cmd)
 
     def unregister(self):
@@ -808,27 +931,31 @@ class ContentHost(Host, ContentHostMixins):
             unregistration.
 
         """
+        self._subscription_facts = None
         return self.execute('subscription-manager unregister')
 
-    def get(self, remote_path, local_path=None):
-        """Get a remote file from the broker virtual machine."""
-        self.session.sftp_read(source=remote_path, destination=local_path)
+    def get(self, remote_path, local_path=None, sink=None):
+        """Get a remote file from the broker virtual machine.
+        If sink is given, stream the file contents to it instead of local_path,
+        see :func:`robottelo.ssh.sftp_read_into`.
+        """
+        if sink is not None:
+            return ssh.sftp_read_into(self, remote_path, sink)
+        return self.session.sftp_read(source=remote_path, destination=local_path)
 
     def put(self, local_path, remote_path=None, temp_file=False):
         """Put a local file to the broker virtual machine.
-        If local_path is a manifest object, write its contents to a temporary file
-        then continue with the upload.
+        If local_path is a manifest object, bytes or a binary file-like object, or
+        a string with temp_file, stream its contents to remote_path without
+        writing them to a local file. Without remote_path, the contents go through
+        a temporary file uploaded to the same path.
         """
         if temp_file:
-            with NamedTemporaryFile(dir=robottelo_tmp_dir) as content_file:
-                content_file.write(str.encode(local_path))
-                content_file.flush()
-                self.session.sftp_write(source=content_file.name, destination=remote_path)
+            ssh.sftp_write_data(self, str.encode(local_path), remote_path)
         elif 'utils.manifest' in str(local_path):
-            with NamedTemporaryFile(dir=robottelo_tmp_dir) as content_file:
-                content_file.write(local_path.content.read())
-                content_file.flush()
-                self.session.sftp_write(source=content_file.name, destination=remote_path)
+            ssh.sftp_write_data(self, local_path.content, remote_path)
+        elif isinstance(local_path, bytes | io.IOBase):
+            ssh.sftp_write_data(self, local_path, remote_path)
         else:
             self.session.sftp_write(source=local_path, destination=remote_path)
 
@@ -850,6 +977,7 @@ class ContentHost(Host, ContentHostMixins):
         cmd = f"subscription-manager config --server.proxy_hostname={hostname}"
         if port:
             cmd += f' --server.proxy_port={port}'
+        self._subscription_facts = None
         self.execute(cmd)
 
     def enable_dnf_proxy(self, hostname, scheme=None, port=None):
@@ -1469,6 +1597,161 @@ class ContentHost(Host, ContentHostMixins):
         host.update(['location'])
 
 
+class HostResult:
+    """Result of an operation run by :class:`HostGroup` on a single host
+
+    :param host: the host the operation ran on
+    :param result: value returned by the operation, ``None`` if it raised
+    :param error: exception raised by the operation, ``None`` if it succeeded
+    :param float duration: seconds the operation took
+    """
+
+    def __init__(self, host, result=None, error=None, duration=0.0):
+        self.host = host
+        self.result = result
+        self.error = error
+        self.duration = duration
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        outcome = 'ok' if self.ok else f'failed: {self.error!r}'
+        return f'<HostResult {self.host.hostname} {outcome} in {self.duration:.1f}s>'
+
+
+class HostGroupError(Exception):
+    """Raised when an operation failed on some hosts of a :class:`HostGroup`
+
+    :param report: the :class:`HostGroupReport` of the operation
+    """
+
+    def __init__(self, report):
+        self.report = report
+        failures = '\n'.join(
+            f'{result.host.hostname}: {result.error!r}' for result in report.failed
+        )
+        super().__init__(f'{len(report.failed)} of {len(report)} hosts failed:\n{failures}')
+
+
+class HostGroupReport:
+    """Results of an operation run by :class:`HostGroup`, in the order of the hosts
+
+    :param host_results: list of :class:`HostResult`
+    """
+
+    def __init__(self, host_results):
+        self.host_results = host_results
+
+    def __iter__(self):
+        return iter(self.host_results)
+
+    def __len__(self):
+        return len(self.host_results)
+
+    @property
+    def ok(self):
+        return all(result.ok for result in self.host_results)
+
+    @property
+    def results(self):
+        """Values returned by the operation on each host"""
+        return [result.result for result in self.host_results]
+
+    @property
+    def failed(self):
+        """:class:`HostResult` of the hosts the operation raised on"""
+        return [result for result in self.host_results if not result.ok]
+
+    @property
+    def errors(self):
+        """Exceptions raised by the operation keyed on hostname"""
+        return {result.host.hostname: result.error for result in self.failed}
+
+    def raise_for_errors(self):
+        """Raise :class:`HostGroupError` if the operation failed on any host"""
+        if self.failed:
+            raise HostGroupError(self)
+        return self
+
+
+class HostGroup(list):
+    """A list of hosts running the same operation on every host concurrently
+
+    Each host runs the operation in its own thread over its own ssh session, at
+    most ``max_workers`` hosts at a time. Failures are collected in the report
+    instead of interrupting the other hosts.
+
+    Example::
+
+        hosts = HostGroup(rex_contenthosts)
+        hosts.register(module_org, None, ak.name, target_sat).raise_for_errors()
+        statuses = [result.status for result in hosts.execute('dnf -y update').results]
+        for host_result in hosts.iter_run('install_katello_host_tools'):
+            logger.info(host_result)
+
+    :param hosts: the hosts of the group
+    :param int max_workers: maximum number of hosts running the operation at the
+        same time, ``HOST_GROUP_MAX_WORKERS`` by default
+    """
+
+    def __init__(self, hosts=(), max_workers=None):
+        super().__init__(hosts)
+        self.max_workers = max_workers or HOST_GROUP_MAX_WORKERS
+
+    @staticmethod
+    def _run_on(host, operation, args, kwargs):
+        start = time.monotonic()
+        try:
+            if isinstance(operation, str):
+                result = getattr(host, operation)(*args, **kwargs)
+            else:
+                result = operation(host, *args, **kwargs)
+        except Exception as err:  # reported in the HostGroupReport
+            logger.warning(f'{operation} failed on {host.hostname}: {err!r}')
+            return HostResult(host, error=err, duration=time.monotonic() - start)
+        return HostResult(host, result=result, duration=time.monotonic() - start)
+
+    def iter_run(self, operation, *args, **kwargs):
+        """Run ``operation`` on every host, yielding the results as hosts finish
+
+        :param operation: name of a host method, or a callable taking the host as
+            first argument; ``args`` and ``kwargs`` are passed to it
+        :return: generator of :class:`HostResult`, in completion order
+        """
+        if not self:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(self))) as executor:
+            futures = [
+                executor.submit(self._run_on, host, operation, args, kwargs) for host in self
+            ]
+            for done, future in enumerate(as_completed(futures), start=1):
+                host_result = future.result()
+                logger.debug(f'{operation} done on {done}/{len(self)} hosts: {host_result}')
+                yield host_result
+
+    def run(self, operation, *args, **kwargs):
+        """Run ``operation`` on every host, see :meth:`iter_run`
+
+        :return: a :class:`HostGroupReport`, in the order of the hosts
+        """
+        by_host = {id(result.host): result for result in self.iter_run(operation, *args, **kwargs)}
+        return HostGroupReport([by_host[id(host)] for host in self])
+
+    def execute(self, command, timeout=None):
+        """Execute ``command`` on every host, the results are the command results"""
+        return self.run('execute', command, timeout=timeout)
+
+    def register(self, *args, **kwargs):
+        """Register every host, see :meth:`ContentHost.register`"""
+        return self.run('register', *args, **kwargs)
+
+    def install_katello_host_tools(self):
+        """Install katello-host-tools on every host"""
+        return self.run('install_katello_host_tools')
+
+
 class Capsule(ContentHost, CapsuleMixins):
     rex_key_path = '~foreman-proxy/.ssh/id_rsa_foreman_proxy.pub'
     product_rpm_name = 'satellite-capsule'
@@ -1509,6 +1792,12 @@ class Capsule(ContentHost, CapsuleMixins):
                 self._satellite = Satellite()
         return self._satellite
 
+    @property
+    def _host_facts(self):
+        """Facts of the host read by :mod:`robottelo.utils.host_facts`, only
+        Satellites are probed"""
+        return None
+
     @cached_property
     def is_upstream(self):
         """Figure out which product distribution is installed on the server.
@@ -1516,6 +1805,8 @@ class Capsule(ContentHost, CapsuleMixins):
         :return: True if no downstream satellite RPMS are installed
         :rtype: bool
         """
+        if (facts := self._host_facts) and facts['version']:
+            return facts['capabilities']['is_upstream']
         return self.execute(f'rpm -q {self.product_rpm_name}').status != 0
 
     @cached_property
@@ -1525,6 +1816,8 @@ class Capsule(ContentHost, CapsuleMixins):
         :return: True if the Capsule is a stream release
         :rtype: bool
         """
+        if (facts := self._host_facts) and facts['version']:
+            return facts['capabilities']['is_stream']
         if self.is_upstream:
             return False
         return (
@@ -1533,6 +1826,8 @@ class Capsule(ContentHost, CapsuleMixins):
 
     @cached_property
     def version(self):
+        if (facts := self._host_facts) and facts['version']:
+            return facts['version']
         rpm_name = self.upstream_rpm_name if self.is_upstream else self.product_rpm_name
         return self.execute(f'rpm -q --qf "%{{VERSION}}" {rpm_name}').stdout
 
@@ -1603,6 +1898,7 @@ class Capsule(ContentHost, CapsuleMixins):
     def disable_ipv6_http_proxy(self):
         """Executes procedures for disabling IPv6 HTTP Proxy on Capsule"""
         if settings.server.is_ipv6:
+            self._subscription_facts = None
             self.execute('subscription-manager remove server.proxy_hostname server.proxy_port')
 
     def capsule_setup(self, sat_host=None, capsule_cert_opts=None, **installer_kwargs):
@@ -1700,27 +1996,8 @@ class Capsule(ContentHost, CapsuleMixins):
     @property
     def cli(self):
         """Import only satellite-maintain robottelo cli entities and wrap them under self.cli"""
-        self._cli = type('cli', (), {'_configured': False})
-        if self._cli._configured:
-            return self._cli
-
-        for file in Path('robottelo/cli/').iterdir():
-            if (
-                file.suffix == '.py'
-                and not file.name.startswith('_')
-                and file.name.startswith('sm_')
-            ):
-                cli_module = importlib.import_module(f'robottelo.cli.{file.stem}')
-                for name, obj in cli_module.__dict__.items():
-                    try:
-                        if Base in obj.mro():
-                            # create a copy of the class and set our hostname as a class attribute
-                            new_cls = type(name, (obj,), {'hostname': self.hostname})
-                            setattr(self._cli, name, new_cls)
-                    except AttributeError:
-                        # not everything has an mro method, we don't care about them
-                        pass
-        self._cli._configured = True
+        if getattr(self, '_cli', None) is None:
+            self._cli = CLINamespace(prefix='sm_', hostname=self.hostname)
         return self._cli
 
     def enable_satellite_or_capsule_module_for_rhel8(self):
@@ -1752,12 +2029,17 @@ class Satellite(Capsule, SatelliteMixins):
         self.omitting_credentials = False
         self.port = kwargs.get('port', settings.server.port)
         super().__init__(hostname=hostname, **kwargs)
-        # create dummy classes for later population
-        self._api = type('api', (), {'_configured': False})
-        self._cli = type('cli', (), {'_configured': False})
+        # the api, cli, apidoc and task watcher namespaces are built on first use
+        self._api = None
+        self._cli = None
         self._apidoc = None
+        self._task_watcher = None
         self.record_property = None
 
+    @property
+    def _host_facts(self):
+        return host_facts.get_facts(self.hostname)
+
     def _swap_nailgun(self, new_version):
         """Install a different version of nailgun from GitHub and invalidate the module cache."""
         import sys
@@ -1766,7 +2048,8 @@ class Satellite(Capsule, SatelliteMixins):
 
         pip_main(['uninstall', '-y', 'nailgun'])
         pip_main(['install', f'https://github.com/SatelliteQE/nailgun/archive/{new_version}.zip'])
-        self._api = type('api', (), {'_configured': False})
+        self._api = None
+        api_namespace.cache_clear()
         to_clear = [k for k in sys.modules if 'nailgun' in k]
         [sys.modules.pop(k) for k in to_clear]
 
@@ -1822,41 +2105,15 @@ class Satellite(Capsule, SatelliteMixins):
 
     @property
     def api(self):
-        """Import all nailgun entities and wrap them under self.api"""
-        if not self._api:
-            self._api = type('api', (), {'_configured': False})
-        if self._api._configured:
-            return self._api
-        from nailgun import entities as _entities  # use a private import
-        from nailgun.config import ServerConfig
-        from nailgun.entity_mixins import Entity
-
-        def inject_config(cls, server_config):
-            """inject a nailgun server config into the init of nailgun entity classes"""
-            import functools
-
-            class DecClass(cls):
-                __init__ = functools.partialmethod(cls.__init__, server_config=server_config)
-
-            return DecClass
-
-        # set the server configuration to point to this satellite
-        self.nailgun_cfg = ServerConfig(
-            auth=(settings.server.admin_username, settings.server.admin_password),
-            url=f'{self.url}',
-            verify=settings.server.verify_ca,
-        )
-        # add each nailgun entity to self.api, injecting our server config
-        for name, obj in _entities.__dict__.items():
-            try:
-                if Entity in obj.mro():
-                    #  create a copy of the class and inject our server config into the __init__
-                    new_cls = type(name, (obj,), {})
-                    setattr(self._api, name, inject_config(new_cls, self.nailgun_cfg))
-            except AttributeError:
-                # not everything has an mro method, we don't care about them
-                pass
-        self._api._configured = True
+        """Provide nailgun entities bound to this satellite under self.api"""
+        if getattr(self, '_api', None) is None:
+            # share the server configuration with every satellite using the same one
+            self._api = api_namespace(
+                url=f'{self.url}',
+                auth=(settings.server.admin_username, settings.server.admin_password),
+                verify=settings.server.verify_ca,
+            )
+            self.nailgun_cfg = self._api.server_config
         return self._api
 
     @property
@@ -1872,34 +2129,26 @@ class Satellite(Capsule, SatelliteMixins):
             ).apidoc
         return self._apidoc
 
+    @property
+    def task_watcher(self):
+        """Provide a single watcher polling all Foreman tasks waited for on this satellite"""
+        if getattr(self, '_task_watcher', None) is None:
+            self._task_watcher = ForemanTaskWatcher(self)
+        return self._task_watcher
+
     @property
     def cli(self):
         """Import all robottelo cli entities and wrap them under self.cli"""
-        if not self._cli:
-            self._cli = type('cli', (), {'_configured': False})
-        if self._cli._configured:
-            return self._cli
-
-        for file in Path('robottelo/cli/').iterdir():
-            if file.suffix == '.py' and not file.name.startswith('_'):
-                cli_module = importlib.import_module(f'robottelo.cli.{file.stem}')
-                for name, obj in cli_module.__dict__.items():
-                    try:
-                        if Base in obj.mro():
-                            # create a copy of the class and set our hostname as a class attribute
-                            new_cls = type(
-                                name,
-                                (obj,),
-                                {
-                                    'hostname': self.hostname,
-                                    'omitting_credentials': self.omitting_credentials,
-                                },
-                            )
-                            setattr(self._cli, name, new_cls)
-                    except AttributeError:
-                        # not everything has an mro method, we don't care about them
-                        pass
-        self._cli._configured = True
+        if getattr(self, '_cli', None) is None:
+            cache_ttl = settings.performance.hammer_cache_ttl
+            self._cli = CLINamespace(
+                hostname=self.hostname,
+                omitting_credentials=HostAttribute(self, 'omitting_credentials'),
+                use_hammer_shell=settings.performance.hammer_shell,
+                response_cache=(
+                    response_cache.get_cache(self.hostname, cache_ttl) if cache_ttl else None
+                ),
+            )
         return self._cli
 
     @contextmanager
@@ -1907,24 +2156,9 @@ class Satellite(Capsule, SatelliteMixins):
         change = not self.omitting_credentials  # if not already set to omit
         if change:
             self.omitting_credentials = True
-            # if CLI is already created
-            if self._cli._configured:
-                for name, obj in self._cli.__dict__.items():
-                    with contextlib.suppress(
-                        AttributeError
-                    ):  # not everything has an mro method, we don't care about them
-                        if Base in obj.mro():
-                            getattr(self._cli, name).omitting_credentials = True
         yield
         if change:
             self.omitting_credentials = False
-            if self._cli._configured:
-                for name, obj in self._cli.__dict__.items():
-                    with contextlib.suppress(
-                        AttributeError
-                    ):  # not everything has an mro method, we don't care about them
-                        if Base in obj.mro():
-                            getattr(self._cli, name).omitting_credentials = False
 
     @contextmanager
     def ui_session(self, testname=None, user=None, password=None, url=None, login=True):
@@ -1,6 +1,175 @@
 """Utility module to handle the shared ssh connection."""
 
+import codecs
+from functools import lru_cache
+import posixpath
+from tempfile import NamedTemporaryFile
+import threading
+import time
+
+from broker.helpers import translate_timeout
+from ssh2 import sftp as ssh2_sftp
+from ssh2.exceptions import SocketDisconnectError, SocketRecvError, SocketSendError
+
 from robottelo.cli import hammer
+from robottelo.logging import logger
+
+# errors raised by a pooled session whose underlying connection went away
+CONNECTION_ERRORS = (
+    ConnectionError,
+    EOFError,
+    SocketDisconnectError,
+    SocketRecvError,
+    SocketSendError,
+)
+# bytes handed to libssh2 per sftp call, which pipelines the packets of a call
+SFTP_CHUNK_SIZE = 256 * 1024
+SFTP_WRITE_FLAGS = (
+    ssh2_sftp.LIBSSH2_FXF_CREAT | ssh2_sftp.LIBSSH2_FXF_WRITE | ssh2_sftp.LIBSSH2_FXF_TRUNC
+)
+SFTP_MODE = (
+    ssh2_sftp.LIBSSH2_SFTP_S_IRUSR
+    | ssh2_sftp.LIBSSH2_SFTP_S_IWUSR
+    | ssh2_sftp.LIBSSH2_SFTP_S_IRGRP
+    | ssh2_sftp.LIBSSH2_SFTP_S_IROTH
+)
+
+
+class SSHConnectionPool:
+    """Per-process pool of persistent ssh clients.
+
+    Clients are keyed on ``(hostname, username, port)`` and on the calling
+    thread, so a single ssh session is never shared by concurrent threads.
+    Idle clients are evicted after ``idle_timeout`` seconds and clients idle
+    for longer than ``health_check_interval`` seconds are probed before reuse.
+
+    :param client_factory: callable returning a new client for the given
+        connection kwargs, defaults to :class:`robottelo.hosts.ContentHost`
+    :param int idle_timeout: seconds after which an unused client is closed
+    :param int health_check_interval: seconds of inactivity after which a
+        client is probed with a no-op command before being handed out
+    """
+
+    def __init__(self, client_factory=None, idle_timeout=600, health_check_interval=60):
+        self._client_factory = client_factory
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self._clients = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reconnects = 0
+
+    @property
+    def client_factory(self):
+        if self._client_factory is None:
+            from robottelo.hosts import ContentHost
+
+            return ContentHost
+        return self._client_factory
+
+    @staticmethod
+    def _key(hostname, username, port):
+        return (hostname, username, port, threading.get_ident())
+
+    @property
+    def stats(self):
+        """Return a dictionary with the pool counters"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'reconnects': self.reconnects,
+            'size': len(self._clients),
+        }
+
+    def _is_healthy(self, client):
+        try:
+            return client.execute('true', timeout='10s').status == 0
+        except Exception as err:  # any failure means the session is unusable
+            logger.debug(f'Pooled ssh session to {client.hostname} failed health check: {err}')
+            return False
+
+    @staticmethod
+    def _close(client):
+        try:
+            client.close()
+        except Exception as err:
+            logger.debug(f'Error while closing pooled ssh session to {client.hostname}: {err}')
+
+    def get(self, **kwargs):
+        """Return a pooled client for the given connection kwargs, creating it if needed
+
+        ``hostname``, ``username`` and ``port`` are used as the pool key, every
+        other kwarg is passed through to the client factory.
+        """
+        key = self._key(kwargs['hostname'], kwargs['username'], kwargs['port'])
+        self.evict_idle()
+        with self._lock:
+            entry = self._clients.pop(key, None)
+        if entry is not None:
+            client, last_used = entry
+            idle = time.monotonic() - last_used
+            if idle < self.health_check_interval or self._is_healthy(client):
+                self.hits += 1
+                with self._lock:
+                    self._clients[key] = (client, time.monotonic())
+                return client
+            self.reconnects += 1
+            self._close(client)
+        self.misses += 1
+        client = self.client_factory(**kwargs)
+        with self._lock:
+            self._clients[key] = (client, time.monotonic())
+        return client
+
+    def owns(self, client):
+        """Check whether ``client`` is currently held by the pool"""
+        with self._lock:
+            return any(pooled is client for pooled, _ in self._clients.values())
+
+    def discard(self, client):
+        """Remove ``client`` from the pool and close its connection"""
+        with self._lock:
+            keys = [key for key, (pooled, _) in self._clients.items() if pooled is client]
+            for key in keys:
+                del self._clients[key]
+        self._close(client)
+
+    def evict_idle(self):
+        """Close clients idle for longer than ``idle_timeout`` or owned by finished threads"""
+        now = time.monotonic()
+        alive = {thread.ident for thread in threading.enumerate()}
+        with self._lock:
+            expired = [
+                key
+                for key, (_, last_used) in self._clients.items()
+                if now - last_used > self.idle_timeout or key[-1] not in alive
+            ]
+            clients = [self._clients.pop(key)[0] for key in expired]
+        for client in clients:
+            self.evictions += 1
+            self._close(client)
+
+    def close_all(self):
+        """Close every pooled client"""
+        with self._lock:
+            clients = [client for client, _ in self._clients.values()]
+            self._clients.clear()
+        for client in clients:
+            self._close(client)
+
+
+@lru_cache
+def get_connection_pool():
+    """Return the process wide :class:`SSHConnectionPool`"""
+    from robottelo.config import settings
+
+    return SSHConnectionPool(
+        idle_timeout=settings.server.ssh_client.pool_idle_timeout,
+        health_check_interval=settings.server.ssh_client.pool_health_check_interval,
+    )
 
 
 def get_client(
@@ -9,22 +178,32 @@ def get_client(
     password=None,
     port=22,
     ipv6=None,
+    pooled=None,
 ):
     """Returns a host object that provides an ssh connection
 
     Processes ssh credentials in the order: password, key_filename, ssh_key
     Config validation enforces one of the three must be set in settings.server
+
+    :param bool pooled: reuse a persistent connection from the process wide
+        pool, defaults to ``settings.server.ssh_client.pool``
     """
     from robottelo.config import settings
-    from robottelo.hosts import ContentHost
 
-    return ContentHost(
+    client_kwargs = dict(
         hostname=hostname or settings.server.hostname,
         username=username or settings.server.ssh_username,
         password=password or settings.server.ssh_password,
         port=port or settings.server.ssh_client.port,
         ipv6=ipv6 or settings.server.is_ipv6,
     )
+    if pooled is None:
+        pooled = settings.server.ssh_client.pool
+    if pooled:
+        return get_connection_pool().get(**client_kwargs)
+    from robottelo.hosts import ContentHost
+
+    return ContentHost(**client_kwargs)
 
 
 def command(
@@ -41,19 +220,32 @@ def command(
 
     kwargs are passed through to get_connection
 
+    When the command fails because a pooled connection was dropped, the
+    connection is discarded and the command is retried once on a new one.
+
     :param str cmd: The command to run
     :param str output_format: json, csv or None
     :param int timeout: Time to wait for the ssh command to finish.
     :param connection_timeout: Time to wait for establishing the connection.
     """
-    client = get_client(
+    client_kwargs = dict(
         hostname=hostname,
         username=username,
         password=password,
         port=port,
         ipv6=ipv6,
     )
-    result = client.execute(cmd, timeout=timeout)
+    client = get_client(**client_kwargs)
+    try:
+        result = client.execute(cmd, timeout=timeout)
+    except CONNECTION_ERRORS as err:
+        # the command may already have run, so it is not retried, the next
+        # command gets a new session instead of the dropped one
+        pool = get_connection_pool()
+        if pool.owns(client):
+            logger.warning(f'Pooled ssh session to {client.hostname} dropped: {err}')
+            pool.discard(client)
+        raise
 
     if output_format and result.status == 0:
         if output_format == 'csv':
@@ -61,3 +253,155 @@ def command(
         if output_format == 'json':
             result.stdout = hammer.parse_json(result.stdout) if result.stdout else None
     return result
+
+
+class StreamedResult:
+    """Result of a command whose stdout is read while the command runs
+
+    Iterating over it runs the command and yields decoded stdout chunks as they
+    arrive. ``status`` and ``stderr`` are set once the iteration is finished.
+
+    :param client: a connected host object, e.g. from :func:`get_client`
+    :param str cmd: the command to run
+    :param timeout: time to wait for the ssh command to finish
+    """
+
+    def __init__(self, client, cmd, timeout=None):
+        self.client = client
+        self.cmd = cmd
+        self.timeout = timeout
+        self.status = None
+        self.stdout = None
+        self.stderr = ''
+
+    def __iter__(self):
+        session = getattr(self.client.session, 'session', None)
+        if not hasattr(session, 'open_session'):
+            # ssh backends without channel access, fall back to buffered output
+            result = self.client.execute(self.cmd, timeout=self.timeout)
+            self.status, self.stderr = result.status, result.stderr
+            if result.stdout:
+                yield result.stdout
+            return
+        if self.timeout:
+            session.set_timeout(translate_timeout(self.timeout))
+        channel = session.open_session()
+        closed = False
+        try:
+            channel.execute(self.cmd)
+            # multibyte characters may be split across reads
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            size, data = channel.read()
+            while size > 0:
+                if text := decoder.decode(data):
+                    yield text
+                size, data = channel.read()
+            if text := decoder.decode(b'', final=True):
+                yield text
+            channel.wait_eof()
+            stderr = []
+            size, data = channel.read_stderr()
+            while size > 0:
+                stderr.append(data)
+                size, data = channel.read_stderr()
+            self.stderr = b''.join(stderr).decode('utf-8', errors='replace')
+            # the exit status is only known once the channel is closed
+            channel.close()
+            closed = True
+            channel.wait_closed()
+            self.status = channel.get_exit_status()
+        finally:
+            if not closed:
+                channel.close()
+
+
+def stream_command(
+    cmd,
+    hostname=None,
+    username=None,
+    password=None,
+    timeout=None,
+    port=22,
+    ipv6=None,
+):
+    """Executes SSH command on remote hostname, streaming its stdout
+
+    Unlike :func:`command`, the output is not collected in memory before it is
+    handed out, which suits commands with very large outputs.
+
+    :param str cmd: The command to run
+    :param int timeout: Time to wait for the ssh command to finish.
+    :return: a :class:`StreamedResult`, the command runs when it is iterated
+    """
+    client = get_client(
+        hostname=hostname,
+        username=username,
+        password=password,
+        port=port,
+        ipv6=ipv6,
+    )
+    return StreamedResult(client, cmd, timeout=timeout)
+
+
+def _iter_chunks(data, size=SFTP_CHUNK_SIZE):
+    """Yield ``data``, a bytes-like or binary file-like object, in chunks of ``size`` bytes"""
+    if hasattr(data, 'read'):
+        while chunk := data.read(size):
+            yield chunk
+        return
+    view = memoryview(data).cast('B')
+    for offset in range(0, len(view), size):
+        yield view[offset : offset + size].tobytes()
+
+
+def sftp_write_data(client, data, remote_path):
+    """Write ``data`` to ``remote_path`` over sftp, without a local temporary file
+
+    :param client: a connected host object, e.g. from :func:`get_client`
+    :param data: a bytes-like object or a binary file-like object, read from
+        its current position
+    :param str remote_path: path of the file to write on the host, if None the
+        data is written to a temporary file uploaded to the same path, as broker does
+    """
+    session = getattr(client.session, 'session', None)
+    if remote_path is None or not hasattr(session, 'sftp_init'):
+        # ssh backends without sftp access, fall back to a temporary file
+        from robottelo.config import robottelo_tmp_dir
+
+        with NamedTemporaryFile(dir=robottelo_tmp_dir) as content_file:
+            for chunk in _iter_chunks(data):
+                content_file.write(chunk)
+            content_file.flush()
+            client.session.sftp_write(source=content_file.name, destination=remote_path)
+        return
+    if remote_dir := posixpath.dirname(remote_path):
+        client.execute(f'mkdir -p {remote_dir}')
+    sftp = session.sftp_init()
+    with sftp.open(remote_path, SFTP_WRITE_FLAGS, SFTP_MODE) as remote:
+        for chunk in _iter_chunks(data):
+            remote.write(chunk)
+
+
+def sftp_read_into(client, remote_path, sink):
+    """Stream ``remote_path`` to ``sink`` over sftp, without a local temporary file
+
+    :param client: a connected host object, e.g. from :func:`get_client`
+    :param str remote_path: path of the file to read on the host
+    :param sink: an object with a ``write`` method, e.g. ``BytesIO`` or an open
+        file, or an ``update`` method, e.g. a ``hashlib`` hash
+    :return: ``sink``
+    """
+    write = sink.write if hasattr(sink, 'write') else sink.update
+    session = getattr(client.session, 'session', None)
+    if not hasattr(session, 'sftp_init'):
+        write(client.session.sftp_read(source=remote_path, return_data=True))
+        return sink
+    sftp = session.sftp_init()
+    with sftp.open(
+        remote_path, ssh2_sftp.LIBSSH2_FXF_READ, ssh2_sftp.LIBSSH2_SFTP_S_IRUSR
+    ) as remote:
+        size, data = remote.read(SFTP_CHUNK_SIZE)
+        while size > 0:
+            write(data)
+            size, data = remote.read(SFTP_CHUNK_SIZE)
+    return sink
@@ -38,15 +38,30 @@ Usage::
        def test_that_conflict_with_test_to_lock(self)
             with locking_function(self.test_to_lock):
                 # do some operations that conflict with test_to_lock
+
+    # tests that only read what the locked function writes can hold the lock
+    # together, they only wait for the exclusive holders
+    class SomeTestCase(TestCase):
+
+       def test_reading(self):
+            with locking_function(self.test_to_lock, shared=True):
+                # do some read only operations
+
+    # a timeout of 0 only tries to acquire the lock once, FunctionLockerTimeout
+    # is raised with the process holding it if it is not free
+
+The wait and hold times of every lock are recorded by the process, see
+:func:`get_lock_metrics`.
 """
 
 from contextlib import contextmanager
+import fcntl
 import functools
 import inspect
 import os
+import random
 import tempfile
-
-from pytest_services.locks import file_lock
+import time
 
 from robottelo.config import settings
 from robottelo.logging import logger
@@ -60,11 +75,24 @@ LOCK_DEFAULT_SCOPE = None
 
 _DEFAULT_CLASS_NAME_DEPTH = 3
 
+# upper bounds in seconds of the buckets of the wait and hold time histograms
+METRICS_BUCKETS = (0.01, 0.1, 1, 10, 60, 300, 1800)
+
+# the lock files held by this process, keyed on path
+_held_locks = {}
+_held_locks_pid = None
+# wait and hold times of the locks acquired by this process, keyed on lock name
+_lock_metrics = {}
+
 
 class FunctionLockerError(Exception):
     """the default function locker error"""
 
 
+class FunctionLockerTimeout(FunctionLockerError):
+    """the lock was not acquired before the timeout"""
+
+
 def set_default_scope(value):
     """Set the default namespace scope
 
@@ -147,6 +175,11 @@ def _get_function_name(function, class_name=None):
     return '.'.join(names)
 
 
+def _get_lock_name(function_name, scope_context=None):
+    """Return the name of the lock in the metrics"""
+    return f'{scope_context}:{function_name}' if scope_context else function_name
+
+
 def _get_function_name_lock_path(function_name, scope=None, scope_kwargs=None, scope_context=None):
     """Return the path of the file to lock"""
     return os.path.join(
@@ -155,28 +188,139 @@ def _get_function_name_lock_path(function_name, scope=None, scope_kwargs=None, s
     )
 
 
-def _check_deadlock(lock_file_path, process_id):
-    """To prevent process deadlock, raise exception if the file content is the
-    same as process_id
+def _get_held_locks():
+    """Return the lock files held by this process, not the ones of the parent
+    process when forked
+    """
+    global _held_locks, _held_locks_pid
+    if _held_locks_pid != os.getpid():
+        _held_locks = {}
+        _held_locks_pid = os.getpid()
+    return _held_locks
+
+
+def _check_deadlock(lock_file_path):
+    """To prevent process deadlock, raise exception if the lock file is
+    already held by this process
 
     note: this function is called before the lock
 
     :type lock_file_path: str
-    :type process_id: str
     """
-    if os.path.exists(lock_file_path):
+    if lock_file_path in _get_held_locks():
+        raise FunctionLockerError(
+            'recursion detected: the function file already locked by the same process'
+        )
+
+
+def _read_lock_owner(lock_file_path):
+    """Return the process id written by the exclusive holder of the lock"""
+    try:
+        with open(lock_file_path) as lock_file_handler:
+            return lock_file_handler.read() or None
+    except OSError:
+        return None
+
+
+def _new_histogram():
+    return {'buckets': [0] * (len(METRICS_BUCKETS) + 1), 'count': 0, 'total': 0.0, 'max': 0.0}
+
+
+def _observe(histogram, value):
+    index = next(
+        (index for index, bound in enumerate(METRICS_BUCKETS) if value <= bound),
+        len(METRICS_BUCKETS),
+    )
+    histogram['buckets'][index] += 1
+    histogram['count'] += 1
+    histogram['total'] += value
+    histogram['max'] = max(histogram['max'], value)
+
+
+def _get_metrics(lock_name, shared):
+    mode = 'shared' if shared else 'exclusive'
+    return _lock_metrics.setdefault(
+        f'{lock_name} ({mode})',
+        {'timeouts': 0, 'wait': _new_histogram(), 'hold': _new_histogram()},
+    )
+
+
+def get_lock_metrics():
+    """Return the wait and hold time histograms of the locks used by this
+    process, keyed on lock name and mode
+
+    Histograms count the times per bucket of :data:`METRICS_BUCKETS`, the last
+    bucket counting the longer ones, and hold their ``count``, ``total`` and
+    ``max``.
+    """
+    return _lock_metrics
+
+
+def merge_lock_metrics(metrics, other):
+    """Add the lock metrics ``other``, e.g. of an other process, to ``metrics``"""
+    for name, other_entry in other.items():
+        entry = metrics.setdefault(
+            name, {'timeouts': 0, 'wait': _new_histogram(), 'hold': _new_histogram()}
+        )
+        entry['timeouts'] += other_entry['timeouts']
+        for kind in ('wait', 'hold'):
+            histogram, other_histogram = entry[kind], other_entry[kind]
+            histogram['buckets'] = [
+                count + other_count
+                for count, other_count in zip(
+                    histogram['buckets'], other_histogram['buckets'], strict=True
+                )
+            ]
+            histogram['count'] += other_histogram['count']
+            histogram['total'] += other_histogram['total']
+            histogram['max'] = max(histogram['max'], other_histogram['max'])
+    return metrics
+
+
+@contextmanager
+def _acquire(lock_file_path, lock_name, shared=False, timeout=LOCK_DEFAULT_TIMEOUT):
+    """Hold an exclusive or shared lock on the lock file
+
+    The exclusive lock is the ``flock`` used by ``pytest_services`` file locks.
+
+    :raise FunctionLockerTimeout: if the lock was not acquired before timeout
+    """
+    process_id = str(os.getpid())
+    # to prevent dead lock when recursively calling this function
+    # check if the same process is trying to acquire the lock
+    _check_deadlock(lock_file_path)
+    metrics = _get_metrics(lock_name, shared)
+    flags = (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB
+    with open(lock_file_path, 'a+') as handler:
+        start = time.monotonic()
+        while True:
+            try:
+                fcntl.flock(handler.fileno(), flags)
+                break
+            except BlockingIOError:
+                waited = time.monotonic() - start
+                if waited >= timeout:
+                    metrics['timeouts'] += 1
+                    _observe(metrics['wait'], waited)
+                    owner = _read_lock_owner(lock_file_path) or 'unknown (shared holders)'
+                    logger.warning(
+                        f'process id: {process_id} - lock {lock_name} not acquired after '
+                        f'{waited:.1f}s, held by process id: {owner}'
+                    )
+                    raise FunctionLockerTimeout(
+                        f'lock {lock_name} not acquired after {waited:.1f}s, '
+                        f'held by process id: {owner}'
+                    ) from None
+            time.sleep(min(random.random() * 0.1 + 0.05, max(timeout - waited, 0)))
+        acquired = time.monotonic()
+        _observe(metrics['wait'], acquired - start)
+        _get_held_locks()[lock_file_path] = shared
         try:
-            with open(lock_file_path) as lock_file_handler:
-                lock_file_content = lock_file_handler.read()
-        except OSError as exp:
-            # do nothing, but anyway log the exception
-            logger.exception(exp)
-            lock_file_content = None
-
-        if lock_file_content and lock_file_content == process_id:
-            raise FunctionLockerError(
-                'recursion detected: the function file already locked by the same process'
-            )
+            yield handler
+        finally:
+            _get_held_locks().pop(lock_file_path, None)
+            fcntl.flock(handler.fileno(), fcntl.LOCK_UN)
+            _observe(metrics['hold'], time.monotonic() - acquired)
 
 
 def _write_content(handler, content):
@@ -194,6 +338,7 @@ def lock_function(
     scope_context=None,
     scope_kwargs=None,
     timeout=LOCK_DEFAULT_TIMEOUT,
+    shared=False,
 ):
     """Generic function locker, lock any decorated function. Any parallel
      pytest xdist worker will wait for this function to finish
@@ -203,13 +348,17 @@ def lock_function(
     :type scope_kwargs: dict
     :type scope_context: str
     :type timeout: int
+    :type shared: bool
 
     :param function: the function that is intended to be locked
     :param scope: this parameter will define the namespace of locking
     :param scope_context: an added context string if applicable, of a concrete
            lock in combination with scope and function.
     :param scope_kwargs: kwargs to be passed to scope if is a callable
-    :param timeout: the time in seconds to wait for acquiring the lock
+    :param timeout: the time in seconds to wait for acquiring the lock, 0 to
+        only try once, :class:`FunctionLockerTimeout` is raised on expiration
+    :param shared: whether to hold the lock with other shared holders, only
+        exclusive holders are waited for and wait for them
     """
     class_names = []
     class_name = None
@@ -234,14 +383,14 @@ def lock_function(
                 function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
             )
             process_id = str(os.getpid())
-            # to prevent dead lock when recursively calling this function
-            # check if the same process is trying to acquire the lock
-            _check_deadlock(lock_file_path, process_id)
+            lock_name = _get_lock_name(function_name, scope_context=scope_context)
 
-            with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
+            with _acquire(lock_file_path, lock_name, shared=shared, timeout=timeout) as handler:
                 logger.info(
                     f'process id: {process_id} lock function using file path: {lock_file_path}'
                 )
+                if shared:
+                    return func(*args, **kwargs)
                 # write the process id that locked this function
                 _write_content(handler, process_id)
                 # call the locked function
@@ -270,6 +419,7 @@ def locking_function(
     scope_context=None,
     scope_kwargs=None,
     timeout=LOCK_DEFAULT_TIMEOUT,
+    shared=False,
 ):
     """Lock a function in combination with a scope and scope_context.
     Any parallel pytest xdist worker will wait for this function to finish.
@@ -279,13 +429,17 @@ def locking_function(
     :type scope_kwargs: dict
     :type scope_context: str
     :type timeout: int
+    :type shared: bool
 
     :param function: the function that is intended to be locked
     :param scope: this parameter will define the namespace of locking
     :param scope_context: an added context string if applicable, of a concrete
            lock in combination with scope and function.
     :param scope_kwargs: kwargs to be passed to scope if is a callable
-    :param timeout: the time in seconds to wait for acquiring the lock
+    :param timeout: the time in seconds to wait for acquiring the lock, 0 to
+        only try once, :class:`FunctionLockerTimeout` is raised on expiration
+    :param shared: whether to hold the lock with other shared holders, only
+        exclusive holders are waited for and wait for them
     """
     if not getattr(function, '__function_locked__', False):
         raise FunctionLockerError('Cannot ensure locking when using a non locked function')
@@ -295,14 +449,15 @@ def locking_function(
         function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
     )
     process_id = str(os.getpid())
-    # to prevent dead lock when recursively calling this function
-    # check if the same process is trying to acquire the lock
-    _check_deadlock(lock_file_path, process_id)
+    lock_name = _get_lock_name(function_name, scope_context=scope_context)
 
-    with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
+    with _acquire(lock_file_path, lock_name, shared=shared, timeout=timeout) as handler:
         logger.info(
             f'process id: {process_id} - lock function name:{function_name}  - using file path: {lock_file_path}'
         )
+        if shared:
+            yield handler
+            return
         # write the process id that locked this function
         _write_content(handler, process_id)
         # let the locked code run
@@ -25,3 +25,18 @@ class BaseStorageHandler:
     def set(self, key, value):
         """Write the value of key to storage"""
         raise NotImplementedError
+
+    def compare_and_set(self, key, expected_id, value):
+        """Write the value of key only if the id of the stored value is
+        expected_id, ``None`` when no value is expected to be stored
+
+        This implementation is only atomic when called with the key lock held,
+        handlers supporting an atomic check and write override it.
+
+        :return: True if the value was written
+        """
+        stored = self.get(key)
+        if (stored and stored.get('id')) != expected_id:
+            return False
+        self.set(key, value)
+        return True
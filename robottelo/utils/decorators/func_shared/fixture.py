@@ -0,0 +1,261 @@
+"""Shared fixture is a decorator of pytest fixtures, the first xdist worker
+requesting the fixture runs its setup on a Satellite and stores the result,
+the other workers using the same Satellite get the stored result instead of
+repeating the setup.
+
+The fixture dependencies are only requested by the worker running the setup,
+the fixture result must be made of nailgun entities and json compatible
+values. Entities are stored as their class name and id and read again from
+the Satellite by the other workers.
+
+Workers count their uses of the stored result, the teardown of a yield
+fixture runs once every worker released it, in the worker that ran the
+setup. That worker waits for the other workers at the end of its session if
+needed.
+
+Note: results are only shared when the shared functions are enabled, see
+    ``shared_function.enabled``, the fixture is a regular fixture otherwise.
+    The result is stored under the fixture name, the Satellite hostname and the
+    fixture param only, every module of every worker using that Satellite gets
+    the result of the first setup. A shared fixture must create what it returns
+    rather than build on per module or per test fixtures, e.g. ``module_org``,
+    whose objects differ in the other modules and workers.
+
+Usage::
+
+    @pytest.fixture(scope='module')
+    @shared_fixture
+    def shared_sca_manifest_org(module_target_sat):
+        org = module_target_sat.api.Organization().create()
+        with Manifester(manifest_category=settings.manifest.golden_ticket) as manifest:
+            module_target_sat.upload_manifest(org.id, manifest.content)
+            yield org
+"""
+
+import functools
+import inspect
+import os
+import time
+import uuid
+
+from nailgun import entities
+from nailgun.entities import Entity
+
+from robottelo.config import settings
+from robottelo.logging import logger
+from robottelo.utils.decorators.func_shared.shared import (
+    SharedFunctionError,
+    _get_default_storage_handler,
+    _get_function_name,
+    _get_function_name_key,
+    is_enabled,
+)
+
+_STATE_READY = 'READY'
+_STATE_TORN_DOWN = 'TORN_DOWN'
+
+_SCOPE_CONTEXT = 'fixture'
+# the fixture argument providing the Satellite the setup runs on
+_SATELLITE_ARG_SUFFIX = 'target_sat'
+# seconds between checks of the uses of a result waiting for its teardown
+_RELEASE_POLL_INTERVAL = 5
+
+
+def _serialize(result):
+    """Return the json compatible representation of a fixture result"""
+    if isinstance(result, Entity):
+        return {'__entity__': type(result).__name__, 'id': result.id}
+    if isinstance(result, tuple):
+        return {'__tuple__': [_serialize(item) for item in result]}
+    if isinstance(result, list):
+        return [_serialize(item) for item in result]
+    if isinstance(result, dict):
+        return {key: _serialize(value) for key, value in result.items()}
+    if result is None or isinstance(result, str | int | float | bool):
+        return result
+    raise SharedFunctionError(
+        f'unable to share {type(result).__name__}, shared fixtures must return nailgun '
+        'entities and json compatible values'
+    )
+
+
+def _rehydrate(data, satellite=None):
+    """Return the fixture result from its json representation, entities are
+    read from ``satellite``
+    """
+    if isinstance(data, list):
+        return [_rehydrate(item, satellite) for item in data]
+    if isinstance(data, dict):
+        if '__entity__' in data:
+            api = satellite.api if satellite is not None else entities
+            return getattr(api, data['__entity__'])(id=data['id']).read()
+        if '__tuple__' in data:
+            return tuple(_rehydrate(item, satellite) for item in data['__tuple__'])
+        return {key: _rehydrate(value, satellite) for key, value in data.items()}
+    return data
+
+
+class _SharedFixture:
+    """Internal class helper that is created each time a shared fixture is
+    requested and group the setup and teardown of its stored result
+    """
+
+    def __init__(self, function, request, storage_handler=None):
+        if storage_handler is None:
+            storage_handler = _get_default_storage_handler()
+        self._function = function
+        self._request = request
+        self._storage_handler = storage_handler
+        self._transaction = uuid.uuid4().hex
+        self._argnames = list(inspect.signature(function).parameters)
+        satellite_args = [name for name in self._argnames if name.endswith(_SATELLITE_ARG_SUFFIX)]
+        self.satellite = request.getfixturevalue(satellite_args[0]) if satellite_args else None
+        hostname = self.satellite.hostname if self.satellite else settings.server.hostname
+        scope_kwargs = {'hostname': hostname}
+        if hasattr(request, 'param'):
+            scope_kwargs['param'] = request.param
+        self._key = _get_function_name_key(
+            _get_function_name(function, kwargs=scope_kwargs), scope_context=_SCOPE_CONTEXT
+        )
+        self._teardown = None
+        self._used_id = None
+
+    @property
+    def storage(self):
+        return self._storage_handler
+
+    @property
+    def key(self):
+        return self._key
+
+    def _call_function(self):
+        """Run the fixture setup, requesting its dependencies"""
+        kwargs = {name: self._request.getfixturevalue(name) for name in self._argnames}
+        result = self._function(**kwargs)
+        if inspect.isgenerator(result):
+            self._teardown = result
+            result = next(result)
+        return result
+
+    def _update(self, stored_id, value):
+        if not self.storage.compare_and_set(self.key, stored_id, value):
+            raise SharedFunctionError(f'shared fixture {self.key}: stored value changed')
+
+    def setup(self):
+        """Return the fixture result, running the setup if no worker did"""
+        with self.storage.lock(self.key) as data:
+            self.storage.when_lock_acquired(data)
+            value = self.storage.get(self.key)
+            if value is not None and value['state'] == _STATE_READY:
+                logger.info(f'using shared fixture {self.key} set up by PID: {value["pid"]}')
+                value['users'] += 1
+                self._update(value['id'], value)
+                self._used_id = value['id']
+            else:
+                result = self._call_function()
+                try:
+                    self._update(
+                        value and value['id'],
+                        dict(
+                            state=_STATE_READY,
+                            id=self._transaction,
+                            result=_serialize(result),
+                            pid=os.getpid(),
+                            users=1,
+                        ),
+                    )
+                except SharedFunctionError:
+                    # pytest never tears down a fixture whose setup failed
+                    if self._teardown is not None:
+                        self._run_teardown()
+                    raise
+                self._used_id = self._transaction
+                return result
+        return _rehydrate(value['result'], self.satellite)
+
+    def _release(self):
+        """Stop using the stored result"""
+        with self.storage.lock(self.key) as data:
+            self.storage.when_lock_acquired(data)
+            value = self.storage.get(self.key)
+            if value is not None and value['id'] == self._used_id:
+                value['users'] -= 1
+                self._update(value['id'], value)
+
+    def _mark_torn_down(self):
+        """Mark the stored result as torn down if no worker uses it
+
+        :return: whether the result has to be torn down
+        """
+        with self.storage.lock(self.key) as data:
+            self.storage.when_lock_acquired(data)
+            value = self.storage.get(self.key)
+            if value is None or value['id'] != self._used_id:
+                # expired from the storage, no worker can get it anymore
+                return True
+            if value['users'] > 0:
+                return False
+            value['state'] = _STATE_TORN_DOWN
+            self._update(value['id'], value)
+            return True
+
+    def _run_teardown(self):
+        logger.info(f'tearing down shared fixture {self.key}')
+        try:
+            next(self._teardown)
+        except StopIteration:
+            pass
+        else:
+            raise SharedFunctionError(f'shared fixture {self.key} yielded more than once')
+
+    def _wait_and_tear_down(self):
+        """Wait for the other workers to release the result, then tear it down"""
+        deadline = time.monotonic() + settings.shared_function.lock_timeout
+        while not self._mark_torn_down():
+            if time.monotonic() >= deadline:
+                logger.warning(f'shared fixture {self.key} still in use, not tearing it down')
+                return
+            time.sleep(_RELEASE_POLL_INTERVAL)
+        self._run_teardown()
+
+    def teardown(self):
+        """Release the stored result, tearing it down if this worker ran the setup"""
+        self._release()
+        if self._teardown is None:
+            return
+        if self._mark_torn_down():
+            self._run_teardown()
+        else:
+            # other workers still use the result
+            self._request.config.add_cleanup(self._wait_and_tear_down)
+
+
+def shared_fixture(function):
+    """Share the result of a fixture between the xdist workers using the same
+    Satellite, see the module documentation
+
+    :type function: callable
+    :param function: the fixture function, decorate it with ``pytest.fixture``
+        after ``shared_fixture``
+    """
+
+    @functools.wraps(function)
+    def fixture_wrapper(request):
+        if not is_enabled():
+            kwargs = {name: request.getfixturevalue(name) for name in _argnames}
+            result = function(**kwargs)
+            if inspect.isgenerator(result):
+                yield from result
+            else:
+                yield result
+            return
+        shared_object = _SharedFixture(function, request)
+        yield shared_object.setup()
+        shared_object.teardown()
+
+    _argnames = list(inspect.signature(function).parameters)
+    # pytest must only resolve the dependencies when the setup runs
+    fixture_wrapper.__signature__ = inspect.Signature(
+        [inspect.Parameter('request', inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+    )
+    return fixture_wrapper
@@ -99,11 +99,16 @@ from nailgun.entities import Entity
 
 from robottelo.config import setting_is_set, settings
 from robottelo.logging import logger
-from robottelo.utils.decorators.func_shared import file_storage, redis_storage
+from robottelo.utils.decorators.func_shared import file_storage, redis_storage, sqlite_storage
 from robottelo.utils.decorators.func_shared.file_storage import FileStorageHandler
 from robottelo.utils.decorators.func_shared.redis_storage import RedisStorageHandler
+from robottelo.utils.decorators.func_shared.sqlite_storage import SQLiteStorageHandler
 
-_storage_handlers = {'file': FileStorageHandler, 'redis': RedisStorageHandler}
+_storage_handlers = {
+    'file': FileStorageHandler,
+    'redis': RedisStorageHandler,
+    'sqlite': SQLiteStorageHandler,
+}
 
 DEFAULT_STORAGE_HANDLER = 'file'
 # by default using the shared data is disabled
@@ -150,6 +155,8 @@ def _check_config():
         redis_storage.REDIS_PORT = settings.shared_function.redis_port
         redis_storage.REDIS_DB = settings.shared_function.redis_db
         redis_storage.REDIS_PASSWORD = settings.shared_function.redis_password
+        sqlite_storage.LOCK_TIMEOUT = settings.shared_function.lock_timeout
+        sqlite_storage.VALUE_TTL = settings.shared_function.share_timeout
         _set_configured(True)
 
 
@@ -161,6 +168,12 @@ def enable_shared_function(value):
     ENABLED = bool(value)
 
 
+def is_enabled():
+    """Return whether the shared data is used"""
+    _check_config()
+    return ENABLED
+
+
 def set_default_scope(value):
     """Set the default namespace scope
     :type value: str or callable
@@ -302,6 +315,7 @@ class _SharedFunction:
             exp = None
             pid = None
             value = self.storage.get(self.key)
+            stored_id = None if value is None else value.get('id')
             if value is None:
                 call_function = True
             else:
@@ -349,7 +363,12 @@ class _SharedFunction:
                         pid=os.getpid(),
                         creation_datetime=creation_datetime,
                     )
-                self.storage.set(self.key, value)
+                if not self.storage.compare_and_set(self.key, stored_id, value):
+                    # an other process wrote the value without holding the lock
+                    logger.warning(
+                        f'shared function {self.key}: value stored by an other process, '
+                        'keeping it'
+                    )
 
         if call_function and exp:
             # i'am in the first launched process
@@ -0,0 +1,232 @@
+"""Key value storage handler keeping all the shared functions data in a single
+SQLite database.
+
+The database is in WAL mode, so readers do not block the writer. Values and
+locks are rows of their own tables, a lock held while a long running function
+is called only blocks the callers of that same key. Values are stored with an
+expiration time, expired values are evicted when values are written.
+
+Locks are owned by a process id, the database is expected to be shared by
+processes of the same host only, like the file storage.
+"""
+
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from robottelo.utils.decorators.func_shared.base import BaseStorageHandler
+from robottelo.utils.decorators.func_shared.file_storage import _get_root_dir
+
+DATABASE_NAME = 'shared_functions.db'
+LOCK_TIMEOUT = 7200
+# seconds a stored value is kept before being evicted
+VALUE_TTL = 86400
+# seconds a statement waits for the database write lock
+BUSY_TIMEOUT = 60
+# seconds between attempts to acquire the lock of a key, doubled up to LOCK_MAX_INTERVAL
+LOCK_INTERVAL = 0.01
+LOCK_MAX_INTERVAL = 0.1
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS shared_values '
+    '(key TEXT PRIMARY KEY, value TEXT NOT NULL, value_id TEXT, expires_at REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS shared_values_expires_at ON shared_values (expires_at)',
+    'CREATE TABLE IF NOT EXISTS shared_locks '
+    '(key TEXT PRIMARY KEY, owner TEXT NOT NULL, pid INTEGER NOT NULL, acquired_at REAL NOT NULL)',
+)
+
+# connections of the current thread keyed on database path, handlers are
+# created for each shared function call and reuse them
+_local = threading.local()
+
+
+def _get_connection(db_path):
+    connections = getattr(_local, 'connections', None)
+    # a connection must not be used by a forked process
+    if connections is None or _local.pid != os.getpid():
+        connections = _local.connections = {}
+        _local.pid = os.getpid()
+    if db_path not in connections:
+        connection = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        for statement in SCHEMA:
+            connection.execute(statement)
+        connections[db_path] = connection
+    return connections[db_path]
+
+
+def _is_process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # the process exists but belongs to an other user
+        return True
+    return True
+
+
+class SQLiteStorageHandler(BaseStorageHandler):
+    """Key value SQLite storage handler"""
+
+    def __init__(self, db_path=None, lock_timeout=None, ttl=None):
+        if db_path is None:
+            db_path = os.path.join(_get_root_dir(), DATABASE_NAME)
+        self._db_path = db_path
+        self._lock_timeout = LOCK_TIMEOUT if lock_timeout is None else lock_timeout
+        self._ttl = VALUE_TTL if ttl is None else ttl
+
+    @property
+    def db_path(self):
+        return self._db_path
+
+    @property
+    def connection(self):
+        return _get_connection(self._db_path)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Hold the database write lock, changes are committed on exit"""
+        connection = self.connection
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def _is_locked(self, connection, key):
+        row = connection.execute('SELECT pid FROM shared_locks WHERE key = ?', (key,)).fetchone()
+        return bool(row) and _is_process_alive(row[0])
+
+    def _try_lock(self, key, owner):
+        """Acquire the lock of key unless a living process holds it"""
+        # waiting callers only read, the write lock is taken once the key looks free
+        if self._is_locked(self.connection, key):
+            return False
+        with self._transaction() as connection:
+            if self._is_locked(connection, key):
+                return False
+            connection.execute(
+                'INSERT OR REPLACE INTO shared_locks (key, owner, pid, acquired_at) '
+                'VALUES (?, ?, ?, ?)',
+                (key, owner, os.getpid(), time.time()),
+            )
+        return True
+
+    @contextlib.contextmanager
+    def lock(self, key):
+        """Return the storage locker context manager
+
+        The lock is held until released or until the process holding it dies,
+        waiting for it longer than the lock timeout raises ``TimeoutError``.
+        """
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + self._lock_timeout
+        interval = LOCK_INTERVAL
+        while not self._try_lock(key, owner):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f'timeout while waiting for the lock of {key}')
+            time.sleep(interval)
+            interval = min(interval * 2, LOCK_MAX_INTERVAL)
+        try:
+            yield owner
+        finally:
+            with self._transaction() as connection:
+                connection.execute(
+                    'DELETE FROM shared_locks WHERE key = ? AND owner = ?', (key, owner)
+                )
+
+    def when_lock_acquired(self, owner):
+        # do nothing, the process id is stored with the lock
+        pass
+
+    def _is_stored_id(self, connection, key, expected_id):
+        """Check whether the id of the stored value is expected_id
+
+        A value read before it expired keeps its id until it is evicted, so a
+        value expiring while the shared function runs is still replaced. An
+        expired value is missing for callers that read ``None``.
+        """
+        row = connection.execute(
+            'SELECT value_id, expires_at FROM shared_values WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return expected_id is None
+        value_id, expires_at = row
+        if expected_id is None:
+            return expires_at <= time.time()
+        return value_id == expected_id
+
+    def _write(self, connection, key, value):
+        now = time.time()
+        connection.execute('DELETE FROM shared_values WHERE expires_at <= ?', (now,))
+        connection.execute(
+            'INSERT OR REPLACE INTO shared_values (key, value, value_id, expires_at) '
+            'VALUES (?, ?, ?, ?)',
+            (
+                key,
+                self.encode(value),
+                value.get('id') if isinstance(value, dict) else None,
+                now + self._ttl,
+            ),
+        )
+
+    def get(self, key):
+        """Return the key value, ``None`` if missing or expired
+
+        :type key: str
+        """
+        row = self.connection.execute(
+            'SELECT value FROM shared_values WHERE key = ? AND expires_at > ?',
+            (key, time.time()),
+        ).fetchone()
+        return None if row is None else self.decode(row[0])
+
+    def set(self, key, value):
+        """Write the value of key
+
+        :type key: str
+        :type value: object
+        """
+        with self._transaction() as connection:
+            self._write(connection, key, value)
+
+    def compare_and_set(self, key, expected_id, value):
+        """Write the value of key in a single transaction, only if the id of
+        the stored value is expected_id
+
+        :type key: str
+        :type expected_id: str or None
+        :type value: dict
+        :return: True if the value was written
+        """
+        with self._transaction() as connection:
+            if not self._is_stored_id(connection, key, expected_id):
+                return False
+            self._write(connection, key, value)
+        return True
+
+    def evict_expired(self):
+        """Delete the expired values and the locks held by dead processes
+
+        :return: the number of deleted values
+        """
+        with self._transaction() as connection:
+            evicted = connection.execute(
+                'DELETE FROM shared_values WHERE expires_at <= ?', (time.time(),)
+            ).rowcount
+            dead_pids = [
+                pid
+                for (pid,) in connection.execute('SELECT DISTINCT pid FROM shared_locks')
+                if not _is_process_alive(pid)
+            ]
+            connection.executemany(
+                'DELETE FROM shared_locks WHERE pid = ?', [(pid,) for pid in dead_pids]
+            )
+        return evicted
@@ -0,0 +1,222 @@
+"""Durations of tests, recorded for every run and estimated from previous runs.
+
+The durations of every phase and fixture setup of every run are kept in a
+SQLite database, see :class:`DurationStore` and ``scripts/duration_report.py``.
+
+The duration of a test is the sum of its setup, call and teardown phases. The
+estimate of every test is a moving average of its durations in the last runs
+of the store, tests that never ran are estimated with the median of the known
+tests.
+"""
+
+from contextlib import contextmanager
+from functools import lru_cache
+import math
+from pathlib import Path
+import sqlite3
+import statistics
+
+from robottelo.logging import logger
+
+# weight of the last run in the moving average
+SMOOTHING = 0.5
+# estimate in seconds of tests when no duration is known at all
+DEFAULT_DURATION = 10.0
+# number of previous runs the estimates are computed from
+ESTIMATE_RUNS = 10
+# bump when the schema of the duration store changes
+STORE_VERSION = 1
+# seconds to wait for the other processes writing to the duration store
+STORE_TIMEOUT = 60
+
+
+class DurationEstimates:
+    """Estimated durations of tests keyed on node id"""
+
+    def __init__(self):
+        self.durations = {}
+        self._default = DEFAULT_DURATION
+
+    def estimate(self, nodeid):
+        """Return the estimated duration in seconds of the test ``nodeid``"""
+        return self.durations.get(nodeid, self._default)
+
+    def update(self, durations):
+        """Add the ``durations`` of a run, a dictionary of seconds keyed on node id"""
+        for nodeid, duration in durations.items():
+            previous = self.durations.get(nodeid)
+            self.durations[nodeid] = (
+                duration if previous is None else SMOOTHING * duration + (1 - SMOOTHING) * previous
+            )
+        if self.durations:
+            self._default = statistics.median(self.durations.values())
+
+
+class DurationStore:
+    """Durations of the test phases and fixture setups of every run, stored in
+    a SQLite database shared by the xdist workers
+
+    :param db_file: SQLite database file
+    """
+
+    def __init__(self, db_file):
+        self.db_file = Path(db_file)
+
+    @contextmanager
+    def _connect(self):
+        """Open the database in a transaction, creating the schema if needed"""
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.db_file, timeout=STORE_TIMEOUT, isolation_level=None)
+        try:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('BEGIN IMMEDIATE')
+            if connection.execute('PRAGMA user_version').fetchone()[0] != STORE_VERSION:
+                for table in ('runs', 'phases', 'fixtures'):
+                    connection.execute(f'DROP TABLE IF EXISTS {table}')
+                connection.execute(
+                    'CREATE TABLE runs (run_id TEXT PRIMARY KEY, started_at REAL NOT NULL)'
+                )
+                connection.execute(
+                    'CREATE TABLE phases (run_id TEXT NOT NULL, nodeid TEXT NOT NULL, '
+                    'phase TEXT NOT NULL, duration REAL NOT NULL, outcome TEXT, worker TEXT, '
+                    'hostname TEXT)'
+                )
+                connection.execute('CREATE INDEX phases_run_id ON phases (run_id)')
+                connection.execute(
+                    'CREATE TABLE fixtures (run_id TEXT NOT NULL, nodeid TEXT NOT NULL, '
+                    'fixture TEXT NOT NULL, scope TEXT, duration REAL NOT NULL, worker TEXT, '
+                    'hostname TEXT)'
+                )
+                connection.execute('CREATE INDEX fixtures_run_id ON fixtures (run_id)')
+                connection.execute(f'PRAGMA user_version = {STORE_VERSION}')
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        else:
+            connection.execute('COMMIT')
+        finally:
+            connection.close()
+
+    def record(self, run_id, started_at, phases=(), fixtures=()):
+        """Add the durations of a process to the run ``run_id``
+
+        :param phases: tuples ``(nodeid, phase, duration, outcome, worker, hostname)``
+        :param fixtures: tuples ``(nodeid, fixture, scope, duration, worker, hostname)``
+        """
+        with self._connect() as connection:
+            connection.execute(
+                'INSERT INTO runs (run_id, started_at) VALUES (?, ?) '
+                'ON CONFLICT (run_id) DO UPDATE SET started_at = MIN(started_at, excluded.started_at)',
+                (run_id, started_at),
+            )
+            connection.executemany(
+                'INSERT INTO phases VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(run_id, *phase) for phase in phases],
+            )
+            connection.executemany(
+                'INSERT INTO fixtures VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(run_id, *fixture) for fixture in fixtures],
+            )
+
+    def runs(self, limit=None):
+        """Return ``(run_id, started_at)`` of the last ``limit`` runs, latest first"""
+        with self._connect() as connection:
+            return connection.execute(
+                'SELECT run_id, started_at FROM runs ORDER BY started_at DESC LIMIT ?',
+                (-1 if limit is None else limit,),
+            ).fetchall()
+
+    def test_durations(self, run_id):
+        """Return the durations of the tests of a run, the sum of their phases, keyed on node id"""
+        with self._connect() as connection:
+            return dict(
+                connection.execute(
+                    'SELECT nodeid, SUM(duration) FROM phases WHERE run_id = ? GROUP BY nodeid',
+                    (run_id,),
+                )
+            )
+
+    def trends(self, runs=None):
+        """Return ``(run_id, started_at, tests, p50, p95)`` of the test durations
+        of the last ``runs`` runs, latest first"""
+        trends = []
+        for run_id, started_at in self.runs(runs):
+            if durations := list(self.test_durations(run_id).values()):
+                trends.append(
+                    (
+                        run_id,
+                        started_at,
+                        len(durations),
+                        percentile(durations, 50),
+                        percentile(durations, 95),
+                    )
+                )
+        return trends
+
+    def regressions(self, previous=5, threshold=1.5, min_delta=1.0):
+        """Return the tests of the last run slower than in the ``previous`` runs
+
+        The baseline of a test is its median duration in the previous runs, it
+        regressed when the last run took over ``threshold`` times its baseline and
+        over ``min_delta`` seconds more.
+
+        :return: tuples ``(nodeid, baseline, duration)``, largest regression first
+        """
+        if not (runs := self.runs(previous + 1)):
+            return []
+        last, *previous_runs = runs
+        history = {}
+        for run_id, _ in previous_runs:
+            for nodeid, duration in self.test_durations(run_id).items():
+                history.setdefault(nodeid, []).append(duration)
+        regressions = []
+        for nodeid, duration in self.test_durations(last[0]).items():
+            if nodeid not in history:
+                continue
+            baseline = statistics.median(history[nodeid])
+            if duration > baseline * threshold and duration - baseline > min_delta:
+                regressions.append((nodeid, baseline, duration))
+        return sorted(regressions, key=lambda item: item[2] - item[1], reverse=True)
+
+    def estimates(self, runs=ESTIMATE_RUNS):
+        """Return the :class:`DurationEstimates` of the last ``runs`` runs"""
+        estimates = DurationEstimates()
+        for run_id, _ in reversed(self.runs(runs)):
+            estimates.update(self.test_durations(run_id))
+        return estimates
+
+    def fixture_durations(self, run_id):
+        """Return the total setup time of the fixtures of a run keyed on fixture name"""
+        with self._connect() as connection:
+            return dict(
+                connection.execute(
+                    'SELECT fixture, SUM(duration) FROM fixtures WHERE run_id = ? '
+                    'GROUP BY fixture',
+                    (run_id,),
+                )
+            )
+
+
+def percentile(values, percent):
+    """Return the nearest rank ``percent`` percentile of ``values``"""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(len(ordered) * percent / 100) - 1, 0)]
+
+
+@lru_cache
+def get_store():
+    """Return the process wide :class:`DurationStore`, stored in the robottelo tmp dir"""
+    from robottelo.config import robottelo_tmp_dir
+
+    return DurationStore(robottelo_tmp_dir.joinpath('test_durations.db'))
+
+
+@lru_cache
+def get_estimates():
+    """Return the process wide :class:`DurationEstimates`, computed from the duration store"""
+    try:
+        return get_store().estimates()
+    except sqlite3.Error as err:
+        logger.warning(f'Could not read the test durations: {err}')
+        return DurationEstimates()
@@ -0,0 +1,336 @@
+"""Cache of facts about the Satellites under test.
+
+The version, RHEL version and capabilities of a Satellite are probed with a
+single ssh command and stored in a JSON file in the robottelo tmp dir. The file
+is shared by all xdist workers of a session, only the first worker needing the
+facts probes the host, and by later sessions until the facts expire. It can be
+precomputed before a run with ``scripts/host_facts.py``.
+
+Hosts are never probed while tests are collected, see :func:`offline`. Callers
+fall back to the robottelo configuration when no facts are available.
+
+The facts of content hosts are read with a single ssh command as well. The
+release, addresses and architecture of the host, see :func:`probe_content_host`,
+are probed apart from its registration, see :func:`probe_subscription`, which
+needs ``subscription-manager`` and changes whenever the host is registered.
+"""
+
+from contextlib import contextmanager
+from functools import lru_cache
+import json
+import os
+from pathlib import Path
+import re
+import tempfile
+import threading
+import time
+from typing import NamedTuple
+
+from pytest_services.locks import file_lock
+
+from robottelo.logging import logger
+
+# bump when the structure of the stored facts changes
+FACTS_VERSION = 1
+LOCK_TIMEOUT = 300
+OS_RELEASE_MARKER = '__ROBOTTELO_OS_RELEASE__'
+PROBE_COMMAND = (
+    'rpm -q --qf "%{{NAME}} %{{VERSION}} %{{RELEASE}}\\n" {rpms}; '
+    f'echo {OS_RELEASE_MARKER}; cat /etc/os-release'
+)
+_QUOTED = re.compile(r'^(["\'])(.*)(\1)$')
+CONTENT_HOST_MARKER = '__ROBOTTELO_CONTENT_HOST_FACT__'
+# commands of the content host probe, each runs whatever the others returned
+CONTENT_HOST_COMMANDS = {
+    'os_release': 'cat /etc/os-release',
+    'redhat_release': 'cat /etc/redhat-release',
+    'ip_addresses': 'hostname -I',
+    'arch': 'uname -m',
+}
+# commands of the subscription probe of a content host
+SUBSCRIPTION_COMMANDS = {
+    'identity': 'subscription-manager identity',
+    'status': 'subscription-manager status',
+    'rhsm_conf': 'cat /etc/rhsm/rhsm.conf',
+}
+
+
+def _probe_command(commands):
+    """Join ``commands``, the output of each is followed by a line with its name and exit status"""
+    return '; '.join(
+        f"{{ {command}; }} 2>/dev/null; printf '\\n{CONTENT_HOST_MARKER} {name} %s\\n' $?"
+        for name, command in commands.items()
+    )
+
+
+CONTENT_HOST_PROBE_COMMAND = _probe_command(CONTENT_HOST_COMMANDS)
+SUBSCRIPTION_PROBE_COMMAND = _probe_command(SUBSCRIPTION_COMMANDS)
+
+_local = threading.local()
+
+
+@contextmanager
+def offline():
+    """Never probe hosts from the current thread, only use facts that are already known"""
+    previous = getattr(_local, 'offline', False)
+    _local.offline = True
+    try:
+        yield
+    finally:
+        _local.offline = previous
+
+
+def parse_os_release(output):
+    """Return the variables of an os-release file as a dictionary"""
+    os_release = {}
+    for line in output.splitlines():
+        key, sep, value = line.strip().partition('=')
+        if sep and key and value and not key.startswith('#'):
+            os_release[key] = _QUOTED.sub(r'\2', value).replace('\\', '')
+    return os_release
+
+
+def parse_probe(output, product_rpm_name, upstream_rpm_name):
+    """Build the facts of a Satellite from the output of :data:`PROBE_COMMAND`
+
+    :return: dictionary with the ``version`` and ``release`` of the installed
+        product, ``rhel_version``, ``os_id`` and the ``capabilities`` of the host
+    """
+    packages_output, _, os_release_output = output.partition(OS_RELEASE_MARKER)
+    packages = {}
+    for line in packages_output.splitlines():
+        # `rpm -q` reports missing packages as "package NAME is not installed"
+        name, *fields = line.split()
+        if name in (product_rpm_name, upstream_rpm_name) and len(fields) == 2:
+            packages[name] = fields
+    os_release = parse_os_release(os_release_output)
+    is_upstream = product_rpm_name not in packages
+    rpm_name = upstream_rpm_name if is_upstream else product_rpm_name
+    version, release = packages.get(rpm_name, (None, None))
+    return {
+        'version': version,
+        'release': release,
+        'rhel_version': os_release.get('VERSION_ID'),
+        'os_id': os_release.get('ID'),
+        'capabilities': {
+            'is_upstream': is_upstream,
+            'is_stream': not is_upstream and 'stream' in release,
+        },
+    }
+
+
+def probe(hostname):
+    """Read the facts of the Satellite ``hostname`` with a single ssh command"""
+    from robottelo.hosts import Satellite
+
+    rpms = f'{Satellite.product_rpm_name} {Satellite.upstream_rpm_name}'
+    result = Satellite(hostname).execute(PROBE_COMMAND.format(rpms=rpms))
+    if OS_RELEASE_MARKER not in result.stdout:
+        raise RuntimeError(f'Unexpected output of the facts probe: {result.stdout}')
+    return parse_probe(result.stdout, Satellite.product_rpm_name, Satellite.upstream_rpm_name)
+
+
+class ContentHostFacts(NamedTuple):
+    """Snapshot of the facts of a content host, see :func:`probe_content_host`"""
+
+    #: variables of /etc/os-release, ``None`` when it is missing
+    os_release: dict | None
+    #: content of /etc/redhat-release, ``None`` when it is missing
+    redhat_release: str | None
+    ip_addresses: list
+    arch: str
+
+
+class SubscriptionFacts(NamedTuple):
+    """Snapshot of the registration of a content host, see :func:`probe_subscription`"""
+
+    #: subscription-manager identity, empty when the host is not registered
+    identity: dict
+    subscribed: bool
+    #: content of /etc/rhsm/rhsm.conf
+    rhsm_conf: str
+
+
+def _split_probe(output, commands):
+    """Return the output and exit status of each of ``commands`` from the output of their probe"""
+    outputs = {}
+    fields = re.split(rf'\n{CONTENT_HOST_MARKER} (\w+) (\d+)\n', output)
+    for command_output, name, status in zip(fields[0::3], fields[1::3], fields[2::3], strict=False):
+        outputs[name] = (command_output, int(status))
+    if missing := set(commands).difference(outputs):
+        raise RuntimeError(f'Missing {sorted(missing)} in the content host probe: {output}')
+    return outputs
+
+
+def parse_content_host_probe(output):
+    """Build the facts of a content host from the output of :data:`CONTENT_HOST_PROBE_COMMAND`
+
+    :return: a :class:`ContentHostFacts`
+    """
+    outputs = _split_probe(output, CONTENT_HOST_COMMANDS)
+    os_release, os_release_status = outputs['os_release']
+    redhat_release, redhat_release_status = outputs['redhat_release']
+    return ContentHostFacts(
+        os_release=parse_os_release(os_release) if os_release_status == 0 else None,
+        redhat_release=redhat_release if redhat_release_status == 0 else None,
+        ip_addresses=outputs['ip_addresses'][0].split(),
+        arch=outputs['arch'][0].strip(),
+    )
+
+
+def parse_subscription_probe(output):
+    """Build the registration of a content host from the output of :data:`SUBSCRIPTION_PROBE_COMMAND`
+
+    :return: a :class:`SubscriptionFacts`
+    """
+    outputs = _split_probe(output, SUBSCRIPTION_COMMANDS)
+    identity = {}
+    for line in outputs['identity'][0].splitlines():
+        key, sep, value = line.partition(': ')
+        if sep:
+            identity[key.split(':')[0].replace(' ', '_')] = value
+    return SubscriptionFacts(
+        identity=identity,
+        subscribed='Status: Unknown' not in outputs['status'][0],
+        rhsm_conf=outputs['rhsm_conf'][0],
+    )
+
+
+def probe_content_host(host):
+    """Read the release, addresses and architecture of a content host with a single ssh command
+
+    :param host: a :class:`robottelo.hosts.ContentHost`
+    :return: a :class:`ContentHostFacts`
+    """
+    return parse_content_host_probe(host.execute(CONTENT_HOST_PROBE_COMMAND).stdout)
+
+
+def probe_subscription(host):
+    """Read the registration of a content host with a single ssh command
+
+    :param host: a :class:`robottelo.hosts.ContentHost`
+    :return: a :class:`SubscriptionFacts`
+    """
+    return parse_subscription_probe(host.execute(SUBSCRIPTION_PROBE_COMMAND).stdout)
+
+
+class HostFactsCache:
+    """Facts of Satellites, probed at most once per process and stored in a shared file
+
+    :param cache_file: JSON file shared by processes, ``None`` keeps the facts
+        in memory only
+    :param int ttl: seconds facts read from ``cache_file`` are considered valid
+    :param probe: callable returning the facts of a hostname
+    """
+
+    def __init__(self, cache_file=None, ttl=3600, probe=probe):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.ttl = ttl
+        self.probe = probe
+        self.probes = 0
+        self._facts = {}
+        self._failed = set()
+        self._lock = threading.Lock()
+
+    def _read(self):
+        """Return all facts stored in ``cache_file``"""
+        if not (self.cache_file and self.cache_file.exists()):
+            return {}
+        try:
+            stored = json.loads(self.cache_file.read_text())
+        except (OSError, ValueError) as err:
+            logger.warning(f'Ignoring unreadable host facts {self.cache_file}: {err}')
+            return {}
+        return stored['hosts'] if stored.get('version') == FACTS_VERSION else {}
+
+    def _stored(self, hostname):
+        """Return the facts of ``hostname`` from ``cache_file`` if they did not expire"""
+        entry = self._read().get(hostname)
+        if entry and time.time() - entry['probed_at'] < self.ttl:
+            return entry['facts']
+        return None
+
+    def store(self, hostname, facts):
+        """Remember ``facts`` of ``hostname`` and add them to ``cache_file``"""
+        self._facts[hostname] = facts
+        if not self.cache_file:
+            return
+        hosts = self._read()
+        hosts[hostname] = {'probed_at': time.time(), 'facts': facts}
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            'w', dir=self.cache_file.parent, suffix='.tmp', delete=False
+        ) as tmp:
+            json.dump({'version': FACTS_VERSION, 'hosts': hosts}, tmp, indent=2)
+        os.replace(tmp.name, self.cache_file)
+
+    def _probe(self, hostname):
+        try:
+            facts = self.probe(hostname)
+        except Exception as err:  # callers fall back to the configuration
+            logger.warning(f'Unable to probe the facts of {hostname}: {err}')
+            self._failed.add(hostname)
+            return None
+        self.probes += 1
+        self.store(hostname, facts)
+        return facts
+
+    def refresh(self, hostname):
+        """Probe ``hostname`` again, regardless of known facts"""
+        with self._lock:
+            self._failed.discard(hostname)
+            return self._probe(hostname)
+
+    def get(self, hostname):
+        """Return the facts of ``hostname``
+
+        Facts are looked up in memory, then in ``cache_file``. The host is only
+        probed if neither has them, it was not probed unsuccessfully before and
+        the current thread is not :func:`offline`.
+
+        :return: the facts dictionary, see :func:`parse_probe`, or ``None``
+        """
+        if not hostname:
+            return None
+        with self._lock:
+            if hostname in self._facts:
+                return self._facts[hostname]
+            if (facts := self._stored(hostname)) is not None:
+                self._facts[hostname] = facts
+                return facts
+            if hostname in self._failed or getattr(_local, 'offline', False):
+                return None
+            if not self.cache_file:
+                return self._probe(hostname)
+            # other xdist workers wait for the first one to probe the host
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            lock_file = self.cache_file.with_suffix('.lock')
+            with file_lock(lock_file, remove=False, timeout=LOCK_TIMEOUT):
+                if (facts := self._stored(hostname)) is not None:
+                    self._facts[hostname] = facts
+                    return facts
+                return self._probe(hostname)
+
+
+@lru_cache
+def get_cache():
+    """Return the process wide :class:`HostFactsCache`, stored in the robottelo tmp dir"""
+    from robottelo.config import robottelo_tmp_dir, settings
+
+    return HostFactsCache(
+        cache_file=robottelo_tmp_dir.joinpath('host_facts.json'),
+        ttl=settings.performance.host_facts_ttl,
+    )
+
+
+def get_facts(hostname=None):
+    """Return the facts of the Satellite ``hostname``, ``server.hostname`` by default
+
+    :return: the facts dictionary, see :func:`parse_probe`, or ``None`` if they
+        are not available
+    """
+    if hostname is None:
+        from robottelo.config import settings
+
+        hostname = settings.server.hostname
+    return get_cache().get(hostname)
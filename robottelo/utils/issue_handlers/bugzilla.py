@@ -1,4 +1,6 @@
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
 import re
 
 from packaging.version import Version
@@ -10,11 +12,36 @@ from robottelo.config import settings
 from robottelo.constants import CLOSED_STATUSES, OPEN_STATUSES, WONTFIX_RESOLUTIONS
 from robottelo.hosts import get_sat_version
 from robottelo.logging import logger
+from robottelo.utils.issue_handlers import cache as issue_cache
 
 # match any version as in `sat-6.2.x` or `sat-6.2.0` or `6.2.9`
 # The .version group being a `d.d` string that can be casted to Version()
 VERSION_RE = re.compile(r'(?:sat-)*?(?P<version>\d\.\d)\.\w*')
 
+# bug ids per request, keeps request URLs short
+BZ_CHUNK_SIZE = 100
+BZ_MAX_WORKERS = 4
+# seconds subtracted from the time bugs were fetched when asking for changes,
+# covers clock differences with the Bugzilla server
+BZ_CLOCK_SKEW = 300
+
+BZ_FIELDS = [
+    "id",
+    "summary",
+    "status",
+    "resolution",
+    "cf_last_closed",
+    "last_change_time",
+    "creation_time",
+    "flags",
+    "keywords",
+    "dupe_of",
+    "target_milestone",
+    "cf_clone_of",
+    "clone_ids",
+    "depends_on",
+]
+
 
 def is_open_bz(issue, data=None):
     """Check if specific BZ is open consulting a cached `data` dict or
@@ -183,9 +210,84 @@ CACHED_RESPONSES = defaultdict(dict)
     stop=stop_after_attempt(4),
     wait=wait_fixed(20),
 )
+def get_bz(params):
+    """Search bugs with Bugzilla REST API
+
+    Arguments:
+        params {dict} -- Search parameters, e.g: {'id': '123456,456789'}
+
+    Returns:
+        [list of dicts] -- [{'id':..., 'status':..., 'resolution': ...}]
+    """
+    response = requests.get(
+        f"{settings.bugzilla.url}/rest/bug",
+        params={**params, "include_fields": ",".join(BZ_FIELDS)},
+        headers={"Authorization": f"Bearer {settings.bugzilla.api_key}"},
+    )
+    response.raise_for_status()
+    return response.json().get('bugs') or []
+
+
+def search_bz(bz_numbers, **params):
+    """Search ``bz_numbers`` with concurrent requests of at most ``BZ_CHUNK_SIZE`` bugs
+
+    Arguments:
+        bz_numbers {list of str} -- ['123456', ...]
+        params {dict} -- Additional search parameters, e.g: last_change_time
+    """
+    searches = [
+        {"id": ",".join(bz_numbers[start : start + BZ_CHUNK_SIZE]), **params}
+        for start in range(0, len(bz_numbers), BZ_CHUNK_SIZE)
+    ]
+    if len(searches) == 1:
+        return get_bz(searches[0])
+    with ThreadPoolExecutor(max_workers=min(BZ_MAX_WORKERS, len(searches))) as executor:
+        return [bug for bugs in executor.map(get_bz, searches) for bug in bugs]
+
+
+def fetch_bz(bz_numbers):
+    """Get ``bz_numbers`` through the persistent cache shared by processes
+
+    Bugs fetched more than ``bugzilla.cache_ttl`` seconds ago are refreshed by
+    asking Bugzilla only for the bugs changed since then.
+
+    Returns:
+        {dict} -- BZ data indexed by number
+    """
+    cache = issue_cache.get_cache('bugzilla', settings.bugzilla.cache_ttl)
+    with cache.locked():
+        bugs, stale, missing = cache.lookup(bz_numbers)
+        stale_bugs = {number: cache.get(number) for number in stale}
+    # Bugzilla is called without holding the cache lock
+    changed, unchanged, fetched = {}, [], {}
+    if stale:
+        since = datetime.fromtimestamp(min(stale.values()) - BZ_CLOCK_SKEW, tz=UTC)
+        logger.debug(f"Refreshing BZs changed since {since} among {set(stale)}")
+        changed = {
+            str(bug['id']): bug
+            for bug in search_bz(
+                sorted(stale), last_change_time=since.strftime('%Y-%m-%dT%H:%M:%SZ')
+            )
+        }
+        unchanged = [number for number in stale if number not in changed]
+    if missing:
+        logger.debug(f"Calling Bugzilla API for {set(missing)}")
+        fetched = {str(bug['id']): bug for bug in search_bz(missing)}
+    if changed or unchanged or fetched:
+        with cache.locked():
+            cache.update({**changed, **fetched})
+            cache.touch(unchanged)
+    bugs.update({number: stale_bugs[number] for number in unchanged})
+    bugs.update(changed)
+    bugs.update(fetched)
+    return bugs
+
+
 def get_data_bz(bz_numbers, cached_data=None):  # pragma: no cover
     """Get a list of marked BZ data and query Bugzilla REST API.
 
+    BZs missing in ``cached_data`` are fetched from Bugzilla REST API.
+
     Arguments:
         bz_numbers {list of str} -- ['123456', ...]
         cached_data {dict} -- Cached data previous loaded from API
@@ -195,59 +297,38 @@ def get_data_bz(bz_numbers, cached_data=None):  # pragma: no cover
     """
     if not bz_numbers:
         return []
+    bz_numbers = list(dict.fromkeys(str(number) for number in bz_numbers))
 
     cached_by_call = CACHED_RESPONSES['get_data'].get(str(sorted(bz_numbers)))
     if cached_by_call:
         return cached_by_call
 
+    data = {}
     if cached_data:
         logger.debug(f"Using cached data for {set(bz_numbers)}")
-        if not all([f'BZ:{number}' in cached_data for number in bz_numbers]):
-            logger.debug("There are BZs out of cache.")
-        return [item['data'] for _, item in cached_data.items() if 'data' in item]
-
-    # Ensure API key is set
-    if not settings.bugzilla.api_key:
+        for number in bz_numbers:
+            if cached := cached_data.get(f'BZ:{number}', {}).get('data'):
+                data[number] = cached
+    missing = [number for number in bz_numbers if number not in data]
+    if missing and cached_data:
+        logger.debug(f"There are BZs out of cache: {set(missing)}")
+
+    if missing and not settings.bugzilla.api_key:
+        # Ensure API key is set
         logger.warning(
             "Config file is missing bugzilla api_key "
             "so all tests with skip_if_open mark is skipped. "
             "Provide api_key or a bz_cache.json."
         )
         # Provide default data for collected BZs
-        return [get_default_bz(number) for number in bz_numbers]
-
-    # No cached data so Call Bugzilla API
-    logger.debug(f"Calling Bugzilla API for {set(bz_numbers)}")
-    bz_fields = [
-        "id",
-        "summary",
-        "status",
-        "resolution",
-        "cf_last_closed",
-        "last_change_time",
-        "creation_time",
-        "flags",
-        "keywords",
-        "dupe_of",
-        "target_milestone",
-        "cf_clone_of",
-        "clone_ids",
-        "depends_on",
-    ]
-    # Following fields are dynamically calculated/loaded
-    for field in ('is_open', 'clones', 'version'):
-        assert field not in bz_fields
-
-    response = requests.get(
-        f"{settings.bugzilla.url}/rest/bug",
-        params={
-            "id": ",".join(set(bz_numbers)),
-            "include_fields": ",".join(bz_fields),
-        },
-        headers={"Authorization": f"Bearer {settings.bugzilla.api_key}"},
-    )
-    response.raise_for_status()
-    data = response.json().get('bugs')
+        data.update({number: get_default_bz(number) for number in missing})
+    elif missing:
+        # Following fields are dynamically calculated/loaded
+        for field in ('is_open', 'clones', 'version'):
+            assert field not in BZ_FIELDS
+        data.update(fetch_bz(missing))
+
+    data = [data[number] for number in bz_numbers if number in data]
     CACHED_RESPONSES['get_data'][str(sorted(bz_numbers))] = data
     return data
 
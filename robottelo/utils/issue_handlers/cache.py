@@ -0,0 +1,139 @@
+"""Persistent cache of issue tracker data shared by processes.
+
+Issues are stored in a SQLite database in the robottelo tmp dir together with
+the time they were fetched, only the rows of the requested issues are loaded.
+Entries younger than the TTL are used as they are, older ones have to be
+revalidated by the issue handler, e.g. by asking the tracker which of them
+changed since they were fetched.
+
+Lookups and updates are short write transactions, issues are fetched from the
+tracker in between without holding the database lock, so a slow tracker never
+blocks the other processes. Processes missing the same issues at the same time
+may both fetch them, the last update wins.
+"""
+
+from contextlib import contextmanager
+from functools import lru_cache
+import json
+from pathlib import Path
+import sqlite3
+import threading
+import time
+
+# bump when the structure of the stored data changes
+CACHE_VERSION = 1
+LOCK_TIMEOUT = 600
+# maximum number of parameters of a single query
+BATCH_SIZE = 500
+
+
+class IssueCache:
+    """Issue data of a tracker, keyed on issue id
+
+    Entries can only be used inside :meth:`locked`, which must not be held while
+    calling the tracker.
+
+    :param cache_file: SQLite database shared by processes
+    :param int ttl: seconds an entry is used without revalidation
+    """
+
+    def __init__(self, cache_file, ttl):
+        self.cache_file = Path(cache_file)
+        self.ttl = ttl
+        self._connection = None
+        self._lock = threading.RLock()
+
+    def _connect(self):
+        """Open the database and start a write transaction, creating the schema if needed"""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.cache_file, timeout=LOCK_TIMEOUT, isolation_level=None)
+        connection.execute('BEGIN IMMEDIATE')
+        if connection.execute('PRAGMA user_version').fetchone()[0] != CACHE_VERSION:
+            connection.execute('DROP TABLE IF EXISTS issues')
+            connection.execute(
+                'CREATE TABLE issues '
+                '(id TEXT PRIMARY KEY, fetched_at REAL NOT NULL, data TEXT NOT NULL)'
+            )
+            connection.execute(f'PRAGMA user_version = {CACHE_VERSION}')
+        return connection
+
+    @contextmanager
+    def locked(self):
+        """Hold a short write transaction on the cache, changes are committed on exit"""
+        with self._lock:
+            self._connection = self._connect()
+            try:
+                yield self
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+            else:
+                self._connection.execute('COMMIT')
+            finally:
+                self._connection.close()
+                self._connection = None
+
+    def _rows(self, issue_ids):
+        issue_ids = list(dict.fromkeys(issue_ids))
+        for start in range(0, len(issue_ids), BATCH_SIZE):
+            batch = issue_ids[start : start + BATCH_SIZE]
+            yield from self._connection.execute(
+                'SELECT id, fetched_at, data FROM issues '
+                f'WHERE id IN ({", ".join("?" * len(batch))})',
+                batch,
+            )
+
+    def lookup(self, issue_ids, fields=()):
+        """Sort ``issue_ids`` by the state of their entries
+
+        Entries missing any of ``fields`` are considered missing.
+
+        :return: a tuple ``(fresh, stale, missing)`` where ``fresh`` maps ids to
+            their data, ``stale`` maps ids to the time their data was fetched
+            and ``missing`` lists the ids without entry
+        """
+        entries = {
+            issue_id: (fetched_at, data) for issue_id, fetched_at, data in self._rows(issue_ids)
+        }
+        fresh, stale, missing = {}, {}, []
+        now = time.time()
+        for issue_id in issue_ids:
+            fetched_at, data = entries.get(issue_id, (None, None))
+            data = data and json.loads(data)
+            if data is None or not set(fields) <= data.keys():
+                missing.append(issue_id)
+            elif now - fetched_at < self.ttl:
+                fresh[issue_id] = data
+            else:
+                stale[issue_id] = fetched_at
+        return fresh, stale, missing
+
+    def get(self, issue_id):
+        """Return the cached data of ``issue_id``, regardless of its age"""
+        for _, _, data in self._rows([issue_id]):
+            return json.loads(data)
+        return None
+
+    def update(self, issues):
+        """Store ``issues``, a dictionary of issue data keyed on issue id"""
+        now = time.time()
+        self._connection.executemany(
+            'INSERT OR REPLACE INTO issues (id, fetched_at, data) VALUES (?, ?, ?)',
+            [(issue_id, now, json.dumps(data)) for issue_id, data in issues.items()],
+        )
+
+    def touch(self, issue_ids):
+        """Mark the entries of ``issue_ids`` as revalidated"""
+        now = time.time()
+        self._connection.executemany(
+            'UPDATE issues SET fetched_at = ? WHERE id = ?',
+            [(now, issue_id) for issue_id in issue_ids],
+        )
+
+
+@lru_cache
+def get_cache(name, ttl):
+    """Return the process wide :class:`IssueCache` ``name``, stored in the robottelo tmp dir"""
+    from robottelo.config import robottelo_tmp_dir
+
+    return IssueCache(robottelo_tmp_dir.joinpath(f'{name}_cache.db'), ttl)
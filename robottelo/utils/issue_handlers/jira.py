@@ -1,5 +1,9 @@
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import math
 import re
+import time
 
 import pytest
 import requests
@@ -13,11 +17,18 @@ from robottelo.constants import (
     JIRA_WONTFIX_RESOLUTIONS,
 )
 from robottelo.logging import logger
+from robottelo.utils.issue_handlers import cache as issue_cache
 
 # match any version as in `sat-6.14.x` or `sat-6.13.0` or `6.13.9`
 # The .version group being a `d.d` string that can be casted to Version()
 VERSION_RE = re.compile(r'(?:sat-)*?(?P<version>\d\.\d)\.\w*')
 
+# issue keys per JQL query, keeps request URLs short
+JIRA_CHUNK_SIZE = 100
+# issues per search request, the server caps larger values
+JIRA_PAGE_SIZE = 100
+JIRA_MAX_WORKERS = 4
+
 common_jira_fields = ['key', 'summary', 'status', 'labels', 'resolution', 'fixVersions']
 
 mapped_response_fields = {
@@ -147,33 +158,36 @@ def collect_data_jira(collected_data, cached_data):  # pragma: no cover
         collected_data {dict} -- dict with Jira issues collected by pytest
         cached_data {dict} -- Cached data previous loaded from API
     """
-    jira_data = (
-        get_data_jira(
-            [item for item in collected_data if item.startswith('SAT-')], cached_data=cached_data
-        )
-        or []
-    )
+    jira_keys = [item for item in collected_data if item.startswith('SAT-')]
+    prefetch_jira(jira_keys, cached_data=cached_data)
+    jira_data = [get_single_jira(jira_key, cached_data=cached_data) for jira_key in jira_keys]
+    # If Jira is CLOSED/DUPLICATE collect the duplicate
+    collect_dupes(jira_data, collected_data, cached_data=cached_data)
     for data in jira_data:
-        # If Jira is CLOSED/DUPLICATE collect the duplicate
-        collect_dupes(data, collected_data, cached_data=cached_data)
-
         jira_key = f"{data['key']}"
         data["is_open"] = is_open_jira(jira_key, data)
         collected_data[jira_key]['data'] = data
 
 
-def collect_dupes(jira, collected_data, cached_data=None):  # pragma: no cover
-    """Recursively find for duplicates"""
+def collect_dupes(jira_data, collected_data, cached_data=None):  # pragma: no cover
+    """Find the duplicates of all ``jira_data``, fetching them in batches"""
     cached_data = cached_data or {}
-    if jira.get('resolution') == 'Duplicate':
-        # Collect duplicates
-        jira['dupe_data'] = get_single_jira(jira.get('dupe_of'), cached_data=cached_data)
-        dupe_key = f"{jira['dupe_of']}"
-        # Store Duplicate also in the main collection for caching
-        if dupe_key not in collected_data:
-            collected_data[dupe_key]['data'] = jira['dupe_data']
-            collected_data[dupe_key]['is_dupe'] = True
-            collect_dupes(jira['dupe_data'], collected_data, cached_data)
+    prefetch_jira(
+        [jira['dupe_of'] for jira in jira_data if jira.get('resolution') == 'Duplicate'],
+        cached_data=cached_data,
+    )
+    pending = list(jira_data)
+    while pending:
+        jira = pending.pop()
+        if jira.get('resolution') == 'Duplicate' and jira.get('dupe_of'):
+            # Collect duplicates
+            jira['dupe_data'] = get_single_jira(jira['dupe_of'], cached_data=cached_data)
+            dupe_key = f"{jira['dupe_of']}"
+            # Store Duplicate also in the main collection for caching
+            if dupe_key not in collected_data:
+                collected_data[dupe_key]['data'] = jira['dupe_data']
+                collected_data[dupe_key]['is_dupe'] = True
+                pending.append(jira['dupe_data'])
 
 
 # --- API Calls ---
@@ -186,18 +200,24 @@ CACHED_RESPONSES = defaultdict(dict)
     stop=stop_after_attempt(4),  # Retry 3 times before raising
     wait=wait_fixed(20),  # Wait seconds between retries
 )
-def get_jira(jql, fields=None):
+def get_jira(jql, fields=None, start_at=0, max_results=None):
     """Accepts the jql to retrieve the data from Jira for the given fields
 
     Arguments:
         jql {str} -- The query for retrieving the issue(s) details from jira
         fields {list} -- The custom fields in query to retrieve the data for
+        start_at {int} -- Index of the first issue of the requested page
+        max_results {int} -- Size of the requested page, server default if not set
 
     Returns: Jira object of response after status check
     """
     params = {"jql": jql}
     if fields:
         params.update({"fields": ",".join(fields)})
+    if start_at:
+        params["startAt"] = start_at
+    if max_results:
+        params["maxResults"] = max_results
     response = requests.get(
         f"{settings.jira.url}/rest/api/latest/search/",
         params=params,
@@ -207,9 +227,82 @@ def get_jira(jql, fields=None):
     return response
 
 
+def search_jira(jql, fields=None):
+    """Return all the issues matching ``jql``, following the pages of the search"""
+    issues = []
+    while True:
+        page = get_jira(jql, fields, start_at=len(issues), max_results=JIRA_PAGE_SIZE).json()
+        issues.extend(page.get('issues') or [])
+        if not page.get('issues') or len(issues) >= page.get('total', 0):
+            return issues
+
+
+def search_jira_keys(issue_ids, fields=None, jql_filter=''):
+    """Search ``issue_ids`` with concurrent queries of at most ``JIRA_CHUNK_SIZE`` keys
+
+    Arguments:
+        issue_ids {list of str} -- ['SAT-12345', ...]
+        fields {list of str} -- The fields to retrieve
+        jql_filter {str} -- Additional JQL condition the issues have to match
+    """
+    jqls = [
+        f"key in ({', '.join(issue_ids[start : start + JIRA_CHUNK_SIZE])}){jql_filter}"
+        for start in range(0, len(issue_ids), JIRA_CHUNK_SIZE)
+    ]
+    if len(jqls) == 1:
+        return search_jira(jqls[0], fields)
+    with ThreadPoolExecutor(max_workers=min(JIRA_MAX_WORKERS, len(jqls))) as executor:
+        return [
+            issue
+            for issues in executor.map(partial(search_jira, fields=fields), jqls)
+            for issue in issues
+        ]
+
+
+def duplicate_of(issue):
+    """Return the key of the issue a Jira issue is a duplicate of, if any"""
+    for link in issue['fields'].get('issuelinks') or []:
+        if link['type']['name'] == 'Duplicate' and 'outwardIssue' in link:
+            return link['outwardIssue']['key']
+    return None
+
+
+def fetch_jira(issue_ids, jira_fields):
+    """Fetch ``issue_ids`` from Jira REST API
+
+    Returns:
+        {dict} -- Sanitized issue data indexed by issue key
+    """
+    fields = jira_fields
+    if 'resolution' in jira_fields:
+        # duplicates are linked to the issue they duplicate
+        fields = [*jira_fields, 'issuelinks']
+    data = {}
+    for issue in search_jira_keys(issue_ids, fields):
+        data[issue['key']] = sanitized_issue_data(issue, jira_fields)
+        if 'resolution' in jira_fields:
+            data[issue['key']]['dupe_of'] = duplicate_of(issue)
+    return data
+
+
+def get_updated_jira(stale):
+    """Return the keys of the issues updated since they were fetched
+
+    Arguments:
+        stale {dict} -- Time the issues were fetched indexed by issue key
+    """
+    # relative dates do not depend on the time zone of the Jira server
+    minutes = math.ceil((time.time() - min(stale.values())) / 60) + 1
+    issues = search_jira_keys(sorted(stale), ['updated'], f' AND updated >= -{minutes}m')
+    return {issue['key'] for issue in issues}
+
+
 def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no cover
     """Get a list of marked Jira data and query Jira REST API.
 
+    Issues are kept in a persistent cache shared by processes. Issues older
+    than ``jira.cache_ttl`` are only fetched again if they were updated since.
+
     Arguments:
         issue_ids {list of str} -- ['SAT-12345', ...]
         cached_data {dict} -- Cached data previous loaded from API
@@ -224,6 +317,9 @@ def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no
     if not issue_ids:
         return []
 
+    if isinstance(issue_ids, str):
+        issue_ids = [issue_id.strip() for issue_id in issue_ids.split(',')]
+
     cached_by_call = CACHED_RESPONSES['get_data'].get(str(sorted(issue_ids)))
     if cached_by_call:
         return cached_by_call
@@ -244,24 +340,63 @@ def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no
         # Provide default data for collected Jira's.
         return [get_default_jira(issue_id) for issue_id in issue_ids]
 
-    # No cached data so Call Jira API
-    logger.debug(f"Calling Jira API for {set(issue_ids)}")
     # Following fields are dynamically calculated/loaded
     for field in ('is_open', 'version'):
         assert field not in jira_fields
 
-    # Generate jql
-    if isinstance(issue_ids, str):
-        issue_ids = [issue_id.strip() for issue_id in issue_ids.split(',')]
-    jql = ' OR '.join([f"id = {issue_id}" for issue_id in issue_ids])
-    response = get_jira(jql, jira_fields)
-    data = response.json().get('issues')
-    # Clean the data, only keep the required info.
-    data = [sanitized_issue_data(issue, jira_fields) for issue in data if issue is not None]
+    cache = issue_cache.get_cache('jira', settings.jira.cache_ttl)
+    with cache.locked():
+        issues, stale, missing = cache.lookup(issue_ids, jira_fields)
+        stale_issues = {issue_id: cache.get(issue_id) for issue_id in stale}
+    # Jira is called without holding the cache lock
+    unchanged, fetched = [], {}
+    if stale:
+        logger.debug(f"Revalidating cached Jira's {set(stale)}")
+        updated = get_updated_jira(stale)
+        unchanged = [issue_id for issue_id in stale if issue_id not in updated]
+        missing.extend(issue_id for issue_id in stale if issue_id in updated)
+    if missing:
+        logger.debug(f"Calling Jira API for {set(missing)}")
+        fetched = fetch_jira(missing, jira_fields)
+    if unchanged or fetched:
+        with cache.locked():
+            cache.touch(unchanged)
+            cache.update(fetched)
+    issues.update({issue_id: stale_issues[issue_id] for issue_id in unchanged})
+    issues.update(fetched)
+    data = [issues[issue_id] for issue_id in issue_ids if issue_id in issues]
     CACHED_RESPONSES['get_data'][str(sorted(issue_ids))] = data
     return data
 
 
+def prefetch_jira(issue_ids, cached_data=None):  # pragma: no cover
+    """Fetch ``issue_ids`` and the issues they duplicate in batches
+
+    Following calls of :func:`get_single_jira` for these issues are answered
+    without calling Jira API.
+
+    Arguments:
+        issue_ids {list of str} -- ['SAT-12345', ...]
+        cached_data {dict} -- Cached data previous loaded from API
+    """
+    pending = {str(issue_id) for issue_id in issue_ids if issue_id}
+    while pending := pending - CACHED_RESPONSES['get_single'].keys():
+        fetched = {
+            jira['key']: jira
+            for jira in get_data_jira(sorted(pending), cached_data)
+            if isinstance(jira, dict) and 'key' in jira
+        }
+        for issue_id in pending:
+            CACHED_RESPONSES['get_single'][issue_id] = fetched.get(issue_id) or get_default_jira(
+                issue_id
+            )
+        pending = {
+            jira['dupe_of']
+            for jira in fetched.values()
+            if jira.get('resolution') == 'Duplicate' and jira.get('dupe_of')
+        }
+
+
 def get_single_jira(issue_id, cached_data=None):  # pragma: no cover
     """Call Jira API to get a single Jira data and cache it"""
     cached_data = cached_data or {}
@@ -1,5 +1,11 @@
+import collections
 import io
 import json
+import os
+from pathlib import Path
+import struct
+import tempfile
+import threading
 import time
 import uuid
 import zipfile
@@ -9,29 +15,89 @@ from cryptography.hazmat.primitives import hashes, serialization as crypto_seria
 from cryptography.hazmat.primitives.asymmetric import padding
 import requests
 
-from robottelo.config import settings
+from robottelo.config import robottelo_tmp_dir, settings
+from robottelo.logging import logger
+
+# seconds the downloaded templates and signing key are reused for
+MANIFEST_CACHE_TTL = 86400
+_DATA_DESCRIPTOR_FLAG = 0x08
+
+
+def _copy_raw(source, info, target):
+    """Copy the member ``info`` of the ``source`` zip file to the ``target`` zip
+    file as is, without decompressing and compressing it again."""
+    source.fp.seek(info.header_offset)
+    header = source.fp.read(zipfile.sizeFileHeader)
+    name_length, extra_length = struct.unpack('<HH', header[26:30])
+    source.fp.seek(info.header_offset + zipfile.sizeFileHeader + name_length + extra_length)
+    data = source.fp.read(info.compress_size)
+    copy = zipfile.ZipInfo(info.filename, info.date_time)
+    copy.compress_type = info.compress_type
+    copy.CRC = info.CRC
+    copy.compress_size = info.compress_size
+    copy.file_size = info.file_size
+    copy.external_attr = info.external_attr
+    copy.create_system = info.create_system
+    # sizes and CRC are known, they go in the local header instead of a data descriptor
+    copy.flag_bits = info.flag_bits & ~_DATA_DESCRIPTOR_FLAG
+    copy.header_offset = target.fp.tell()
+    target.fp.write(copy.FileHeader())
+    target.fp.write(data)
+    target.start_dir = target.fp.tell()
+    target.filelist.append(copy)
+    target.NameToInfo[copy.filename] = copy
 
 
 # Manifest Cloning
 class ManifestCloner:
-    """Manifest cloning utility class."""
+    """Manifest cloning utility class.
 
-    def __init__(self, template=None, private_key=None, signing_key=None):
+    :param cache_dir: directory the downloaded templates and signing key are
+        kept in for ``MANIFEST_CACHE_TTL`` seconds, ``None`` downloads them in
+        every process
+    """
+
+    def __init__(self, template=None, private_key=None, signing_key=None, cache_dir=None):
         self.template = template
         self.signing_key = signing_key
         self.private_key = private_key
+        self.cache_dir = cache_dir
+        self._consumer_exports = {}
+        self._lock = threading.Lock()
+
+    def _download(self, url, file_name):
+        """Return the content of ``url``, cached in ``cache_dir`` as ``file_name``"""
+        if self.cache_dir is None:
+            return requests.get(url, verify=False).content
+        cache_file = Path(self.cache_dir, file_name)
+        try:
+            if time.time() - cache_file.stat().st_mtime < MANIFEST_CACHE_TTL:
+                return cache_file.read_bytes()
+        except OSError:
+            pass
+        response = requests.get(url, verify=False)
+        response.raise_for_status()
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=cache_file.parent, suffix='.tmp', delete=False) as tmp:
+            tmp.write(response.content)
+        os.replace(tmp.name, cache_file)
+        return response.content
 
     def _download_manifest_info(self, name='default'):
         """Download and cache the manifest information."""
-        if self.template is None:
-            self.template = {}
-        self.template[name] = requests.get(settings.fake_manifest.url[name], verify=False).content
-        if self.signing_key is None:
-            self.signing_key = requests.get(settings.fake_manifest.key_url, verify=False).content
-        if self.private_key is None:
-            self.private_key = crypto_serialization.load_pem_private_key(
-                self.signing_key, password=None, backend=crypto_default_backend()
-            )
+        with self._lock:
+            if self.template is None:
+                self.template = {}
+            if self.template.get(name) is None:
+                self.template[name] = self._download(
+                    settings.fake_manifest.url[name], f'{name}.zip'
+                )
+            if self.signing_key is None:
+                self.signing_key = self._download(settings.fake_manifest.key_url, 'signing_key')
+            if self.private_key is None:
+                self.private_key = crypto_serialization.load_pem_private_key(
+                    self.signing_key, password=None, backend=crypto_default_backend()
+                )
 
     def manifest_clone(self, org_environment_access=False, name='default'):
         """Clones a RedHat-manifest file.
@@ -55,33 +121,40 @@ class ManifestCloner:
         if self.signing_key is None or self.template is None or self.template.get(name) is None:
             self._download_manifest_info(name)
 
-        template_zip = zipfile.ZipFile(io.BytesIO(self.template[name]))
-        # Extract the consumer_export.zip from the template manifest.
-        consumer_export_zip = zipfile.ZipFile(io.BytesIO(template_zip.read('consumer_export.zip')))
+        if name not in self._consumer_exports:
+            # Extract the consumer_export.zip from the template manifest.
+            with zipfile.ZipFile(io.BytesIO(self.template[name])) as template_zip:
+                self._consumer_exports[name] = template_zip.read('consumer_export.zip')
+        consumer_export_zip = zipfile.ZipFile(io.BytesIO(self._consumer_exports[name]))
 
         # Generate a new consumer_export.zip file changing the consumer
-        # uuid.
+        # uuid, the other members are copied still compressed.
         consumer_export = io.BytesIO()
         with zipfile.ZipFile(consumer_export, 'w') as new_consumer_export_zip:
-            for name in consumer_export_zip.namelist():
-                if name == 'export/consumer.json':
-                    consumer_data = json.loads(consumer_export_zip.read(name).decode('utf-8'))
+            for info in consumer_export_zip.infolist():
+                if info.filename == 'export/consumer.json':
+                    consumer_data = json.loads(consumer_export_zip.read(info).decode('utf-8'))
                     consumer_data['uuid'] = str(uuid.uuid1())
                     if org_environment_access:
                         consumer_data['contentAccessMode'] = 'org_environment'
                         consumer_data['owner']['contentAccessModeList'] = (
                             'entitlement,org_environment'
                         )
-                    new_consumer_export_zip.writestr(name, json.dumps(consumer_data))
+                    new_consumer_export_zip.writestr(
+                        info.filename, json.dumps(consumer_data), compress_type=info.compress_type
+                    )
                 else:
-                    new_consumer_export_zip.writestr(name, consumer_export_zip.read(name))
+                    _copy_raw(consumer_export_zip, info, new_consumer_export_zip)
 
         # Generate a new manifest.zip file with the generated
-        # consumer_export.zip and new signature.
+        # consumer_export.zip and new signature. The consumer_export.zip
+        # members are compressed already, it is stored as is.
         manifest = io.BytesIO()
         with zipfile.ZipFile(manifest, 'w', zipfile.ZIP_DEFLATED) as manifest_zip:
             consumer_export.seek(0)
-            manifest_zip.writestr('consumer_export.zip', consumer_export.read())
+            manifest_zip.writestr(
+                'consumer_export.zip', consumer_export.read(), compress_type=zipfile.ZIP_STORED
+            )
             consumer_export.seek(0)
             signature = self.private_key.sign(
                 consumer_export.read(), padding.PKCS1v15(), hashes.SHA256()
@@ -109,9 +182,92 @@ class ManifestCloner:
         return io.BytesIO(self.template[name])
 
 
+class ManifestClonePool:
+    """Cloned manifests cloned ahead of time by a background thread.
+
+    The thread keeps ``size`` manifests ready for every template name and
+    content access mode asked for once. When none is ready, the manifest is
+    cloned on demand.
+
+    :param cloner: :class:`ManifestCloner` cloning the manifests
+    :param size: number of manifests kept ready per template name
+    """
+
+    def __init__(self, cloner, size):
+        self.cloner = cloner
+        self.size = size
+        self._condition = threading.Condition()
+        self._pid = None
+
+    def _start(self):
+        """Start the cloning thread, a forked process starts its own"""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        # manifests cloned before a fork are not unique any more
+        self._ready = {}
+        self._failed = set()
+        threading.Thread(target=self._fill, name='manifest-clone-pool', daemon=True).start()
+
+    def _fill(self):
+        while True:
+            with self._condition:
+                while (key := self._next_key()) is None:
+                    self._condition.wait()
+            name, org_environment_access = key
+            try:
+                manifest = self.cloner.manifest_clone(
+                    org_environment_access=org_environment_access, name=name
+                )
+            except Exception as err:  # retried and reported on demand
+                logger.warning(f'Could not clone the {name} manifest ahead of time: {err}')
+                with self._condition:
+                    self._failed.add(key)
+                continue
+            with self._condition:
+                self._ready[key].append(manifest.getvalue())
+                self._condition.notify_all()
+
+    def _next_key(self):
+        for key, ready in self._ready.items():
+            if len(ready) < self.size and key not in self._failed:
+                return key
+        return None
+
+    def get(self, org_environment_access=False, name='default'):
+        """Return a cloned manifest, see :meth:`ManifestCloner.manifest_clone`"""
+        key = (name, org_environment_access)
+        with self._condition:
+            self._start()
+            ready = self._ready.setdefault(key, collections.deque())
+            content = ready.popleft() if ready else None
+            self._failed.discard(key)
+            self._condition.notify()
+        if content is None:
+            return self.cloner.manifest_clone(
+                org_environment_access=org_environment_access, name=name
+            )
+        return io.BytesIO(content)
+
+
 # Cache the ManifestCloner in order to avoid downloading the manifest template
 # every single time.
-_manifest_cloner = ManifestCloner()
+_manifest_cloner = ManifestCloner(cache_dir=robottelo_tmp_dir.joinpath('manifests'))
+_manifest_clone_pool = None
+
+
+def _clone_manifest(org_environment_access, name):
+    """Clone a manifest from the clone pool, when enabled"""
+    global _manifest_clone_pool
+    if not settings.fake_manifest.clone_pool_size:
+        return _manifest_cloner.manifest_clone(
+            org_environment_access=org_environment_access, name=name
+        )
+    if _manifest_clone_pool is None:
+        _manifest_clone_pool = ManifestClonePool(
+            _manifest_cloner, settings.fake_manifest.clone_pool_size
+        )
+    return _manifest_clone_pool.get(org_environment_access=org_environment_access, name=name)
 
 
 class Manifest:
@@ -130,9 +286,7 @@ class Manifest:
         self.filename = filename
 
         if self._content is None:
-            self._content = _manifest_cloner.manifest_clone(
-                org_environment_access=org_environment_access, name=name
-            )
+            self._content = _clone_manifest(org_environment_access, name)
         if self.filename is None:
             self.filename = f'/var/tmp/manifest-{int(time.time())}.zip'
 
@@ -0,0 +1,239 @@
+"""Index of the testimony metadata of test modules.
+
+Every test module is parsed once with :mod:`ast` to extract the testimony
+tokens of its module, class and function docstrings and the ``is_open`` calls
+used as workarounds. The results are kept in memory for the whole collection
+and persisted to an on-disk cache, so unchanged modules are not parsed again
+on the next run.
+
+Collection plugins use the shared index returned by :func:`get_index` instead
+of running ``inspect.getdoc`` and ``inspect.getsource`` per collected item.
+"""
+
+import ast
+from functools import lru_cache
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+import re
+import sys
+import tempfile
+import threading
+
+from robottelo.logging import collection_logger as logger
+
+# bump when the structure of the indexed data changes
+INDEX_VERSION = 1
+
+TOKEN_PATTERNS = {
+    # To match :CaseComponent: FooBar
+    'component': re.compile(r'\s*:CaseComponent:\s*(?P<component>\S*)', re.IGNORECASE),
+    # To match :CaseImportance: Critical
+    'importance': re.compile(r'\s*:CaseImportance:\s*(?P<importance>\S*)', re.IGNORECASE),
+    # To match :Team: Rocket
+    'team': re.compile(r'\s*:Team:\s*(?P<team>\S*)', re.IGNORECASE),
+    # To match :Verifies: SAT-32932
+    'verifies': re.compile(r'\s*:Verifies:\s*(?P<verifies>.*\S*)', re.IGNORECASE),
+    # To match :BlockedBy: SAT-32932
+    'blocked_by': re.compile(r'\s*:BlockedBy:\s*(?P<blocked_by>.*\S*)', re.IGNORECASE),
+    # To match :BZ: 123456, 456789
+    'bz': re.compile(r'\s*:BZ:\s*(?P<bz>.*\S*)', re.IGNORECASE),
+}
+
+# To match the issue of `is_open('BZ:123456')`
+IS_OPEN_ISSUE = re.compile(r'(?P<src>\D{2})\s*:\s*(?P<num>\d*)')
+
+
+def parse_tokens(docstring):
+    """Return every match of the testimony tokens in ``docstring``
+
+    :return: dictionary mapping token names of :data:`TOKEN_PATTERNS` to the
+        list of their values, tokens without a match are left out
+    """
+    if not docstring:
+        return {}
+    tokens = {}
+    for name, pattern in TOKEN_PATTERNS.items():
+        if matches := pattern.findall(docstring):
+            tokens[name] = matches
+    return tokens
+
+
+def _is_open_site(test):
+    """Return the usage and issue of an ``is_open`` call used as an ``if`` condition"""
+    # `if is_open('BZ:1') and ...` is a workaround for BZ:1 too
+    while isinstance(test, ast.BoolOp):
+        test = test.values[0]
+    usage = 'is_open'
+    if isinstance(test, ast.UnaryOp) and isinstance(test.op, ast.Not):
+        usage, test = 'not is_open', test.operand
+    if not (isinstance(test, ast.Call) and test.args):
+        return None
+    func = test.func
+    name = func.id if isinstance(func, ast.Name) else getattr(func, 'attr', None)
+    issue = test.args[0]
+    if name != 'is_open' or not isinstance(issue, ast.Constant) or not isinstance(issue.value, str):
+        return None
+    if (match := IS_OPEN_ISSUE.fullmatch(issue.value)) is None:
+        return None
+    return [usage, match.group('src'), match.group('num')]
+
+
+def _is_open_sites(node):
+    """Return the ``is_open`` workarounds used in ``node``, in source order"""
+    sites = []
+    for child in ast.walk(node):
+        if isinstance(child, ast.If | ast.IfExp) and (site := _is_open_site(child.test)):
+            sites.append((child.lineno, child.col_offset, site))
+    return [site for *_, site in sorted(sites)]
+
+
+def index_source(source):
+    """Extract the metadata of a test module from its source
+
+    :return: dictionary with the module ``tokens``, the first ``:CaseComponent:``
+        of the source as ``component``, all ``is_open`` sites and the ``tokens``
+        and ``is_open`` sites of every class and function keyed on qualified name
+    """
+    tree = ast.parse(source)
+    component = TOKEN_PATTERNS['component'].search(source)
+    data = {
+        'tokens': parse_tokens(ast.get_docstring(tree)),
+        'component': component.group('component') if component else None,
+        'is_open': _is_open_sites(tree),
+        'objects': {},
+    }
+
+    def visit(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef | ast.FunctionDef | ast.AsyncFunctionDef):
+                qualname = f'{prefix}{child.name}'
+                data['objects'][qualname] = {
+                    'tokens': parse_tokens(ast.get_docstring(child)),
+                    'is_open': _is_open_sites(child),
+                }
+                local = '' if isinstance(child, ast.ClassDef) else '<locals>.'
+                visit(child, f'{qualname}.{local}')
+            else:
+                visit(child, prefix)
+
+    visit(tree, '')
+    return data
+
+
+class MetadataIndex:
+    """Testimony metadata of test modules, parsed once per file content
+
+    :param cache_file: JSON file persisting the index between runs, ``None``
+        keeps the index in memory only
+    """
+
+    def __init__(self, cache_file=None):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self._files = {}
+        self._cached = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.parsed = 0
+        if self.cache_file and self.cache_file.exists():
+            try:
+                cached = json.loads(self.cache_file.read_text())
+            except (OSError, ValueError) as err:
+                logger.warning(f'Ignoring unreadable metadata index {self.cache_file}: {err}')
+            else:
+                if cached.get('version') == INDEX_VERSION:
+                    self._cached = cached['files']
+
+    def file(self, path):
+        """Return the indexed metadata of the module at ``path``"""
+        path = str(Path(path).resolve())
+        with self._lock:
+            if (data := self._files.get(path)) is not None:
+                return data
+            stat = os.stat(path)
+            cached = self._cached.get(path)
+            if cached and (cached['mtime_ns'], cached['size']) == (stat.st_mtime_ns, stat.st_size):
+                data = cached['data']
+            else:
+                content = Path(path).read_bytes()
+                digest = hashlib.sha256(content).hexdigest()
+                if cached and cached['sha256'] == digest:
+                    # touched but unchanged
+                    data = cached['data']
+                else:
+                    data = index_source(content.decode('utf-8'))
+                    self.parsed += 1
+                self._cached[path] = {
+                    'mtime_ns': stat.st_mtime_ns,
+                    'size': stat.st_size,
+                    'sha256': digest,
+                    'data': data,
+                }
+                self._dirty = True
+            self._files[path] = data
+            return data
+
+    @staticmethod
+    def _locate(obj):
+        """Return the path of the module defining ``obj`` and its qualified name"""
+        if inspect.ismodule(obj):
+            return obj.__file__, None
+        obj = inspect.unwrap(obj)
+        if inspect.isclass(obj):
+            return sys.modules[obj.__module__].__file__, obj.__qualname__
+        return obj.__code__.co_filename, obj.__qualname__
+
+    def _entry(self, obj):
+        try:
+            path, qualname = self._locate(obj)
+            data = self.file(path)
+        except (AttributeError, KeyError, OSError, SyntaxError, TypeError, ValueError):
+            return None
+        return data if qualname is None else data['objects'].get(qualname)
+
+    def tokens(self, obj):
+        """Return the testimony tokens of the docstring of a module, class or function
+
+        Objects not defined literally in their module, e.g. generated tests, fall
+        back to :func:`inspect.getdoc`.
+        """
+        if obj is None:
+            return {}
+        if (entry := self._entry(obj)) is None:
+            return parse_tokens(inspect.getdoc(obj))
+        return entry['tokens']
+
+    def is_open_sites(self, obj):
+        """Return ``[usage, src, num]`` of the ``is_open`` workarounds in a module or function"""
+        if (entry := self._entry(obj)) is None:
+            # not defined literally in its module, there is no source to look at
+            return []
+        return entry['is_open']
+
+    def component(self, module):
+        """Return the first ``:CaseComponent:`` found in the source of ``module``"""
+        return self.file(module.__file__)['component']
+
+    def save(self):
+        """Persist the index to ``cache_file`` if anything was indexed"""
+        with self._lock:
+            if not (self.cache_file and self._dirty):
+                return
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # several xdist workers may save at the same time, replace the file atomically
+            with tempfile.NamedTemporaryFile(
+                'w', dir=self.cache_file.parent, suffix='.tmp', delete=False
+            ) as tmp:
+                json.dump({'version': INDEX_VERSION, 'files': self._cached}, tmp)
+            os.replace(tmp.name, self.cache_file)
+            self._dirty = False
+
+
+@lru_cache
+def get_index():
+    """Return the process wide :class:`MetadataIndex`, persisted in the robottelo tmp dir"""
+    from robottelo.config import robottelo_tmp_dir
+
+    return MetadataIndex(cache_file=robottelo_tmp_dir.joinpath('metadata_index.json'))
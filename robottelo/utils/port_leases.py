@@ -0,0 +1,195 @@
+"""Leases of the fake capsule ports of Satellites, shared by the xdist workers.
+
+The ports of ``settings.fake_capsules.port_range`` used on a Satellite are
+scanned once and kept in a SQLite database of the robottelo tmp dir. Scans run
+outside of the database transactions, their result is applied in a short one. Workers
+lease free ports from it and release them when done, so parallel workers never
+pick the same port. The used ports are scanned again when the last scan is
+older than ``SCAN_TTL`` or when no free port is left. Leases of processes that
+are gone or older than ``LEASE_TIMEOUT`` are reclaimed.
+"""
+
+from contextlib import contextmanager
+from functools import lru_cache
+import os
+from pathlib import Path
+import sqlite3
+import time
+
+from robottelo.logging import logger
+
+# bump when the schema of the lease database changes
+LEASES_VERSION = 1
+# seconds after which the used ports of a Satellite are scanned again
+SCAN_TTL = 600
+# seconds after which a lease is reclaimed, even if its process is still running
+LEASE_TIMEOUT = 7200
+# seconds to wait for the other processes using the lease database
+BUSY_TIMEOUT = 60
+
+FREE = 'free'
+USED = 'used'
+LEASED = 'leased'
+
+
+class NoPortAvailable(Exception):
+    """Raised when every port of the pool is used or leased"""
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class PortLeases:
+    """Port leases keyed on Satellite hostname
+
+    :param db_file: SQLite database file shared by the processes
+    """
+
+    def __init__(self, db_file):
+        self.db_file = Path(db_file)
+
+    @contextmanager
+    def _transaction(self):
+        """Open the database in an exclusive transaction, creating the schema if needed"""
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.db_file, timeout=BUSY_TIMEOUT, isolation_level=None)
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            if connection.execute('PRAGMA user_version').fetchone()[0] != LEASES_VERSION:
+                connection.execute('DROP TABLE IF EXISTS ports')
+                connection.execute('DROP TABLE IF EXISTS scans')
+                connection.execute(
+                    'CREATE TABLE ports (hostname TEXT NOT NULL, port INTEGER NOT NULL, '
+                    'state TEXT NOT NULL, pid INTEGER, leased_at REAL, '
+                    'PRIMARY KEY (hostname, port))'
+                )
+                connection.execute('CREATE INDEX ports_state ON ports (hostname, state)')
+                connection.execute(
+                    'CREATE TABLE scans (hostname TEXT PRIMARY KEY, scanned_at REAL NOT NULL)'
+                )
+                connection.execute(f'PRAGMA user_version = {LEASES_VERSION}')
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        else:
+            connection.execute('COMMIT')
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _apply_scan(connection, hostname, port_pool, used_ports, scanned_at):
+        """Mark the ``used_ports`` found by a scan as used and the others as free,
+        leases are kept"""
+        connection.execute(
+            'DELETE FROM ports WHERE hostname = ? AND state != ?', (hostname, LEASED)
+        )
+        connection.executemany(
+            'INSERT OR IGNORE INTO ports (hostname, port, state) VALUES (?, ?, ?)',
+            [(hostname, port, USED if port in used_ports else FREE) for port in port_pool],
+        )
+        connection.execute(
+            'INSERT OR REPLACE INTO scans (hostname, scanned_at) VALUES (?, ?)',
+            (hostname, scanned_at),
+        )
+        logger.debug(f'Scanned the capsule ports of {hostname}, {len(used_ports)} used')
+
+    @staticmethod
+    def _scanned_at(connection, hostname):
+        row = connection.execute(
+            'SELECT scanned_at FROM scans WHERE hostname = ?', (hostname,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    @staticmethod
+    def _reclaim(connection, hostname):
+        """Free the leases of the processes that are gone or that timed out"""
+        leases = connection.execute(
+            'SELECT port, pid, leased_at FROM ports WHERE hostname = ? AND state = ?',
+            (hostname, LEASED),
+        ).fetchall()
+        expired = [
+            port
+            for port, pid, leased_at in leases
+            if not _is_running(pid) or time.time() - leased_at > LEASE_TIMEOUT
+        ]
+        if expired:
+            logger.debug(f'Reclaiming the capsule ports {expired} of {hostname}')
+            connection.executemany(
+                'UPDATE ports SET state = ?, pid = NULL, leased_at = NULL '
+                'WHERE hostname = ? AND port = ?',
+                [(FREE, hostname, port) for port in expired],
+            )
+
+    def lease(self, hostname, port_pool, scan):
+        """Lease a free port of ``port_pool`` on the Satellite ``hostname``
+
+        The scan runs outside of any transaction, so the other processes can lease
+        and release ports meanwhile.
+
+        :param port_pool: ports dedicated to fake capsules
+        :param scan: callable returning the ports of the pool used on the Satellite,
+            called when the used ports are not known or too old
+        :return: the leased port
+        :raises NoPortAvailable: when every port of the pool is used or leased
+        """
+        port_pool = list(port_pool)
+        with self._transaction() as connection:
+            scanned_at = self._scanned_at(connection, hostname)
+            if scanned_at is not None and time.time() - scanned_at <= SCAN_TTL:
+                port = self._lease_free(connection, hostname)
+                if port is not None:
+                    logger.debug(f'Leased capsule port {port} of {hostname}')
+                    return port
+        # the scan time is its start, ports may be taken while it runs
+        started_at = time.time()
+        used_ports = set(scan())
+        with self._transaction() as connection:
+            scanned_at = self._scanned_at(connection, hostname)
+            # a scan started after this one may have been applied meanwhile
+            if scanned_at is None or scanned_at < started_at:
+                self._reclaim(connection, hostname)
+                self._apply_scan(connection, hostname, port_pool, used_ports, started_at)
+            port = self._lease_free(connection, hostname)
+        if port is None:
+            raise NoPortAvailable(f'No capsule port of {hostname} left in {port_pool}')
+        logger.debug(f'Leased capsule port {port} of {hostname}')
+        return port
+
+    @staticmethod
+    def _lease_free(connection, hostname):
+        """Lease any free port, the transaction is exclusive"""
+        row = connection.execute(
+            'SELECT port FROM ports WHERE hostname = ? AND state = ? LIMIT 1', (hostname, FREE)
+        ).fetchone()
+        if row is None:
+            return None
+        connection.execute(
+            'UPDATE ports SET state = ?, pid = ?, leased_at = ? WHERE hostname = ? AND port = ?',
+            (LEASED, os.getpid(), time.time(), hostname, row[0]),
+        )
+        return row[0]
+
+    def release(self, hostname, port):
+        """Release the lease of ``port`` on ``hostname``, if this process holds it"""
+        with self._transaction() as connection:
+            connection.execute(
+                'UPDATE ports SET state = ?, pid = NULL, leased_at = NULL '
+                'WHERE hostname = ? AND port = ? AND state = ? AND pid = ?',
+                (FREE, hostname, port, LEASED, os.getpid()),
+            )
+
+
+@lru_cache
+def get_port_leases():
+    """Return the process wide :class:`PortLeases`, stored in the robottelo tmp dir"""
+    from robottelo.config import robottelo_tmp_dir
+
+    return PortLeases(robottelo_tmp_dir.joinpath('capsule_ports.db'))
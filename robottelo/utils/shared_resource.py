@@ -9,7 +9,13 @@ where each process can communicate its status. The first process to register wil
 watcher. The main watcher will wait for all other processes to be ready, then perform the action.
 If the main actor fails to complete the action, and the action is recoverable, another process
 will take over as the main watcher and attempt to perform the action. If the action is not
-recoverable, the main watcher will fail and release all other processes.
+recoverable, the main watcher will fail and release all other processes. Processes that failed are
+not waited for.
+
+Every status update appends a single JSON event to the file, so updates never rewrite the file
+and each process only reads the events added since its last read. How processes wait for new
+events is up to the backend: the inotify backend wakes waiters as soon as the file changes, the
+file backend, used where inotify is not available, checks the size of the file periodically.
 
 It is recommended to use this class as a context manager, as it will automatically register and
 report when the process is done.
@@ -22,12 +28,174 @@ Example:
     ...     # Do post-upgrade cleanup steps if any
 """
 
+import contextlib
+import ctypes
+import ctypes.util
 import json
+import os
 from pathlib import Path
+import select
 import time
 from uuid import uuid4
 
-from broker.helpers import FileLock
+
+class FileBackend:
+    """Shared resource events stored in an append-only file, waiters poll its size.
+
+    Attributes:
+        path (Path): The file holding the events, one JSON object per line.
+        poll_interval (float): Seconds between checks for new events.
+    """
+
+    def __init__(self, path, poll_interval=0.05):
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+
+    @staticmethod
+    def _encode(event):
+        return f"{json.dumps(event)}\n".encode()
+
+    def create(self, event):
+        """Creates the file with a first event.
+
+        Returns:
+            bool: True if the file was created, False if it already existed.
+        """
+        try:
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_APPEND, 0o644)
+        except FileExistsError:
+            return False
+        try:
+            os.write(fd, self._encode(event))
+        finally:
+            os.close(fd)
+        return True
+
+    def append(self, event):
+        """Appends an event to the file, with a single write so events never interleave."""
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(fd, self._encode(event))
+        finally:
+            os.close(fd)
+
+    def read(self, offset):
+        """Reads the events added after ``offset``.
+
+        Returns:
+            tuple: The list of new events and the offset to read the following events from.
+        """
+        with self.path.open("rb") as resource_file:
+            resource_file.seek(offset)
+            data = resource_file.read()
+        # an event being written is read on the next call
+        complete = data[: data.rfind(b"\n") + 1]
+        events = [json.loads(line) for line in complete.splitlines() if line]
+        return events, offset + len(complete)
+
+    def _changed(self, offset):
+        try:
+            return self.path.stat().st_size > offset
+        except FileNotFoundError:
+            return True
+
+    def wait(self, offset, timeout=1):
+        """Waits up to ``timeout`` seconds for events to be added after ``offset``."""
+        for _ in range(max(1, int(timeout / self.poll_interval))):
+            if self._changed(offset):
+                return
+            time.sleep(self.poll_interval)
+
+    def remove(self):
+        """Removes the file."""
+        self.path.unlink()
+
+    def close(self):
+        """Releases the resources held by the backend."""
+
+
+class InotifyBackend(FileBackend):
+    """Shared resource events stored in an append-only file, waiters are woken by inotify.
+
+    Only available on Linux, see :meth:`is_supported`.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_DELETE_SELF = 0x00000400
+    _libc = None
+
+    @classmethod
+    def is_supported(cls):
+        """Returns whether inotify can be used on this system."""
+        if cls._libc is None:
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+                cls._libc = libc if hasattr(libc, "inotify_init1") else False
+            except OSError:
+                cls._libc = False
+        return bool(cls._libc)
+
+    def __init__(self, path, poll_interval=0.05):
+        super().__init__(path, poll_interval)
+        self._fd = None
+
+    def _watch(self):
+        if self._fd is None:
+            if not self.is_supported():
+                return None
+            fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return None
+            watch = self._libc.inotify_add_watch(
+                fd, os.fsencode(self.path), self.IN_MODIFY | self.IN_DELETE_SELF
+            )
+            if watch < 0:
+                os.close(fd)
+                return None
+            self._fd = fd
+        return self._fd
+
+    def wait(self, offset, timeout=1):
+        """Waits up to ``timeout`` seconds for events to be added after ``offset``,
+        polling the file like :class:`FileBackend` when inotify is not available."""
+        fd = self._watch()
+        if fd is None:
+            super().wait(offset, timeout)
+        # events added before the watch was in place do not notify
+        elif not self._changed(offset) and select.select([fd], [], [], timeout)[0]:
+            with contextlib.suppress(BlockingIOError):
+                os.read(fd, 4096)
+
+    def close(self):
+        """Stops watching the file."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+BACKENDS = {"file": FileBackend, "inotify": InotifyBackend}
+
+
+def default_backend():
+    """Returns the notification backend when supported, the file backend otherwise."""
+    return InotifyBackend if InotifyBackend.is_supported() else FileBackend
+
+
+def _apply_event(state, event):
+    """Updates the shared resource ``state`` with an ``event``."""
+    if "register" in event:
+        state["watchers"].append(event["register"])
+        state["statuses"][event["register"]] = "pending"
+    elif "status" in event:
+        state["statuses"][event["watcher"]] = event["status"]
+    elif "main_status" in event:
+        state["main_status"] = event["main_status"]
+    elif "main_watcher" in event:
+        state["main_watcher"] = event["main_watcher"]
+    elif "take_over" in event and state["main_status"] in ("action_error", "error"):
+        # only the first process asking after a failure becomes the main watcher
+        state["main_watcher"] = event["take_over"]
+        state["main_status"] = "recovering"
 
 
 class SharedResource:
@@ -40,6 +208,7 @@ class SharedResource:
         action_is_recoverable (bool): Whether the action is recoverable or not.
         id (str): The unique identifier of the shared resource.
         resource_file (Path): The path to the file representing the shared resource.
+        backend (FileBackend): The backend storing the events of the shared resource.
         is_main (bool): Whether the current instance is the main watcher or not.
         is_recovering (bool): Whether the current instance is recovering from an error or not.
     """
@@ -52,15 +221,32 @@ class SharedResource:
             action (function): The function to be executed when the resource is ready.
             action_args (tuple): The arguments to be passed to the action function.
             action_kwargs (dict): The keyword arguments to be passed to the action function.
+                ``resource_backend`` selects the backend by name or class, by default
+                :func:`default_backend`.
         """
         self.resource_file = Path(f"/tmp/{resource_name}.shared")
-        self.lock_file = FileLock(self.resource_file)
+        backend = action_kwargs.pop("resource_backend", None) or default_backend()
+        self.backend = BACKENDS.get(backend, backend)(self.resource_file)
         self.id = str(uuid4().fields[-1])
         self.action = action
         self.action_is_recoverable = action_kwargs.pop("action_is_recoverable", False)
         self.action_args = action_args
         self.action_kwargs = action_kwargs
         self.is_recovering = False
+        self._state = {"watchers": [], "statuses": {}, "main_watcher": None, "main_status": None}
+        self._offset = 0
+
+    def _read_state(self):
+        """Applies the events added since the last read and returns the current state."""
+        events, self._offset = self.backend.read(self._offset)
+        for event in events:
+            _apply_event(self._state, event)
+        return self._state
+
+    def _wait_until(self, condition):
+        """Waits until ``condition`` is true for the state of the shared resource."""
+        while not condition(self._read_state()):
+            self.backend.wait(self._offset)
 
     def _update_status(self, status):
         """Updates the status of the shared resource.
@@ -68,10 +254,7 @@ class SharedResource:
         Args:
             status (str): The new status of the shared resource.
         """
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            curr_data["statuses"][self.id] = status
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+        self.backend.append({"status": status, "watcher": self.id})
 
     def _update_main_status(self, status):
         """Updates the main status of the shared resource.
@@ -79,13 +262,17 @@ class SharedResource:
         Args:
             status (str): The new main status of the shared resource.
         """
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            curr_data["main_status"] = status
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+        self.backend.append({"main_status": status})
+
+    @staticmethod
+    def _all_status(state, status):
+        # watchers that failed, e.g. a main watcher whose action failed, never get there
+        return all(
+            state["statuses"].get(watcher) in (status, "error") for watcher in state["watchers"]
+        )
 
     def _check_all_status(self, status):
-        """Checks if all watchers have the specified status.
+        """Checks if all watchers have the specified status, failed watchers are ignored.
 
         Args:
             status (str): The status to check for.
@@ -93,64 +280,41 @@ class SharedResource:
         Returns:
             bool: True if all watchers have the specified status, False otherwise.
         """
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            for watcher_id in curr_data["watchers"]:
-                if curr_data["statuses"].get(watcher_id) != status:
-                    return False
-            return True
+        return self._all_status(self._read_state(), status)
 
     def _wait_for_status(self, status):
-        """Waits until all watchers have the specified status.
+        """Waits until all watchers have the specified status, failed watchers are ignored.
 
         Args:
             status (str): The status to wait for.
         """
-        while not self._check_all_status(status):
-            time.sleep(1)
+        self._wait_until(lambda state: self._all_status(state, status))
 
     def _wait_for_main_watcher(self):
         """Waits for the main watcher to finish."""
-        while True:
-            curr_data = json.loads(self.resource_file.read_text())
-            if curr_data["main_status"] != "done":
-                time.sleep(60)
-            elif curr_data["main_status"] == "action_error":
-                self._try_take_over()
-            elif curr_data["main_status"] == "error":
-                raise Exception(f"Error in main watcher: {curr_data['main_watcher']}")
-            else:
-                break
+        self._wait_until(lambda state: state["main_status"] in ("done", "action_error", "error"))
+        curr_data = self._state
+        if curr_data["main_status"] == "action_error":
+            self._try_take_over()
+        elif curr_data["main_status"] == "error":
+            raise Exception(f"Error in main watcher: {curr_data['main_watcher']}")
 
     def _try_take_over(self):
         """Tries to take over as the main watcher."""
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            if curr_data["main_status"] in ("action_error", "error"):
-                curr_data["main_status"] = "recovering"
-                curr_data["main_watcher"] = self.id
-                self.resource_file.write_text(json.dumps(curr_data, indent=4))
-                self.is_main = True
-                self.is_recovering = True
+        self.backend.append({"take_over": self.id})
+        self._wait_until(lambda state: state["main_status"] not in ("action_error", "error"))
+        if self._state["main_watcher"] == self.id:
+            self.is_main = True
+            self.is_recovering = True
         self.wait()
 
     def register(self):
         """Registers the current process as a watcher."""
-        with self.lock_file:
-            if self.resource_file.exists():
-                curr_data = json.loads(self.resource_file.read_text())
-                self.is_main = False
-            else:  # First watcher to register, becomes the main watcher, and creates the file
-                curr_data = {
-                    "watchers": [],
-                    "statuses": {},
-                    "main_watcher": self.id,
-                    "main_status": "waiting",
-                }
-                self.is_main = True
-            curr_data["watchers"].append(self.id)
-            curr_data["statuses"][self.id] = "pending"
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+        # First watcher to register, becomes the main watcher, and creates the file
+        self.is_main = self.backend.create({"main_watcher": self.id})
+        if self.is_main:
+            self._update_main_status("waiting")
+        self.backend.append({"register": self.id})
 
     def ready(self):
         """Marks the current process as ready to perform the action."""
@@ -162,11 +326,19 @@ class SharedResource:
         self._update_status("done")
 
     def act(self):
-        """Attempt to perform the action."""
+        """Attempt to perform the action.
+
+        When a recoverable action fails, the current process stops being the main watcher so
+        another process can take over.
+        """
         try:
             self.action(*self.action_args, **self.action_kwargs)
         except Exception as err:
-            self._update_main_status("error")
+            if self.action_is_recoverable:
+                self.is_main = False
+                self._update_main_status("action_error")
+            else:
+                self._update_main_status("error")
             raise err
 
     def wait(self):
@@ -186,15 +358,18 @@ class SharedResource:
 
     def __exit__(self, exc_type, exc_value, traceback):
         """Marks the current process as done and updates the main watcher if needed."""
-        if exc_type is FileNotFoundError:
-            raise exc_value
-        if exc_type is None:
-            self.done()
-            if self.is_main:
-                self._wait_for_status("done")
-                self.resource_file.unlink()
-        else:
-            self._update_status("error")
-            if self.is_main:
-                self._update_main_status("error")
-            raise exc_value
+        try:
+            if exc_type is FileNotFoundError:
+                raise exc_value
+            if exc_type is None:
+                self.done()
+                if self.is_main:
+                    self._wait_for_status("done")
+                    self.backend.remove()
+            else:
+                self._update_status("error")
+                if self.is_main:
+                    self._update_main_status("error")
+                raise exc_value
+        finally:
+            self.backend.close()
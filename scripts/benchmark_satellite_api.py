@@ -0,0 +1,42 @@
+"""Micro-benchmark for building Satellite objects and resolving nailgun entities.
+
+Measures ``Satellite()`` construction followed by the first
+``satellite.api.Organization`` access, which is what most fixtures do.
+No connection to the Satellite is made.
+
+Usage: python scripts/benchmark_satellite_api.py --iterations 200
+"""
+
+import statistics
+import timeit
+
+import click
+
+from robottelo.config import settings
+from robottelo.hosts import Satellite
+
+
+def construct_and_access(hostname):
+    """Build a Satellite and resolve one nailgun entity on it."""
+    return Satellite(hostname=hostname).api.Organization
+
+
+@click.command()
+@click.option('--iterations', default=100, help='Number of timed Satellite constructions.')
+@click.option('--repeat', default=5, help='Number of times the measurement is repeated.')
+@click.option('--hostname', default=None, help='Hostname to use, defaults to server.hostname.')
+def benchmark(iterations, repeat, hostname):
+    hostname = hostname or settings.server.hostname or 'satellite.example.com'
+    timings = timeit.repeat(
+        lambda: construct_and_access(hostname), number=iterations, repeat=repeat
+    )
+    per_call = [timing / iterations * 1000 for timing in timings]
+    click.echo(
+        f'Satellite() + .api.Organization: '
+        f'min {min(per_call):.3f} ms, median {statistics.median(per_call):.3f} ms '
+        f'per call ({iterations} calls x {repeat} runs)'
+    )
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,95 @@
+"""Benchmark of the storage handlers of the shared function decorator.
+
+Every process calls the shared function protocol on random keys: lock the key,
+read its value, store a value if there is none, release the lock. Like the
+decorator, a new storage handler is created for each call. The redis handler
+is skipped when no redis server answers on the configured host.
+
+Usage: python scripts/benchmark_shared_storage.py --processes 8 --calls 500
+"""
+
+from functools import partial
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import click
+
+from robottelo.utils.decorators.func_shared import redis_storage
+from robottelo.utils.decorators.func_shared.file_storage import FileStorageHandler
+from robottelo.utils.decorators.func_shared.redis_storage import RedisStorageHandler
+from robottelo.utils.decorators.func_shared.sqlite_storage import SQLiteStorageHandler
+
+
+def shared_call(handler, key):
+    """Run the shared function protocol of a single call on key"""
+    with handler.lock(key) as data:
+        handler.when_lock_acquired(data)
+        value = handler.get(key)
+        if value is None:
+            handler.compare_and_set(key, None, {'id': key, 'state': 'READY', 'result': key})
+
+
+def run_worker(handler_factory, key_names, calls, seed):
+    """Return the latency in ms of each call made by a worker process"""
+    rand = random.Random(seed)
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        shared_call(handler_factory(), rand.choice(key_names))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def redis_available():
+    if redis_storage.redis is None:
+        return False
+    try:
+        return RedisStorageHandler().client.ping()
+    except redis_storage.redis.RedisError:
+        return False
+
+
+@click.command()
+@click.option('--processes', default=8, help='Number of concurrent processes.')
+@click.option('--calls', default=200, help='Number of shared function calls per process.')
+@click.option('--keys', default=20, help='Number of distinct shared function keys.')
+@click.option(
+    '--handler',
+    'handlers',
+    multiple=True,
+    type=click.Choice(['file', 'redis', 'sqlite']),
+    default=('file', 'redis', 'sqlite'),
+    help='Storage handler to benchmark, can be repeated.',
+)
+def benchmark(processes, calls, keys, handlers):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        factories = {
+            'file': partial(FileStorageHandler, root_dir=os.path.join(tmp_dir, 'file')),
+            'redis': RedisStorageHandler,
+            'sqlite': partial(SQLiteStorageHandler, db_path=os.path.join(tmp_dir, 'shared.db')),
+        }
+        for name in handlers:
+            if name == 'redis' and not redis_available():
+                click.echo('redis: skipped, no redis server available')
+                continue
+            key_names = [f'benchmark_{name}_{os.getpid()}_{index}' for index in range(keys)]
+            worker = partial(run_worker, factories[name], key_names, calls)
+            start = time.perf_counter()
+            with multiprocessing.Pool(processes) as pool:
+                results = pool.map(worker, range(processes))
+            elapsed = time.perf_counter() - start
+            latencies = sorted(latency for result in results for latency in result)
+            click.echo(
+                f'{name}: {len(latencies) / elapsed:.0f} calls/s, '
+                f'median {statistics.median(latencies):.3f} ms, '
+                f'p99 {latencies[int(len(latencies) * 0.99) - 1]:.3f} ms '
+                f'({processes} processes x {calls} calls on {keys} keys)'
+            )
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,69 @@
+"""Report the test durations recorded by the duration store plugin
+
+``trends`` lists the p50 and p95 test durations of the last runs,
+``regressions`` lists the tests of the last run slower than in the previous
+runs and exits with status 1 when there are some, ``fixtures`` lists the
+fixtures taking the most setup time in the last run.
+
+Usage: python scripts/duration_report.py regressions --runs 5 --threshold 1.5
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+import click
+
+from robottelo.utils.durations import DurationStore, get_store
+
+
+@click.group()
+@click.option(
+    '--db',
+    type=click.Path(dir_okay=False, path_type=Path),
+    help='Duration store database, the one of the robottelo tmp dir by default.',
+)
+@click.pass_context
+def cli(ctx, db):
+    ctx.obj = DurationStore(db) if db else get_store()
+
+
+@cli.command()
+@click.option('--runs', default=10, help='Number of runs to report.')
+@click.pass_obj
+def trends(store, runs):
+    """List the p50 and p95 test durations of the last runs"""
+    for run_id, started_at, tests, p50, p95 in store.trends(runs):
+        started = datetime.fromtimestamp(started_at).strftime('%Y-%m-%d %H:%M')
+        click.echo(f'{started} {run_id}: {tests} tests, p50 {p50:.1f}s, p95 {p95:.1f}s')
+
+
+@cli.command()
+@click.option('--runs', default=5, help='Number of previous runs to compare the last one to.')
+@click.option('--threshold', default=1.5, help='Ratio to the median duration of a regression.')
+@click.option('--min-delta', default=1.0, help='Minimum seconds of a regression.')
+@click.pass_obj
+def regressions(store, runs, threshold, min_delta):
+    """List the tests of the last run slower than in the previous runs"""
+    found = store.regressions(previous=runs, threshold=threshold, min_delta=min_delta)
+    for nodeid, baseline, duration in found:
+        ratio = f' ({duration / baseline:.1f}x)' if baseline else ''
+        click.echo(f'{nodeid}: {duration:.1f}s, median {baseline:.1f}s{ratio}')
+    if found:
+        raise SystemExit(1)
+    click.echo('No regression')
+
+
+@cli.command()
+@click.option('--top', default=20, help='Number of fixtures to list.')
+@click.pass_obj
+def fixtures(store, top):
+    """List the fixtures taking the most setup time in the last run"""
+    if not (runs := store.runs(1)):
+        raise click.ClickException('No run recorded')
+    durations = store.fixture_durations(runs[0][0])
+    for name, duration in sorted(durations.items(), key=lambda item: item[1], reverse=True)[:top]:
+        click.echo(f'{name}: {duration:.1f}s')
+
+
+if __name__ == '__main__':
+    cli()
@@ -0,0 +1,42 @@
+"""Probe the facts of Satellites and store them for the next test sessions
+
+Facts are written to the host facts file of the robottelo tmp dir, where test
+sessions read them instead of probing the Satellites over ssh.
+
+Usage: python scripts/host_facts.py [HOSTNAME ...]
+"""
+
+import json
+
+import click
+
+from robottelo.config import settings
+from robottelo.utils import host_facts
+
+
+@click.command()
+@click.argument('hostnames', nargs=-1)
+def main(hostnames):
+    """Probe HOSTNAMES, server.hostname and server.hostnames by default"""
+    hostnames = hostnames or [
+        hostname
+        for hostname in dict.fromkeys([settings.server.hostname, *settings.server.hostnames])
+        if hostname
+    ]
+    if not hostnames:
+        raise click.UsageError('No hostname given and none configured in server settings')
+    cache = host_facts.get_cache()
+    failed = False
+    for hostname in hostnames:
+        if (facts := cache.refresh(hostname)) is None:
+            click.echo(f'{hostname}: unable to probe facts', err=True)
+            failed = True
+        else:
+            click.echo(f'{hostname}: {json.dumps(facts)}')
+    click.echo(f'Host facts stored in {cache.cache_file}')
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
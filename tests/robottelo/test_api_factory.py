@@ -0,0 +1,64 @@
+"""Tests for concurrent setup steps of ``robottelo.host_helpers.api_factory``."""
+
+import threading
+from unittest import mock
+
+import pytest
+
+from robottelo.host_helpers.api_factory import APIFactory
+
+
+@pytest.fixture
+def api_factory():
+    return APIFactory(mock.Mock())
+
+
+def test_gather_keeps_order(api_factory):
+    """Results are returned in the order of the callables"""
+    assert api_factory.gather(lambda: 1, lambda: 2, lambda: 3) == [1, 2, 3]
+    assert len(api_factory.step_timings) == 3
+
+
+def test_gather_runs_concurrently(api_factory):
+    """Independent callables run at the same time"""
+    barrier = threading.Barrier(2, timeout=5)
+    assert sorted(api_factory.gather(barrier.wait, barrier.wait)) == [0, 1]
+
+
+def test_run_steps_passes_dependency_results(api_factory):
+    """Steps get the results of their dependencies as keyword arguments"""
+    results = api_factory.run_steps(
+        {
+            'org': (lambda: 'org', []),
+            'repo': (lambda org: f'{org}-repo', ['org']),
+            'cv': (lambda org, repo: f'{repo}-cv', ['org', 'repo']),
+        }
+    )
+    assert results == {'org': 'org', 'repo': 'org-repo', 'cv': 'org-repo-cv'}
+    assert set(api_factory.step_timings) == {'org', 'repo', 'cv'}
+
+
+def test_run_steps_stops_on_failure(api_factory):
+    """A failing step is re-raised and its dependents are not started"""
+    dependent = mock.Mock()
+
+    def fail():
+        raise RuntimeError('sync failed')
+
+    with pytest.raises(RuntimeError, match='sync failed'):
+        api_factory.run_steps({'sync': (fail, []), 'publish': (dependent, ['sync'])})
+    dependent.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ('steps', 'error'),
+    [
+        ({'a': (mock.Mock(), ['missing'])}, 'unknown steps'),
+        ({'a': (mock.Mock(), ['b']), 'b': (mock.Mock(), ['a'])}, 'cyclic dependencies'),
+    ],
+    ids=['unknown', 'cycle'],
+)
+def test_run_steps_invalid_graph(api_factory, steps, error):
+    """Unknown dependencies and cycles are rejected"""
+    with pytest.raises(ValueError, match=error):
+        api_factory.run_steps(steps)
@@ -4,6 +4,7 @@ from unittest import mock
 
 import pytest
 
+from robottelo.cli import response_cache
 from robottelo.cli.base import Base
 from robottelo.exceptions import (
     CLIBaseError,
@@ -189,6 +190,20 @@ class BaseCliTestCase(unittest.TestCase):
         execute.assert_called_once_with(construct.return_value, output_format='csv', timeout=None)
         info.assert_called_once_with({'id': 'foo'})
 
+    @mock.patch('robottelo.cli.base.Base.info')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    @mock.patch('robottelo.cli.base.Base._construct_command')
+    def test_add_create_with_create_output_fields(self, construct, execute, info):
+        """Check command create skips info when the output has the required fields"""
+        execute.return_value = [{'id': 'foo', 'name': 'bar', 'message': 'created'}]
+        Base.command_requires_org = False
+        with mock.patch.object(Base, 'create_output_fields', ('id', 'name')):
+            assert execute.return_value == Base.create()
+            assert not info.called
+        with mock.patch.object(Base, 'create_output_fields', ('id', 'label')):
+            Base.create()
+            info.assert_called_once_with({'id': 'foo'})
+
     @mock.patch('robottelo.cli.base.Base.info')
     @mock.patch('robottelo.cli.base.Base.execute')
     @mock.patch('robottelo.cli.base.Base._construct_command')
@@ -285,6 +300,48 @@ class BaseCliTestCase(unittest.TestCase):
         handle_resp.assert_called_once_with(command.return_value, ignore_stderr=None)
         assert response is handle_resp.return_value
 
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.hammer_shell.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_with_hammer_shell(self, settings, shell_command, command):
+        """Check execute runs through the resident hammer process when enabled"""
+        settings.robottelo.locale = 'en_US'
+        settings.performance.time_hammer = False
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        with mock.patch.object(Base, 'use_hammer_shell', True):
+            response = Base.execute('some_cmd', output_format='csv', return_raw_response=True)
+        shell_command.assert_called_once_with(
+            '-v -u admin -p password --output=csv some_cmd',
+            hostname=mock.ANY,
+            credentials=('admin', 'password'),
+            output_format='csv',
+            timeout=None,
+            locale='en_US',
+        )
+        command.assert_not_called()
+        assert response is shell_command.return_value
+
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.hammer_shell.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_hammer_shell_fallback(self, settings, shell_command, command):
+        """Check execute runs one-shot hammer when the resident process is unusable"""
+        settings.robottelo.locale = 'en_US'
+        settings.performance.time_hammer = False
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        shell_command.return_value = None
+        with mock.patch.object(Base, 'use_hammer_shell', True):
+            response = Base.execute('some_cmd', return_raw_response=True)
+        command.assert_called_once_with(
+            'LANG=en_US  hammer -v -u admin -p password  some_cmd',
+            hostname=mock.ANY,
+            output_format=None,
+            timeout=None,
+        )
+        assert response is command.return_value
+
     @mock.patch('robottelo.cli.base.Base.list')
     def test_exists_without_option_and_empty_return(self, lst_method):
         """Check exists method without options and empty return"""
@@ -361,6 +418,37 @@ class BaseCliTestCase(unittest.TestCase):
         )
         parse.assert_called_once_with('some_response')
 
+    @mock.patch('robottelo.cli.base.Base.iter_execute')
+    @mock.patch('robottelo.cli.base.Base._construct_command')
+    def test_iter_list_pages_lazily(self, construct, iter_execute):
+        """Check iter_list requests the next page only when the previous one was consumed"""
+        pages = [[{'id': '1'}, {'id': '2'}], [{'id': '3'}]]
+        iter_execute.side_effect = lambda *args, **kwargs: iter(pages.pop(0))
+        rows = Base.iter_list(options={'organization-id': 1}, per_page=2)
+        assert next(rows) == {'id': '1'}
+        assert iter_execute.call_count == 1
+        assert [row['id'] for row in rows] == ['2', '3']
+        assert iter_execute.call_count == 2
+        assert Base.command_sub == 'list'
+        assert [call.args[0] for call in construct.call_args_list] == [
+            {'organization-id': 1, 'per-page': 2, 'page': 1},
+            {'organization-id': 1, 'per-page': 2, 'page': 2},
+        ]
+
+    @mock.patch('robottelo.cli.base.Base._handle_response')
+    @mock.patch('robottelo.cli.base.ssh.stream_command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_iter_execute(self, settings, stream_command, handle_response):
+        """Check iter_execute parses the streamed output and verifies its status"""
+        settings.robottelo.locale = 'en_US'
+        stream_command.return_value = ['Id,Name\n1,', 'foo\n']
+        rows = CLIClass.iter_execute('host list', hostname='sat.example.com')
+        assert list(rows) == [{'id': '1', 'name': 'foo'}]
+        cmd = stream_command.call_args.args[0]
+        assert cmd.startswith('LANG=en_US hammer -v -u adminusername -p adminpassword')
+        assert cmd.endswith('--output=csv host list')
+        handle_response.assert_called_once_with(stream_command.return_value)
+
     @mock.patch('robottelo.cli.base.Base.execute')
     @mock.patch('robottelo.cli.base.Base._construct_command')
     def test_list_with_default_per_page(self, construct, execute):
@@ -453,6 +541,62 @@ class BaseCliTestCase(unittest.TestCase):
         )
 
 
+class CachedCLIClass(CLIClass):
+    """Class used for the response cache tests"""
+
+    command_base = 'host'
+    command_requires_org = False
+
+
+@mock.patch('robottelo.cli.base.settings')
+@mock.patch('robottelo.cli.base.ssh.command')
+class ResponseCacheTestCase(unittest.TestCase):
+    """Tests for the response cache of read subcommands"""
+
+    def setUp(self):
+        CachedCLIClass.response_cache = response_cache.ResponseCache('sat.example.com', 60)
+        self.addCleanup(setattr, CachedCLIClass, 'response_cache', None)
+
+    def test_info_is_cached(self, command, settings):
+        """Check repeated info calls only run hammer once and return copies"""
+        settings.performance.time_hammer = False
+        command.return_value = mock.Mock(status=0, stdout='Id: 1\nName: host1', stderr='')
+        first = CachedCLIClass.info({'id': 1})
+        first['name'] = 'changed'
+        assert CachedCLIClass.info({'id': 1}) == {'id': '1', 'name': 'host1'}
+        assert command.call_count == 1
+        CachedCLIClass.info({'id': 2})
+        assert command.call_count == 2
+        assert CachedCLIClass.response_cache.stats['hits'] == 1
+
+    def test_write_invalidates(self, command, settings):
+        """Check any other subcommand of the same entity invalidates the cache"""
+        settings.performance.time_hammer = False
+        command.return_value = mock.Mock(status=0, stdout=[{'id': '1'}], stderr='')
+        CachedCLIClass.list({'search': 'name=host1'})
+        CachedCLIClass.update({'id': 1, 'new-name': 'host2'})
+        CachedCLIClass.list({'search': 'name=host1'})
+        assert command.call_count == 3
+        assert CachedCLIClass.response_cache.stats['invalidations'] == 1
+
+    def test_bypass(self, command, settings):
+        """Check reads inside the bypass context manager always run hammer"""
+        settings.performance.time_hammer = False
+        command.return_value = mock.Mock(status=0, stdout='Id: 1', stderr='')
+        CachedCLIClass.info({'id': 1})
+        with response_cache.bypass():
+            CachedCLIClass.info({'id': 1})
+        CachedCLIClass.info({'id': 1})
+        assert command.call_count == 2
+
+    def test_key_ignores_options_order(self, command, settings):
+        """Check options order and None values do not change the cache key"""
+        cache = CachedCLIClass.response_cache
+        assert cache.key('list', {'a': 1, 'b': [1, 2], 'c': None}) == cache.key(
+            'list', {'b': [1, 2], 'a': '1'}
+        )
+
+
 class CLIErrorTests(unittest.TestCase):
     """Tests for the CLIError cli class"""
 
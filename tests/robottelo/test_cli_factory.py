@@ -0,0 +1,88 @@
+"""Tests for bulk creations of ``robottelo.host_helpers.cli_factory``."""
+
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from robottelo.cli.base import Base
+from robottelo.cli.location import Location
+from robottelo.cli.org import Org
+from robottelo.exceptions import CLIFactoryError
+from robottelo.host_helpers import cli_factory
+from robottelo.host_helpers.cli_factory import CLIFactory
+
+
+class FakeCLI:
+    """The cli namespace of a Satellite"""
+
+    Location = Location
+    Org = Org
+
+
+@pytest.fixture
+def factory():
+    with mock.patch.object(cli_factory, 'initiate_repo_helpers', return_value={}):
+        return CLIFactory(mock.Mock(cli=FakeCLI))
+
+
+def fake_create_object(cli_object, options, values=None, credentials=None, timeout=None):
+    # the first entities take the longest to be created
+    time.sleep(0.01 * (5 - int(values['name'])))
+    return {**options, **values, 'cli': cli_object}
+
+
+def test_make_bulk_keeps_order(factory):
+    with mock.patch.object(cli_factory, 'create_object', side_effect=fake_create_object):
+        orgs = factory.make_org_bulk(5, [{'name': str(index)} for index in range(5)])
+    assert [org['name'] for org in orgs] == ['0', '1', '2', '3', '4']
+    # every creation gets its own cli class
+    assert issubclass(orgs[0]['cli'], Org)
+    assert orgs[0]['cli'] is not orgs[1]['cli']
+
+
+def test_make_bulk_options_count(factory):
+    with pytest.raises(CLIFactoryError, match='Expected 3 options, got 2'):
+        factory.make_bulk('org', 3, [{}, {}])
+
+
+def test_make_bulk_max_workers(factory):
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def create_object(cli_object, options, values=None, credentials=None, timeout=None):
+        with lock:
+            running.append(values['name'])
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(values['name'])
+        return values
+
+    with mock.patch.object(cli_factory, 'create_object', side_effect=create_object):
+        locations = factory.make_bulk(
+            'location', 6, [{'name': str(index)} for index in range(6)], max_workers=2
+        )
+    assert len(locations) == 6
+    assert max(peak) == 2
+
+
+def test_make_bulk_unknown_entity(factory):
+    with pytest.raises(CLIFactoryError, match='Unknown entity unknown'):
+        factory.make_bulk('unknown', 2)
+    with pytest.raises(AttributeError):
+        factory.make_unknown_bulk(2)
+
+
+@pytest.mark.parametrize(('fields', 'info_calls'), [(('id', 'name'), 0), (None, 1)])
+def test_make_bulk_skips_info(factory, fields, info_calls):
+    location = {'id': '1', 'name': 'location'}
+    with (
+        mock.patch.object(Base, 'execute', return_value=[location]),
+        mock.patch.object(Base, 'info', return_value={**location, 'title': 'location'}) as info,
+    ):
+        locations = factory.make_bulk('location', 1, {'name': 'location'}, fields=fields)
+    assert locations[0]['name'] == 'location'
+    assert info.call_count == info_calls
@@ -0,0 +1,75 @@
+import pytest
+
+from robottelo.utils.durations import (
+    DEFAULT_DURATION,
+    DurationEstimates,
+    DurationStore,
+    percentile,
+)
+
+
+class TestDurationEstimates:
+    def test_default(self):
+        assert DurationEstimates().estimate('tests/test_a.py::test_a') == DEFAULT_DURATION
+
+    def test_moving_average(self):
+        estimates = DurationEstimates()
+        estimates.update({'tests/test_a.py::test_a': 10, 'tests/test_a.py::test_b': 2})
+        estimates.update({'tests/test_a.py::test_a': 20})
+        assert estimates.estimate('tests/test_a.py::test_a') == 15
+        assert estimates.estimate('tests/test_a.py::test_b') == 2
+        # unknown tests get the median of the known ones
+        assert estimates.estimate('tests/test_a.py::test_c') == 8.5
+
+
+class TestDurationStore:
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = DurationStore(tmp_path / 'durations.db')
+        for index, slow in enumerate([10, 11, 9, 30]):
+            store.record(
+                f'run{index}',
+                started_at=index,
+                phases=[
+                    ('tests/test_a.py::test_slow', 'setup', 1, 'passed', 'gw0', 'sat'),
+                    ('tests/test_a.py::test_slow', 'call', slow - 1, 'passed', 'gw0', 'sat'),
+                    ('tests/test_a.py::test_fast', 'call', 1 + index, 'passed', 'gw1', 'sat'),
+                ],
+                fixtures=[('tests/test_a.py', 'module_org', 'module', 2, 'gw0', 'sat')],
+            )
+        return store
+
+    def test_record(self, store):
+        assert store.runs(2) == [('run3', 3), ('run2', 2)]
+        # the workers of a run record in the same run
+        store.record('run3', started_at=4, fixtures=[('tests', 'module_org', 'module', 1, '', '')])
+        assert store.runs(1) == [('run3', 3)]
+        assert store.test_durations('run3') == {
+            'tests/test_a.py::test_slow': 30,
+            'tests/test_a.py::test_fast': 4,
+        }
+        assert store.fixture_durations('run3') == {'module_org': 3}
+
+    def test_estimates(self, store):
+        estimates = store.estimates(runs=2)
+        # the moving average of run2 then run3
+        assert estimates.estimate('tests/test_a.py::test_slow') == 19.5
+        assert estimates.estimate('tests/test_a.py::test_fast') == 3.5
+        assert DurationStore(store.db_file.with_name('empty.db')).estimates().durations == {}
+
+    def test_trends(self, store):
+        assert store.trends(2) == [('run3', 3, 2, 4, 30), ('run2', 2, 2, 3, 9)]
+
+    def test_regressions(self, store):
+        # test_fast is twice slower but under the minimum delta
+        assert store.regressions(previous=3, min_delta=2) == [
+            ('tests/test_a.py::test_slow', 10, 30)
+        ]
+        assert store.regressions(previous=3, threshold=4) == []
+        assert DurationStore(store.db_file.with_name('empty.db')).regressions() == []
+
+
+def test_percentile():
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile(range(1, 101), 95) == 95
+    assert percentile([5], 95) == 5
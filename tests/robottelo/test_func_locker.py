@@ -420,3 +420,72 @@ class TestFuncLocker:
             func_locker.locking_function(simple_function_not_locked),
         ):
             pass
+
+
+@func_locker.lock_function
+def simple_rw_locked_function():
+    """A function locked by readers and writers"""
+
+
+def hold_shared_lock(duration):
+    """Hold the shared lock and return the times it was held"""
+    with func_locker.locking_function(simple_rw_locked_function, shared=True):
+        start = time.monotonic()
+        time.sleep(duration)
+        return start, time.monotonic()
+
+
+def hold_exclusive_lock(acquired, release):
+    """Hold the exclusive lock until release is set"""
+    with func_locker.locking_function(simple_rw_locked_function):
+        acquired.set()
+        release.wait(10)
+
+
+class TestFuncLockerSharedLocks:
+    def test_shared_lock_holders_run_together(self):
+        with multiprocessing.Pool(2) as pool:
+            results = pool.map(hold_shared_lock, [0.5, 0.5])
+        (start_1, end_1), (start_2, end_2) = results
+        assert start_1 < end_2
+        assert start_2 < end_1
+
+    def test_exclusive_lock_excludes_shared_holders(self):
+        acquired, release = multiprocessing.Event(), multiprocessing.Event()
+        process = multiprocessing.Process(target=hold_exclusive_lock, args=(acquired, release))
+        process.start()
+        try:
+            assert acquired.wait(10)
+            with (
+                pytest.raises(func_locker.FunctionLockerTimeout, match=str(process.pid)),
+                func_locker.locking_function(simple_rw_locked_function, shared=True, timeout=0),
+            ):
+                pass
+        finally:
+            release.set()
+            process.join()
+        with func_locker.locking_function(simple_rw_locked_function, shared=True, timeout=0):
+            pass
+
+    def test_recursive_shared_lock(self):
+        with (
+            pytest.raises(func_locker.FunctionLockerError, match=r'.*recursion detected.*'),
+            func_locker.locking_function(simple_rw_locked_function, shared=True),
+            func_locker.locking_function(simple_rw_locked_function, shared=True),
+        ):
+            pass
+
+    def test_lock_metrics(self):
+        lock_name = f'{_this_module_name_string}.simple_rw_locked_function (shared)'
+        metrics = func_locker.get_lock_metrics()
+        count = metrics[lock_name]['hold']['count'] if lock_name in metrics else 0
+        hold_shared_lock(0.02)
+        entry = func_locker.get_lock_metrics()[lock_name]
+        assert entry['hold']['count'] == count + 1
+        assert entry['hold']['max'] >= 0.02
+        assert sum(entry['wait']['buckets']) == entry['wait']['count']
+
+        merged = func_locker.merge_lock_metrics({}, {lock_name: entry})
+        merged = func_locker.merge_lock_metrics(merged, {lock_name: entry})
+        assert merged[lock_name]['hold']['count'] == 2 * entry['hold']['count']
+        assert merged[lock_name]['hold']['max'] == entry['hold']['max']
@@ -12,12 +12,15 @@ from robottelo.utils.decorators.func_shared.file_storage import (
 )
 from robottelo.utils.decorators.func_shared.shared import (
     _NAMESPACE_SCOPE_KEY_TYPE,
+    DEFAULT_STORAGE_HANDLER,
     SharedFunctionException,
     _set_configured,
+    _storage_handlers,
     enable_shared_function,
     set_default_scope,
     shared,
 )
+from robottelo.utils.decorators.func_shared.sqlite_storage import SQLiteStorageHandler
 
 DEFAULT_POOL_SIZE = 8
 SIMPLE_TIMEOUT_VALUE = 3
@@ -554,3 +557,97 @@ class TestFuncShared:
                 suffix=suffix, prefix=prefix, counter=counter_value
             )
             assert inc_string == inc_string_2
+
+
+@shared
+def sqlite_shared_counter_increment_process(index=1):
+    """a simple shared function each time called increment index by a new
+    generated value"""
+    return {'index': index + gen_integer(min_value=1, max_value=100)}
+
+
+def hold_sqlite_lock(db_path, key, acquired, release):
+    """Hold the lock of key until release is set"""
+    with SQLiteStorageHandler(db_path=db_path).lock(key):
+        acquired.set()
+        release.wait(10)
+
+
+def die_holding_sqlite_lock(db_path, key):
+    """Exit without releasing the lock of key"""
+    with SQLiteStorageHandler(db_path=db_path).lock(key):
+        os._exit(0)
+
+
+class TestSQLiteStorageHandler:
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / 'shared_functions.db')
+
+    @pytest.fixture
+    def handler(self, db_path):
+        return SQLiteStorageHandler(db_path=db_path, lock_timeout=0.2)
+
+    def test_get_set(self, handler):
+        assert handler.get('key') is None
+        handler.set('key', {'id': 'a', 'result': 1})
+        assert handler.get('key') == {'id': 'a', 'result': 1}
+
+    def test_expired_values_are_evicted(self, db_path):
+        handler = SQLiteStorageHandler(db_path=db_path, ttl=0)
+        handler.set('key', {'id': 'a'})
+        assert handler.get('key') is None
+        assert handler.evict_expired() == 1
+
+    def test_compare_and_set(self, handler):
+        assert handler.compare_and_set('key', None, {'id': 'a'})
+        # an other transaction wrote the value in between
+        assert not handler.compare_and_set('key', None, {'id': 'b'})
+        assert not handler.compare_and_set('key', 'b', {'id': 'b'})
+        assert handler.compare_and_set('key', 'a', {'id': 'b'})
+        assert handler.get('key') == {'id': 'b'}
+
+    def test_compare_and_set_expired(self, db_path):
+        handler = SQLiteStorageHandler(db_path=db_path, ttl=0)
+        handler.set('key', {'id': 'a'})
+        # the value expired while the function ran, or before it was read
+        assert handler.compare_and_set('key', 'a', {'id': 'b'})
+        assert handler.compare_and_set('key', None, {'id': 'c'})
+        assert not handler.compare_and_set('key', 'a', {'id': 'd'})
+
+    def test_lock_is_exclusive_between_processes(self, handler, db_path):
+        acquired, release = multiprocessing.Event(), multiprocessing.Event()
+        process = multiprocessing.Process(
+            target=hold_sqlite_lock, args=(db_path, 'key', acquired, release)
+        )
+        process.start()
+        try:
+            assert acquired.wait(10)
+            with pytest.raises(TimeoutError), handler.lock('key'):
+                pass
+            # the locks are per key
+            with handler.lock('other_key'):
+                pass
+        finally:
+            release.set()
+            process.join()
+        with handler.lock('key'):
+            pass
+
+    def test_lock_of_dead_process_is_released(self, handler, db_path):
+        process = multiprocessing.Process(target=die_holding_sqlite_lock, args=(db_path, 'key'))
+        process.start()
+        process.join()
+        with handler.lock('key'):
+            pass
+
+    def test_shared_counter_multiprocess(self, monkeypatch):
+        """The counter should never change when calling second time, even in
+        multiprocess calls"""
+        monkeypatch.setitem(_storage_handlers, DEFAULT_STORAGE_HANDLER, SQLiteStorageHandler)
+        set_default_scope(gen_string('alpha', 10))
+        enable_shared_function(True)
+        args = [gen_integer(min_value=1, max_value=10000) for _ in range(DEFAULT_POOL_SIZE)]
+        with multiprocessing.Pool(DEFAULT_POOL_SIZE) as pool:
+            results = pool.map(sqlite_shared_counter_increment_process, args)
+        assert len({result['index'] for result in results}) == 1
@@ -1,6 +1,13 @@
 """Tests for Robottelo's hammer helpers"""
 
-from robottelo.cli import hammer
+import json
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from robottelo.cli import hammer, hammer_shell
+from robottelo.exceptions import HammerShellError, HammerShellRequestError
 
 
 class TestParseCSV:
@@ -23,6 +30,22 @@ class TestParseCSV:
             {'header': 'unicode', 'header-2': 'chårs'},
         ]
 
+    def test_iter_csv_chunks(self):
+        """Rows are parsed the same way whatever the chunks are split on"""
+        output = 'Id,Some Name\n1,"multi\nline"\n2,chårs\n'
+        expected = hammer.parse_csv(output)
+        assert expected == [
+            {'id': '1', 'some-name': 'multi\nline'},
+            {'id': '2', 'some-name': 'chårs'},
+        ]
+        for size in range(1, len(output)):
+            chunks = [output[i : i + size] for i in range(0, len(output), size)]
+            assert list(hammer.iter_csv(chunks)) == expected
+
+    def test_iter_csv_empty(self):
+        assert list(hammer.iter_csv([])) == []
+        assert list(hammer.iter_csv(['Id,Name\n'])) == []
+
 
 class TestParseJSON:
     """Tests for parsing JSON hammer output"""
@@ -295,9 +318,18 @@ class TestParseHelp:
         }
 
 
+HAMMER_INFO_CORPUS = sorted((Path(__file__).parent / 'data' / 'hammer_info').glob('*.txt'))
+
+
 class TestParseInfo:
     """Tests for parsing info hammer output"""
 
+    @pytest.mark.parametrize('path', HAMMER_INFO_CORPUS, ids=[p.stem for p in HAMMER_INFO_CORPUS])
+    def test_parse_corpus(self, path):
+        """Can parse the benchmark corpus to the expected structure"""
+        expected = json.loads(path.with_suffix('.json').read_text())
+        assert hammer.parse_info(path.read_text()) == expected
+
     def test_parse_simple(self):
         """Can parse a simple info output"""
         output = '\n'.join(
@@ -540,3 +572,180 @@ class TestParseInfo:
     def test_parse_json_list(self):
         """Can parse a list in json"""
         assert hammer.parse_json('["item1", "item2"]') == ['item1', 'item2']
+
+    def test_iter_json_chunks(self):
+        """Items are parsed the same way whatever the chunks are split on"""
+        output = json.dumps(
+            [{'ID': 1, 'Some Name': {'Nested Key': [1, True, None]}}, 'item', 12345], indent=2
+        )
+        expected = hammer.parse_json(output)
+        assert expected == [
+            {'id': '1', 'some-name': {'nested-key': ['1', True, None]}},
+            'item',
+            '12345',
+        ]
+        for size in range(1, len(output)):
+            chunks = [output[i : i + size] for i in range(0, len(output), size)]
+            assert list(hammer.iter_json(chunks)) == expected
+
+    def test_iter_json_empty(self):
+        assert list(hammer.iter_json([])) == []
+        assert list(hammer.iter_json(['[', ' ]'])) == []
+
+    def test_iter_json_truncated(self):
+        with pytest.raises(json.JSONDecodeError):
+            list(hammer.iter_json(['[{"id": 1}, {"id"']))
+
+
+class FakeShellChannel:
+    """A fake interactive shell answering hammer shell requests"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(data)
+
+    def read(self, size):
+        data = self.responses.pop(0).encode() if self.responses else b''
+        return len(data), data
+
+
+class TestHammerShell:
+    """Tests for the resident hammer process protocol"""
+
+    def _shell(self, responses):
+        shell = hammer_shell.HammerShell(client=mock.Mock(hostname='example.com'))
+        shell._shell = FakeShellChannel(responses)
+        return shell
+
+    def test_split_arguments(self):
+        """Arguments are split like the remote shell would split them"""
+        assert hammer_shell.split_arguments(
+            '-v -u admin --output=csv host list --search="name=\\"a b\\""'
+        ) == ['-v', '-u', 'admin', '--output=csv', 'host', 'list', '--search=name="a b"']
+        assert hammer_shell.split_arguments('--name="a;b"') == ['--name=a;b']
+
+    def test_split_arguments_shell_features(self):
+        """Arguments relying on shell features are not split"""
+        assert hammer_shell.split_arguments('host list | grep foo') is None
+        assert hammer_shell.split_arguments('host list > /tmp/out') is None
+        assert hammer_shell.split_arguments('host list --name="$(hostname)"') is None
+
+    def test_run(self):
+        """Response lines are matched to the request, noise is ignored"""
+        marker = hammer_shell.RESPONSE_MARKER
+        shell = self._shell(
+            [
+                'noise\n' + marker + ' {"id": 1, "status": 65, ',
+                '"stdout": "", "stderr": "Error"}\n',
+            ]
+        )
+        result = shell.run(['host', 'info'])
+        assert json.loads(shell._shell.sent[0]) == {'id': 1, 'argv': ['host', 'info']}
+        assert result.status == 65
+        assert result.stderr == 'Error'
+
+    def test_run_protocol_error(self):
+        """Unexpected or missing responses raise HammerShellRequestError"""
+        marker = hammer_shell.RESPONSE_MARKER
+        shell = self._shell([marker + ' {"id": 7, "status": 0, "stdout": "", "stderr": ""}\n'])
+        with pytest.raises(HammerShellRequestError):
+            shell.run(['host', 'list'])
+        with pytest.raises(HammerShellRequestError):
+            shell.run(['host', 'list'])
+
+    def test_run_split_characters(self):
+        """Multibyte characters split across reads are decoded"""
+        response = (
+            hammer_shell.RESPONSE_MARKER.encode()
+            + json.dumps(
+                {'id': 1, 'status': 0, 'stdout': 'Organizácia', 'stderr': ''}, ensure_ascii=False
+            ).encode()
+            + b'\n'
+        )
+        split = response.index('á'.encode()) + 1
+        shell = self._shell([])
+        shell._shell.read = mock.Mock(
+            side_effect=[(split, response[:split]), (len(response) - split, response[split:])]
+        )
+        assert shell.run(['organization', 'list']).stdout == 'Organizácia'
+
+    def test_command_fallback(self):
+        """Commands fall back to one-shot hammer only when they were not sent"""
+        shell = self._shell([])
+        with mock.patch.object(hammer_shell, 'get_shell', return_value=shell):
+            # the shell closed its output after the command was sent, it may have run
+            with pytest.raises(HammerShellRequestError):
+                hammer_shell.command('repository synchronize --id 1', 'example.com', ('admin', 'a'))
+            assert shell._shell is None
+            assert (
+                hammer_shell.command('repository synchronize --id 1', 'example.com', ('admin', 'a'))
+                is None
+            )
+
+    def test_run_restores_timeout(self):
+        """The timeout of the pooled ssh session is restored after the command"""
+        marker = hammer_shell.RESPONSE_MARKER
+        shell = self._shell([marker + ' {"id": 1, "status": 0, "stdout": "", "stderr": ""}\n'])
+        session = shell.client.session.session
+        session.get_timeout.return_value = 0
+        shell.run(['host', 'list'], timeout='1m')
+        assert session.set_timeout.call_args_list == [mock.call(60000), mock.call(0)]
+
+
+class TestGetShell:
+    """Tests for the resident hammer processes shared by the commands of a thread"""
+
+    @pytest.fixture(autouse=True)
+    def shells(self):
+        with (
+            mock.patch.object(hammer_shell, '_shells', {}),
+            mock.patch.object(hammer_shell, '_unsupported', {}),
+            mock.patch.object(hammer_shell.ssh, 'get_client'),
+            mock.patch.object(hammer_shell.HammerShell, 'start', autospec=True) as start,
+        ):
+            start.side_effect = lambda shell: setattr(shell, '_shell', mock.Mock())
+            yield start
+
+    def test_per_credentials(self, shells):
+        """Commands of different users never share a resident process"""
+        with mock.patch.object(
+            hammer_shell.HammerShell,
+            'run',
+            autospec=True,
+            side_effect=lambda shell, argv, **kw: shell,
+        ):
+            admin = hammer_shell.command('-u admin -p a host list', 'example.com', ('admin', 'a'))
+            viewer = hammer_shell.command(
+                '-u viewer -p v host list', 'example.com', ('viewer', 'v')
+            )
+            again = hammer_shell.command('-u admin -p a host list', 'example.com', ('admin', 'a'))
+        assert admin is not viewer
+        assert admin is again
+        assert shells.call_count == 2
+
+    def test_omitted_credentials(self, shells):
+        """Commands omitting credentials are run by one-shot hammer"""
+        assert hammer_shell.command('--interactive no host list', 'example.com') is None
+        shells.assert_not_called()
+
+    def test_least_recently_used_stopped(self):
+        """A thread keeps at most MAX_SHELLS resident processes"""
+        first = hammer_shell.get_shell('example.com', ('user0', 'password'))
+        for index in range(1, hammer_shell.MAX_SHELLS + 1):
+            hammer_shell.get_shell('example.com', ('user1', 'password'))
+            hammer_shell.get_shell('example.com', (f'user{index}', 'password'))
+        assert not first.running
+        assert len(hammer_shell._shells) == hammer_shell.MAX_SHELLS
+
+    def test_unsupported_retried(self, shells):
+        """Starting a resident process is tried again once UNSUPPORTED_RETRY passed"""
+        shells.side_effect = HammerShellError('no hammer')
+        assert hammer_shell.get_shell('example.com', ('admin', 'a')) is None
+        assert hammer_shell.get_shell('example.com', ('admin', 'a')) is None
+        assert shells.call_count == 1
+        hammer_shell._unsupported['example.com'] -= hammer_shell.UNSUPPORTED_RETRY
+        assert hammer_shell.get_shell('example.com', ('admin', 'a')) is None
+        assert shells.call_count == 2
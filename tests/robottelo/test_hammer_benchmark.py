@@ -0,0 +1,56 @@
+"""Benchmarks for Robottelo's hammer output parsers
+
+Run with ``pytest tests/robottelo/test_hammer_benchmark.py``. To guard against
+regressions, save a baseline with ``--benchmark-autosave`` and compare later
+runs against it with ``--benchmark-compare --benchmark-compare-fail=mean:20%``.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from robottelo.cli import hammer
+
+pytest.importorskip('pytest_benchmark')
+
+CORPUS = sorted((Path(__file__).parent / 'data' / 'hammer_info').glob('*.txt'))
+
+
+def _collection_info(size):
+    """Info output with a long collection below a group with many properties"""
+    return '\n'.join(
+        ['Subscription Information:']
+        + [f'    Property {i}: {i}' for i in range(size)]
+        + ['    Registered by Activation Keys:']
+        + [f'     {i}) ak{i}' for i in range(1, size + 1)]
+    )
+
+
+@pytest.mark.benchmark(group='parse_info')
+@pytest.mark.parametrize('path', CORPUS, ids=[path.stem for path in CORPUS])
+def test_parse_info(benchmark, path):
+    output = path.read_text()
+    assert benchmark(hammer.parse_info, output)
+
+
+@pytest.mark.benchmark(group='parse_info')
+def test_parse_info_long_collection(benchmark):
+    output = _collection_info(4000)
+    assert len(benchmark(hammer.parse_info, output)['subscription-information']) == 4001
+
+
+@pytest.mark.benchmark(group='parse_csv')
+def test_parse_csv(benchmark):
+    output = 'Id,Name,Description\n' + ''.join(
+        f'{i},package-{i},"Package, number {i}"\n' for i in range(10000)
+    )
+    assert len(benchmark(hammer.parse_csv, output)) == 10000
+
+
+@pytest.mark.benchmark(group='parse_json')
+def test_parse_json(benchmark):
+    output = json.dumps(
+        [{'Id': i, 'Name': f'package-{i}', 'Content View': {'Id': 1}} for i in range(10000)]
+    )
+    assert len(benchmark(hammer.parse_json, output)) == 10000
@@ -0,0 +1,254 @@
+"""Tests for ``robottelo.utils.host_facts``."""
+
+import json
+from unittest import mock
+
+import pytest
+
+from robottelo.utils import host_facts
+from robottelo.utils.host_facts import HostFactsCache, offline, parse_probe
+
+OS_RELEASE = '''\
+NAME="Red Hat Enterprise Linux"
+VERSION="9.4 (Plow)"
+ID="rhel"
+# comment
+VERSION_ID="9.4"
+'''
+
+FACTS = {
+    'version': '6.16.0',
+    'release': '1.el9sat',
+    'rhel_version': '9.4',
+    'os_id': 'rhel',
+    'capabilities': {'is_upstream': False, 'is_stream': False},
+}
+
+
+def probe_output(packages):
+    return f'{packages}\n{host_facts.OS_RELEASE_MARKER}\n{OS_RELEASE}'
+
+
+class TestParseProbe:
+    def test_downstream(self):
+        output = probe_output('satellite 6.16.0 1.el9sat\nforeman 3.12.0 1.el9sat')
+        assert parse_probe(output, 'satellite', 'foreman') == FACTS
+
+    def test_stream(self):
+        output = probe_output('satellite 6.17.0 0.1.stream.el9sat\nforeman 3.13.0 1.el9')
+        facts = parse_probe(output, 'satellite', 'foreman')
+        assert facts['capabilities'] == {'is_upstream': False, 'is_stream': True}
+
+    def test_upstream(self):
+        output = probe_output('package satellite is not installed\nforeman 3.13.0 1.el9')
+        facts = parse_probe(output, 'satellite', 'foreman')
+        assert facts['version'] == '3.13.0'
+        assert facts['capabilities'] == {'is_upstream': True, 'is_stream': False}
+
+    def test_nothing_installed(self):
+        output = probe_output(
+            'package satellite is not installed\npackage foreman is not installed'
+        )
+        facts = parse_probe(output, 'satellite', 'foreman')
+        assert facts['version'] is None
+        assert facts['rhel_version'] == '9.4'
+
+
+@pytest.fixture
+def probe():
+    return mock.Mock(return_value=FACTS)
+
+
+@pytest.fixture
+def cache(tmp_path, probe):
+    return HostFactsCache(tmp_path / 'host_facts.json', ttl=60, probe=probe)
+
+
+class TestHostFactsCache:
+    def test_probed_once(self, cache, probe):
+        assert cache.get('sat.example.com') == FACTS
+        assert cache.get('sat.example.com') == FACTS
+        probe.assert_called_once_with('sat.example.com')
+
+    def test_shared_through_file(self, cache, probe, tmp_path):
+        cache.get('sat.example.com')
+        other = HostFactsCache(cache.cache_file, ttl=60, probe=probe)
+        assert other.get('sat.example.com') == FACTS
+        assert probe.call_count == 1
+        stored = json.loads(cache.cache_file.read_text())
+        assert stored['hosts']['sat.example.com']['facts'] == FACTS
+
+    def test_expired_facts_are_probed_again(self, cache, probe):
+        cache.get('sat.example.com')
+        other = HostFactsCache(cache.cache_file, ttl=0, probe=probe)
+        other.get('sat.example.com')
+        assert probe.call_count == 2
+
+    def test_offline_never_probes(self, cache, probe):
+        with offline():
+            assert cache.get('sat.example.com') is None
+        probe.assert_not_called()
+        # facts already known are still used
+        cache.get('sat.example.com')
+        with offline():
+            assert cache.get('sat.example.com') == FACTS
+
+    def test_failed_probe_is_not_retried(self, cache, probe):
+        probe.side_effect = ConnectionError('refused')
+        assert cache.get('sat.example.com') is None
+        assert cache.get('sat.example.com') is None
+        probe.assert_called_once()
+        probe.side_effect = None
+        assert cache.refresh('sat.example.com') == FACTS
+
+    def test_unreadable_file_is_ignored(self, cache, probe):
+        cache.cache_file.write_text('{')
+        assert cache.get('sat.example.com') == FACTS
+        assert json.loads(cache.cache_file.read_text())['version'] == host_facts.FACTS_VERSION
+
+    def test_no_hostname(self, cache, probe):
+        assert cache.get(None) is None
+        probe.assert_not_called()
+
+
+def probe_sections(sections, outputs):
+    """Build the output of a content host probe, commands succeed by default"""
+    sections = {**sections, **outputs}
+    return ''.join(
+        f'{output}\n{host_facts.CONTENT_HOST_MARKER} {name} {status}\n'
+        for name, (output, status) in sections.items()
+    )
+
+
+def content_host_output(**outputs):
+    sections = {
+        'os_release': (OS_RELEASE, 0),
+        'redhat_release': ('Red Hat Enterprise Linux release 9.4 (Plow)\n', 0),
+        'ip_addresses': ('192.0.2.2 2001:db8::2 \n', 0),
+        'arch': ('x86_64\n', 0),
+    }
+    return probe_sections(sections, outputs)
+
+
+def subscription_output(**outputs):
+    sections = {
+        'identity': ('system identity: 1234\nname: host.example.com\norg name: Org\n', 0),
+        'status': ('Overall Status: Registered\n', 0),
+        'rhsm_conf': ('[server]\nhostname = sat.example.com\n', 0),
+    }
+    return probe_sections(sections, outputs)
+
+
+class TestParseContentHostProbe:
+    def test_el(self):
+        facts = host_facts.parse_content_host_probe(content_host_output())
+        assert facts.os_release['VERSION_ID'] == '9.4'
+        assert facts.redhat_release.startswith('Red Hat Enterprise Linux release 9.4')
+        assert facts.ip_addresses == ['192.0.2.2', '2001:db8::2']
+        assert facts.arch == 'x86_64'
+
+    def test_non_el(self):
+        facts = host_facts.parse_content_host_probe(content_host_output(redhat_release=('', 1)))
+        assert facts.redhat_release is None
+
+    def test_missing_os_release(self):
+        facts = host_facts.parse_content_host_probe(content_host_output(os_release=('', 1)))
+        assert facts.os_release is None
+
+    def test_truncated_output(self):
+        with pytest.raises(RuntimeError):
+            host_facts.parse_content_host_probe(content_host_output().split('ip_addresses')[0])
+
+    def test_probe_content_host(self):
+        host = mock.Mock()
+        host.execute.return_value.stdout = content_host_output()
+        assert host_facts.probe_content_host(host).arch == 'x86_64'
+        host.execute.assert_called_once_with(host_facts.CONTENT_HOST_PROBE_COMMAND)
+        assert 'subscription-manager' not in host_facts.CONTENT_HOST_PROBE_COMMAND
+
+
+class TestParseSubscriptionProbe:
+    def test_registered(self):
+        facts = host_facts.parse_subscription_probe(subscription_output())
+        assert facts.identity == {
+            'system_identity': '1234',
+            'name': 'host.example.com',
+            'org_name': 'Org',
+        }
+        assert facts.subscribed
+        assert 'sat.example.com' in facts.rhsm_conf
+
+    def test_unregistered(self):
+        facts = host_facts.parse_subscription_probe(
+            subscription_output(
+                identity=('', 1),
+                status=('Overall Status: Unknown\nStatus: Unknown\n', 1),
+            )
+        )
+        assert facts.identity == {}
+        assert not facts.subscribed
+
+    def test_truncated_output(self):
+        with pytest.raises(RuntimeError):
+            host_facts.parse_subscription_probe(subscription_output().split('rhsm_conf')[0])
+
+
+class TestContentHostFacts:
+    @pytest.fixture
+    def host(self):
+        from robottelo.hosts import ContentHost
+
+        host = ContentHost.__new__(ContentHost)
+        outputs = {
+            host_facts.CONTENT_HOST_PROBE_COMMAND: content_host_output(),
+            host_facts.SUBSCRIPTION_PROBE_COMMAND: subscription_output(),
+        }
+        host.execute = mock.Mock(
+            side_effect=lambda command, timeout=None: mock.Mock(
+                status=0, stdout=outputs.get(command, '')
+            )
+        )
+        return host
+
+    def commands(self, host):
+        return [call.args[0] for call in host.execute.call_args_list]
+
+    def test_ip_addr_skips_subscription_manager(self, host):
+        assert host.ip_addr == '192.0.2.2'
+        assert host.arch == 'x86_64'
+        assert host.os_version.major == 9
+        assert self.commands(host) == [host_facts.CONTENT_HOST_PROBE_COMMAND]
+
+    def test_snapshot_kept_across_commands(self, host):
+        assert host.subscribed
+        host.execute('yum -y install foo')
+        assert host.identity['registered_to'] == 'sat.example.com'
+        assert host.ip_addr == '192.0.2.2'
+        assert self.commands(host) == [
+            host_facts.SUBSCRIPTION_PROBE_COMMAND,
+            'yum -y install foo',
+            host_facts.CONTENT_HOST_PROBE_COMMAND,
+        ]
+
+    @pytest.mark.parametrize('helper', ['unregister', 'reset_rhsm'])
+    def test_snapshot_dropped_by_helpers(self, host, helper):
+        assert host.subscribed
+        getattr(host, helper)()
+        assert host.subscribed
+        assert self.commands(host).count(host_facts.SUBSCRIPTION_PROBE_COMMAND) == 2
+
+
+@pytest.mark.parametrize('facts', [FACTS, None], ids=['facts', 'no_facts'])
+def test_satellite_uses_facts(facts):
+    from robottelo.hosts import Satellite
+
+    satellite = Satellite.__new__(Satellite)
+    satellite.hostname = 'satellite.example.com'
+    satellite.execute = mock.Mock(return_value=mock.Mock(status=0, stdout='6.15.0'))
+    with mock.patch.object(host_facts, 'get_facts', return_value=facts) as get_facts:
+        assert satellite.version == ('6.16.0' if facts else '6.15.0')
+        assert not satellite.is_upstream
+        assert not satellite.is_stream
+    get_facts.assert_called_with('satellite.example.com')
+    # the ssh commands are only run when no facts are available
+    assert satellite.execute.called is (facts is None)
@@ -0,0 +1,63 @@
+"""Tests for ``robottelo.hosts.HostGroup``."""
+
+import threading
+from unittest import mock
+
+import pytest
+
+from robottelo.hosts import HostGroup, HostGroupError
+
+
+class FakeHost:
+    def __init__(self, hostname, barrier=None):
+        self.hostname = hostname
+        self.barrier = barrier
+
+    def execute(self, command, timeout=None):
+        if self.barrier:
+            # every host waits for the others, which only works concurrently
+            self.barrier.wait(timeout=5)
+        if self.hostname == 'broken.example.com':
+            raise ConnectionError('host unreachable')
+        return mock.Mock(status=0, stdout=f'{self.hostname}: {command}')
+
+
+def test_run_concurrently():
+    barrier = threading.Barrier(3)
+    hosts = HostGroup(FakeHost(f'host{index}.example.com', barrier) for index in range(3))
+    report = hosts.execute('true').raise_for_errors()
+    assert [result.stdout for result in report.results] == [
+        'host0.example.com: true',
+        'host1.example.com: true',
+        'host2.example.com: true',
+    ]
+    assert hosts[1].hostname == 'host1.example.com'
+
+
+def test_errors_are_reported():
+    hosts = HostGroup([FakeHost('broken.example.com'), FakeHost('host.example.com')])
+    report = hosts.run(lambda host, command: host.execute(command), 'true')
+    assert not report.ok
+    assert report.results[1].stdout == 'host.example.com: true'
+    assert list(report.errors) == ['broken.example.com']
+    with pytest.raises(HostGroupError, match='1 of 2 hosts failed'):
+        report.raise_for_errors()
+
+
+def test_iter_run_bounded():
+    running = []
+    lock = threading.Lock()
+
+    def operation(host):
+        with lock:
+            running.append(host.hostname)
+            assert len(running) <= 2
+        with lock:
+            running.remove(host.hostname)
+        return host.hostname
+
+    hosts = HostGroup([FakeHost(f'host{index}.example.com') for index in range(5)], max_workers=2)
+    assert sorted(result.result for result in hosts.iter_run(operation)) == [
+        f'host{index}.example.com' for index in range(5)
+    ]
+    assert list(HostGroup().iter_run('execute', 'true')) == []
@@ -1,14 +1,25 @@
 from collections import defaultdict
 import os
+import re
 import subprocess
 import sys
+import threading
+import time
+from unittest import mock
 
 from packaging.version import Version
 import pytest
 
 from pytest_plugins.issue_handlers import DEFAULT_BZ_CACHE_FILE
 from robottelo.constants import CLOSED_STATUSES, OPEN_STATUSES, WONTFIX_RESOLUTIONS
-from robottelo.utils.issue_handlers import add_workaround, is_open, should_deselect
+from robottelo.utils.issue_handlers import (
+    add_workaround,
+    bugzilla,
+    is_open,
+    jira,
+    should_deselect,
+)
+from robottelo.utils.issue_handlers.cache import IssueCache
 
 
 class TestBugzillaIssueHandler:
@@ -399,6 +410,83 @@ class TestBugzillaIssueHandler:
         assert os.path.exists(DEFAULT_BZ_CACHE_FILE)
 
 
+class TestBugzillaCache:
+    @pytest.fixture
+    def bugs(self):
+        return {str(number): {'id': number, 'status': 'NEW'} for number in range(1, 6)}
+
+    @pytest.fixture
+    def bz_api(self, mocker, bugs):
+        def get_bz(params):
+            numbers = params['id'].split(',')
+            if 'last_change_time' in params:
+                numbers = [number for number in numbers if bugs[number].get('changed')]
+            return [bugs[number] for number in numbers if number in bugs]
+
+        return mocker.patch('robottelo.utils.issue_handlers.bugzilla.get_bz', side_effect=get_bz)
+
+    @pytest.fixture
+    def issue_cache(self, mocker, tmp_path):
+        cache = IssueCache(tmp_path / 'bugzilla_cache.db', ttl=3600)
+        mocker.patch('robottelo.utils.issue_handlers.cache.get_cache', return_value=cache)
+        mocker.patch.object(bugzilla, 'CACHED_RESPONSES', defaultdict(dict))
+        mocker.patch.object(bugzilla.settings.bugzilla, 'api_key', 'key')
+        return cache
+
+    def test_missing_bugs_are_fetched_in_chunks(self, bz_api, issue_cache, mocker):
+        mocker.patch.object(bugzilla, 'BZ_CHUNK_SIZE', 2)
+        data = bugzilla.get_data_bz(['5', '1', '3', '2', '4'])
+        assert [bug['id'] for bug in data] == [5, 1, 3, 2, 4]
+        assert sorted(call.args[0]['id'] for call in bz_api.call_args_list) == [
+            '3,2',
+            '4',
+            '5,1',
+        ]
+        # fetched bugs are served from the persistent cache
+        bugzilla.CACHED_RESPONSES.clear()
+        bz_api.reset_mock()
+        assert [bug['id'] for bug in bugzilla.get_data_bz(['1', '2'])] == [1, 2]
+        bz_api.assert_not_called()
+
+    def test_only_changed_bugs_are_refreshed(self, bz_api, issue_cache, bugs):
+        bugzilla.get_data_bz(['1', '2'])
+        bugzilla.CACHED_RESPONSES.clear()
+        issue_cache.ttl = 0
+        bugs['2'] = {'id': 2, 'status': 'CLOSED', 'changed': True}
+        data = bugzilla.get_data_bz(['1', '2'])
+        assert [bug['status'] for bug in data] == ['NEW', 'CLOSED']
+        refresh = bz_api.call_args_list[-1].args[0]
+        assert refresh['id'] == '1,2'
+        assert refresh['last_change_time'].endswith('Z')
+
+    def test_bugs_are_fetched_without_the_cache_lock(self, bz_api, issue_cache, mocker):
+        mocker.patch('robottelo.utils.issue_handlers.cache.LOCK_TIMEOUT', 0.1)
+        get_bz = bz_api.side_effect
+
+        def slow_get_bz(params):
+            # another worker uses the cache while Bugzilla answers
+            with IssueCache(issue_cache.cache_file, ttl=3600).locked() as other:
+                other.lookup(['1'])
+            return get_bz(params)
+
+        bz_api.side_effect = slow_get_bz
+        assert [bug['id'] for bug in bugzilla.get_data_bz(['1', '2'])] == [1, 2]
+        with issue_cache.locked():
+            assert issue_cache.lookup(['1', '2'])[0] == {
+                '1': {'id': 1, 'status': 'NEW'},
+                '2': {'id': 2, 'status': 'NEW'},
+            }
+
+    def test_cached_data_only_returns_requested_bugs(self, bz_api, issue_cache):
+        cached_data = {
+            'BZ:1': {'data': {'id': 1, 'status': 'VERIFIED'}},
+            'BZ:9': {'data': {'id': 9, 'status': 'NEW'}},
+        }
+        data = bugzilla.get_data_bz(['1', '2'], cached_data=cached_data)
+        assert data == [{'id': 1, 'status': 'VERIFIED'}, {'id': 2, 'status': 'NEW'}]
+        assert bz_api.call_args.args[0]['id'] == '2'
+
+
 def test_add_workaround():
     """Assert helper function adds current items to given data"""
     data = defaultdict(lambda: {"data": {}, "used_in": []})
@@ -419,3 +507,132 @@ def test_add_workaround():
         used_in = data[issue.strip()]['used_in']
         assert {'usage': 'test', 'foo': 'bar'} in used_in
         assert {'usage': 'test', 'zaz': 'traz'} not in used_in
+
+
+class FakeJira:
+    """Answer Jira searches by key from a dictionary of issues"""
+
+    def __init__(self, issues, page_size=2):
+        self.issues = issues
+        self.page_size = page_size
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def get(self, url, params, headers):
+        with self.lock:
+            self.requests.append(params)
+        keys = re.search(r'key in \(([^)]*)\)', params['jql']).group(1).split(', ')
+        matches = [self.issues[key] for key in keys if key in self.issues]
+        if 'updated >=' in params['jql']:
+            matches = [issue for issue in matches if issue['fields'].get('recent')]
+        start = params.get('startAt', 0)
+        size = min(params.get('maxResults', self.page_size), self.page_size)
+        response = mock.Mock()
+        response.json.return_value = {
+            'startAt': start,
+            'total': len(matches),
+            'issues': matches[start : start + size],
+        }
+        return response
+
+
+def jira_issue(key, status='New', resolution=None, duplicates=None):
+    links = []
+    if duplicates:
+        links.append({'type': {'name': 'Duplicate'}, 'outwardIssue': {'key': duplicates}})
+    return {
+        'key': key,
+        'fields': {
+            'summary': key,
+            'status': {'name': status},
+            'labels': [],
+            'resolution': {'name': resolution} if resolution else None,
+            'fixVersions': [],
+            'issuelinks': links,
+        },
+    }
+
+
+class TestJiraIssueHandler:
+    @pytest.fixture
+    def fake_jira(self, mocker):
+        fake = FakeJira({f'SAT-{i}': jira_issue(f'SAT-{i}') for i in range(5)})
+        mocker.patch('robottelo.utils.issue_handlers.jira.requests.get', side_effect=fake.get)
+        return fake
+
+    @pytest.fixture
+    def issue_cache(self, mocker, tmp_path):
+        cache = IssueCache(tmp_path / 'jira_cache.json', ttl=3600)
+        mocker.patch('robottelo.utils.issue_handlers.cache.get_cache', return_value=cache)
+        mocker.patch.object(jira, 'CACHED_RESPONSES', defaultdict(dict))
+        mocker.patch.object(jira.settings.jira, 'api_key', 'key')
+        return cache
+
+    def test_search_follows_pages(self, fake_jira):
+        issues = jira.search_jira('key in (SAT-0, SAT-1, SAT-2, SAT-3, SAT-4)')
+        assert [issue['key'] for issue in issues] == [f'SAT-{i}' for i in range(5)]
+        assert [request.get('startAt', 0) for request in fake_jira.requests] == [0, 2, 4]
+
+    def test_search_keys_in_chunks(self, fake_jira, mocker):
+        mocker.patch.object(jira, 'JIRA_CHUNK_SIZE', 2)
+        issues = jira.search_jira_keys([f'SAT-{i}' for i in range(5)])
+        assert [issue['key'] for issue in issues] == [f'SAT-{i}' for i in range(5)]
+        assert sorted(request['jql'] for request in fake_jira.requests) == [
+            'key in (SAT-0, SAT-1)',
+            'key in (SAT-2, SAT-3)',
+            'key in (SAT-4)',
+        ]
+
+    def test_data_is_cached_on_disk(self, fake_jira, issue_cache):
+        data = jira.get_data_jira(['SAT-1', 'SAT-0'])
+        assert [jira_data['key'] for jira_data in data] == ['SAT-1', 'SAT-0']
+        assert len(fake_jira.requests) == 1
+        # another process finds the issues in the cache file
+        jira.CACHED_RESPONSES.clear()
+        data = jira.get_data_jira(['SAT-0', 'SAT-1'])
+        assert [jira_data['key'] for jira_data in data] == ['SAT-0', 'SAT-1']
+        assert len(fake_jira.requests) == 1
+
+    def test_stale_data_is_revalidated(self, fake_jira, issue_cache):
+        jira.get_data_jira(['SAT-0', 'SAT-1'])
+        jira.CACHED_RESPONSES.clear()
+        issue_cache.ttl = 0
+        fake_jira.issues['SAT-1'] = jira_issue('SAT-1', status='Closed', resolution='Done')
+        fake_jira.issues['SAT-1']['fields']['recent'] = True
+        data = jira.get_data_jira(['SAT-0', 'SAT-1'])
+        assert [jira_data['status'] for jira_data in data] == ['New', 'Closed']
+        revalidation, refetch = fake_jira.requests[1:]
+        assert 'updated >= -' in revalidation['jql']
+        assert refetch['jql'] == 'key in (SAT-1)'
+
+    def test_duplicates_are_fetched_in_batches(self, fake_jira, issue_cache):
+        fake_jira.issues['SAT-0'] = jira_issue('SAT-0', 'Closed', 'Duplicate', duplicates='SAT-3')
+        fake_jira.issues['SAT-1'] = jira_issue('SAT-1', 'Closed', 'Duplicate', duplicates='SAT-4')
+        collected_data = defaultdict(lambda: {'data': {}, 'used_in': []})
+        collected_data.update({key: {'data': {}, 'used_in': []} for key in ('SAT-0', 'SAT-1')})
+        jira.collect_data_jira(collected_data, None)
+        assert [request['jql'] for request in fake_jira.requests] == [
+            'key in (SAT-0, SAT-1)',
+            'key in (SAT-3, SAT-4)',
+        ]
+        assert collected_data['SAT-0']['data']['dupe_data']['key'] == 'SAT-3'
+        assert collected_data['SAT-4']['is_dupe']
+        assert collected_data['SAT-1']['data']['is_open']
+
+
+def test_issue_cache_is_shared_between_processes(tmp_path):
+    cache_file = tmp_path / 'cache.json'
+    with IssueCache(cache_file, ttl=60).locked() as cache:
+        cache.update({'SAT-1': {'key': 'SAT-1', 'status': 'New'}})
+    other = IssueCache(cache_file, ttl=60)
+    with other.locked():
+        fresh, stale, missing = other.lookup(['SAT-1', 'SAT-2'], fields=['status'])
+        assert fresh == {'SAT-1': {'key': 'SAT-1', 'status': 'New'}}
+        assert (stale, missing) == ({}, ['SAT-2'])
+        # entries without the requested fields are fetched again
+        assert other.lookup(['SAT-1'], fields=['summary'])[2] == ['SAT-1']
+    other.ttl = 0
+    with other.locked():
+        fresh, stale, missing = other.lookup(['SAT-1'])
+        assert list(stale) == ['SAT-1']
+        assert stale['SAT-1'] <= time.time()
@@ -0,0 +1,102 @@
+import io
+import json
+from unittest import mock
+import zipfile
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+import pytest
+
+from robottelo.utils import manifest as manifest_module
+from robottelo.utils.manifest import ManifestClonePool, ManifestCloner
+
+MEMBERS = {
+    'export/meta.json': b'{"version": "4.2"}' * 50,
+    'export/consumer.json': json.dumps({'uuid': 'template', 'owner': {}}).encode(),
+    'export/entitlements/1.json': b'{"pool": 1}' * 200,
+}
+
+
+def make_template():
+    consumer_export = io.BytesIO()
+    with zipfile.ZipFile(consumer_export, 'w', zipfile.ZIP_DEFLATED) as consumer_export_zip:
+        for name, content in MEMBERS.items():
+            consumer_export_zip.writestr(name, content)
+    template = io.BytesIO()
+    with zipfile.ZipFile(template, 'w', zipfile.ZIP_DEFLATED) as template_zip:
+        template_zip.writestr('consumer_export.zip', consumer_export.getvalue())
+        template_zip.writestr('signature', b'signature')
+    return template.getvalue()
+
+
+@pytest.fixture(scope='module')
+def private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def downloads(private_key):
+    """Mock the downloads of the template and signing key"""
+    signing_key = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    contents = {'template_url': make_template(), 'key_url': signing_key}
+    settings = mock.Mock()
+    settings.fake_manifest.url = {'default': 'template_url'}
+    settings.fake_manifest.key_url = 'key_url'
+    with (
+        mock.patch.object(manifest_module, 'settings', settings),
+        mock.patch.object(manifest_module.requests, 'get') as get,
+    ):
+        get.side_effect = lambda url, verify: mock.Mock(content=contents[url])
+        yield get
+
+
+def read_clone(content):
+    """Return the consumer data of a cloned manifest, checking its signature"""
+    with zipfile.ZipFile(content) as manifest_zip:
+        consumer_export = manifest_zip.read('consumer_export.zip')
+        signature = manifest_zip.read('signature')
+    with zipfile.ZipFile(io.BytesIO(consumer_export)) as consumer_export_zip:
+        assert consumer_export_zip.testzip() is None
+        for name, content in MEMBERS.items():
+            if name != 'export/consumer.json':
+                assert consumer_export_zip.read(name) == content
+        consumer_data = json.loads(consumer_export_zip.read('export/consumer.json'))
+    return consumer_data, consumer_export, signature
+
+
+def test_manifest_clone(downloads, private_key):
+    consumer_data, consumer_export, signature = read_clone(
+        ManifestCloner().manifest_clone(org_environment_access=True)
+    )
+    assert consumer_data['uuid'] != 'template'
+    assert consumer_data['contentAccessMode'] == 'org_environment'
+    private_key.public_key().verify(signature, consumer_export, padding.PKCS1v15(), hashes.SHA256())
+
+
+def test_downloads_are_cached(downloads, tmp_path):
+    ManifestCloner(cache_dir=tmp_path).manifest_clone()
+    ManifestCloner(cache_dir=tmp_path).manifest_clone()
+    assert downloads.call_count == 2
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['default.zip', 'signing_key']
+
+
+def test_expired_downloads(downloads, tmp_path, monkeypatch):
+    ManifestCloner(cache_dir=tmp_path).manifest_clone()
+    monkeypatch.setattr(manifest_module, 'MANIFEST_CACHE_TTL', 0)
+    ManifestCloner(cache_dir=tmp_path).manifest_clone()
+    assert downloads.call_count == 4
+
+
+def test_clone_pool(downloads):
+    pool = ManifestClonePool(ManifestCloner(), size=2)
+    uuids = {read_clone(pool.get())[0]['uuid'] for _ in range(5)}
+    assert len(uuids) == 5
+    with pool._condition:
+        # the first manifest of a name is cloned on demand, then ahead of time
+        pool._condition.wait_for(lambda: len(pool._ready['default', False]) == 2, timeout=30)
+        ready = list(pool._ready['default', False])
+    assert read_clone(pool.get())[0]['uuid'] == read_clone(io.BytesIO(ready[0]))[0]['uuid']
@@ -0,0 +1,153 @@
+"""Tests for module ``robottelo.utils.metadata_index``."""
+
+import importlib.util
+import os
+import textwrap
+
+import pytest
+
+from robottelo.utils.metadata_index import MetadataIndex, index_source, parse_tokens
+
+SOURCE = textwrap.dedent(
+    '''
+    """Module docstring
+
+    :CaseComponent: Hosts
+
+    :Team: Endeavour
+
+    :CaseImportance: High
+    """
+
+
+    def is_open(issue):
+        return False
+
+
+    if is_open('BZ:111'):
+        pass
+
+
+    class TestHost:
+        """Class docstring
+
+        :CaseImportance: Critical
+        """
+
+        def test_method(self):
+            """Method docstring
+
+            :BZ: 123, 456
+
+            :Verifies: SAT-1, SAT-2
+
+            :BlockedBy: SAT-3
+            """
+            if not is_open('BZ:222') and True:
+                pass
+            value = 1 if is_open('BZ:333') else 2
+            if is_open('SAT-444'):
+                pass
+            return value
+
+
+    def test_function():
+        def helper():
+            """:Team: Nested"""
+
+        return helper
+
+
+    def make_test():
+        return lambda: None
+
+
+    test_generated = make_test()
+    '''
+)
+
+
+@pytest.fixture
+def test_module(tmp_path):
+    path = tmp_path / 'test_sample.py'
+    path.write_text(SOURCE)
+    spec = importlib.util.spec_from_file_location('test_sample', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_parse_tokens():
+    assert parse_tokens(None) == {}
+    assert parse_tokens(':CaseComponent: Hosts\n:BZ: 1, 2\n:BZ: 3') == {
+        'component': ['Hosts'],
+        'bz': ['1, 2', '3'],
+    }
+
+
+def test_index_source():
+    data = index_source(SOURCE)
+    assert data['component'] == 'Hosts'
+    assert data['tokens'] == {
+        'component': ['Hosts'],
+        'team': ['Endeavour'],
+        'importance': ['High'],
+    }
+    assert data['is_open'] == [
+        ['is_open', 'BZ', '111'],
+        ['not is_open', 'BZ', '222'],
+        ['is_open', 'BZ', '333'],
+    ]
+    assert data['objects']['TestHost']['tokens'] == {'importance': ['Critical']}
+    method = data['objects']['TestHost.test_method']
+    assert method['tokens'] == {
+        'bz': ['123, 456'],
+        'verifies': ['SAT-1, SAT-2'],
+        'blocked_by': ['SAT-3'],
+    }
+    assert method['is_open'] == [['not is_open', 'BZ', '222'], ['is_open', 'BZ', '333']]
+    assert data['objects']['test_function.<locals>.helper']['tokens'] == {'team': ['Nested']}
+
+
+def test_objects_lookup(test_module):
+    index = MetadataIndex()
+    assert index.tokens(test_module)['component'] == ['Hosts']
+    assert index.tokens(test_module.TestHost)['importance'] == ['Critical']
+    assert index.tokens(test_module.TestHost.test_method)['blocked_by'] == ['SAT-3']
+    assert index.tokens(None) == {}
+    assert index.tokens(test_module.test_generated) == {}
+    assert index.is_open_sites(test_module.test_function) == []
+    assert len(index.is_open_sites(test_module)) == 3
+    assert index.component(test_module) == 'Hosts'
+    assert index.parsed == 1
+
+
+def test_cache_file(tmp_path, test_module):
+    cache_file = tmp_path / 'index' / 'metadata_index.json'
+    index = MetadataIndex(cache_file=cache_file)
+    index.file(test_module.__file__)
+    index.save()
+    assert cache_file.exists()
+
+    # unchanged files are served from the cache, even when touched
+    os.utime(test_module.__file__, ns=(1, 1))
+    cached = MetadataIndex(cache_file=cache_file)
+    assert cached.tokens(test_module)['team'] == ['Endeavour']
+    assert cached.parsed == 0
+
+    # changed files are parsed again
+    with open(test_module.__file__, 'a') as module_file:
+        module_file.write('\n\ndef test_new():\n    """:Team: Other"""\n')
+    changed = MetadataIndex(cache_file=cache_file)
+    assert changed.file(test_module.__file__)['objects']['test_new']['tokens'] == {
+        'team': ['Other']
+    }
+    assert changed.parsed == 1
+
+
+def test_unreadable_cache_file(tmp_path, test_module):
+    cache_file = tmp_path / 'metadata_index.json'
+    cache_file.write_text('not json')
+    index = MetadataIndex(cache_file=cache_file)
+    assert index.tokens(test_module)['component'] == ['Hosts']
+    assert index.parsed == 1
@@ -0,0 +1,73 @@
+import multiprocessing
+from unittest import mock
+
+import pytest
+
+from robottelo.utils import port_leases
+from robottelo.utils.port_leases import NoPortAvailable, PortLeases
+
+HOSTNAME = 'sat.example.com'
+PORT_POOL = range(9091, 9096)
+
+
+@pytest.fixture
+def leases(tmp_path):
+    return PortLeases(tmp_path / 'capsule_ports.db')
+
+
+def lease_port(db_file):
+    return PortLeases(db_file).lease(HOSTNAME, PORT_POOL, lambda: [9091])
+
+
+def test_lease_scans_once(leases):
+    scan = mock.Mock(return_value=[9091, 9093])
+    ports = [leases.lease(HOSTNAME, PORT_POOL, scan) for _ in range(3)]
+    assert sorted(ports) == [9092, 9094, 9095]
+    scan.assert_called_once_with()
+    # the pool is scanned again when every port is used or leased
+    with pytest.raises(NoPortAvailable):
+        leases.lease(HOSTNAME, PORT_POOL, scan)
+    assert scan.call_count == 2
+
+
+def test_release(leases):
+    port = leases.lease(HOSTNAME, range(9091, 9092), list)
+    leases.release(HOSTNAME, port)
+    assert leases.lease(HOSTNAME, range(9091, 9092), list) == port
+    # leases are per Satellite
+    assert leases.lease('other.example.com', range(9091, 9092), list) == port
+
+
+def test_scan_is_refreshed(leases, monkeypatch):
+    scan = mock.Mock(return_value=[])
+    leases.lease(HOSTNAME, PORT_POOL, scan)
+    monkeypatch.setattr(port_leases, 'SCAN_TTL', -1)
+    scan.return_value = [9092, 9093, 9094, 9095]
+    with pytest.raises(NoPortAvailable):
+        # the port leased before the scan is still leased
+        leases.lease(HOSTNAME, PORT_POOL, scan)
+
+
+def test_leases_of_dead_processes_are_reclaimed(leases, monkeypatch):
+    port = leases.lease(HOSTNAME, range(9091, 9092), list)
+    monkeypatch.setattr(port_leases, '_is_running', lambda pid: False)
+    assert leases.lease(HOSTNAME, range(9091, 9092), list) == port
+
+
+def test_workers_get_distinct_ports(tmp_path):
+    with multiprocessing.Pool(4) as pool:
+        ports = pool.map(lease_port, [tmp_path / 'capsule_ports.db'] * 4)
+    assert sorted(ports) == [9092, 9093, 9094, 9095]
+
+
+def test_scan_runs_outside_of_transactions(leases, monkeypatch):
+    monkeypatch.setattr(port_leases, 'BUSY_TIMEOUT', 0.1)
+    port = leases.lease(HOSTNAME, PORT_POOL, list)
+
+    def scan():
+        # other workers lease and release ports while the scan runs
+        leases.release(HOSTNAME, port)
+        return [9092]
+
+    monkeypatch.setattr(port_leases, 'SCAN_TTL', -1)
+    assert leases.lease(HOSTNAME, PORT_POOL, scan) == port
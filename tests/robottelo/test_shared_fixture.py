@@ -0,0 +1,127 @@
+import inspect
+from unittest import mock
+
+from nailgun.entities import Entity
+import pytest
+
+from robottelo.utils.decorators.func_shared import fixture as fixture_module
+from robottelo.utils.decorators.func_shared.fixture import _SharedFixture, shared_fixture
+from robottelo.utils.decorators.func_shared.sqlite_storage import SQLiteStorageHandler
+
+
+class Organization(Entity):
+    def __init__(self, id):
+        self.id = id
+
+    def read(self):
+        return self
+
+
+class FakeRequest:
+    def __init__(self, **fixtures):
+        self.fixtures = fixtures
+        self.config = mock.Mock()
+
+    def getfixturevalue(self, name):
+        return self.fixtures[name]
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return SQLiteStorageHandler(db_path=str(tmp_path / 'shared_functions.db'))
+
+
+@pytest.fixture
+def satellite():
+    satellite = mock.Mock(hostname='sat.example.com')
+    satellite.api.Organization.side_effect = Organization
+    return satellite
+
+
+def worker(function, satellite, storage, **fixtures):
+    """Return the shared fixture helper of an xdist worker"""
+    request = FakeRequest(module_target_sat=satellite, **fixtures)
+    return _SharedFixture(function, request, storage_handler=storage)
+
+
+def test_setup_runs_once(satellite, storage):
+    calls = []
+
+    def module_shared_org(module_org, module_target_sat):
+        calls.append(module_org)
+        return {'org': module_org, 'names': ('a', 'b')}
+
+    first = worker(module_shared_org, satellite, storage, module_org=Organization(5))
+    assert first.setup()['org'].id == 5
+    second = worker(module_shared_org, satellite, storage, module_org=Organization(6))
+    result = second.setup()
+    assert len(calls) == 1
+    # entities are read again from the Satellite
+    satellite.api.Organization.assert_called_once_with(id=5)
+    assert result['org'].id == 5
+    assert result['names'] == ('a', 'b')
+
+
+def test_result_is_shared_per_satellite(satellite, storage):
+    def module_shared_value(module_target_sat):
+        return module_target_sat.hostname
+
+    worker(module_shared_value, satellite, storage).setup()
+    other_satellite = mock.Mock(hostname='other.example.com')
+    assert worker(module_shared_value, other_satellite, storage).setup() == 'other.example.com'
+
+
+def test_teardown_waits_for_every_worker(satellite, storage):
+    calls = []
+
+    def module_shared_value(module_target_sat):
+        calls.append('setup')
+        yield 'value'
+        calls.append('teardown')
+
+    first = worker(module_shared_value, satellite, storage)
+    second = worker(module_shared_value, satellite, storage)
+    assert first.setup() == second.setup() == 'value'
+    first.teardown()
+    assert calls == ['setup']
+    (cleanup,) = first._request.config.add_cleanup.call_args.args
+    second.teardown()
+    cleanup()
+    assert calls == ['setup', 'teardown']
+    # a torn down result is set up again
+    assert worker(module_shared_value, satellite, storage).setup() == 'value'
+    assert calls == ['setup', 'teardown', 'setup']
+
+
+def test_unsupported_result(satellite, storage):
+    def module_shared_value(module_target_sat):
+        return object()
+
+    with pytest.raises(fixture_module.SharedFunctionError):
+        worker(module_shared_value, satellite, storage).setup()
+
+
+def test_unsupported_result_torn_down(satellite, storage):
+    calls = []
+
+    def module_shared_value(module_target_sat):
+        calls.append('setup')
+        yield object()
+        calls.append('teardown')
+
+    with pytest.raises(fixture_module.SharedFunctionError):
+        worker(module_shared_value, satellite, storage).setup()
+    assert calls == ['setup', 'teardown']
+
+
+def test_disabled(satellite, monkeypatch):
+    monkeypatch.setattr(fixture_module, 'is_enabled', lambda: False)
+
+    @shared_fixture
+    def module_shared_value(module_org, module_target_sat):
+        return module_org
+
+    # pytest only resolves the dependencies when the setup runs
+    assert list(inspect.signature(module_shared_value).parameters) == ['request']
+    request = FakeRequest(module_target_sat=satellite, module_org='org')
+    assert next(module_shared_value(request)) == 'org'
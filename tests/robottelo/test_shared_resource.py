@@ -4,7 +4,9 @@ import random
 from threading import Thread
 import time
 
-from robottelo.utils.shared_resource import SharedResource
+import pytest
+
+from robottelo.utils.shared_resource import BACKENDS, InotifyBackend, SharedResource
 
 
 def upgrade_action(*args, **kwargs):
@@ -59,3 +61,71 @@ def test_shared_resource_multithreading():
     t2.join()
 
     assert not Path("/tmp/test_resource_th.shared").exists()
+
+
+@pytest.mark.parametrize("backend", ["file", "inotify", "inotify_unavailable"])
+def test_shared_resource_wakes_waiters(backend, monkeypatch):
+    """Waiters are released right after the main watcher finished the action."""
+    # libc is loaded by the backend itself, inotify falls back to polling when unavailable
+    monkeypatch.setattr(
+        InotifyBackend, "_libc", False if backend == "inotify_unavailable" else None
+    )
+    backend = backend.split("_")[0]
+    released = {}
+
+    def watcher():
+        with SharedResource(
+            "test_resource_wake", lambda: None, resource_backend=backend
+        ) as resource:
+            resource.ready()
+            released[resource.id] = time.monotonic()
+
+    thread = Thread(target=watcher)
+    with SharedResource("test_resource_wake", upgrade_action, resource_backend=backend) as main:
+        assert isinstance(main.backend, BACKENDS[backend])
+        thread.start()
+        while len(main._read_state()["watchers"]) < 2:
+            time.sleep(0.01)
+        main.ready()
+        finished = time.monotonic()
+    thread.join()
+    assert list(released.values())[0] - finished < 0.5
+    assert not Path("/tmp/test_resource_wake.shared").exists()
+
+
+def test_shared_resource_recovers_from_action_error():
+    """Another watcher takes over when a recoverable action fails."""
+    calls = []
+    recovered = {}
+
+    def flaky_action():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise RuntimeError("upgrade failed")
+
+    def watcher():
+        with SharedResource(
+            "test_resource_recover", flaky_action, action_is_recoverable=True
+        ) as resource:
+            resource.ready()
+            recovered.update(is_main=resource.is_main, is_recovering=resource.is_recovering)
+
+    main = SharedResource("test_resource_recover", flaky_action, action_is_recoverable=True)
+    thread = Thread(target=watcher)
+
+    def run_main():
+        with main:
+            assert main.is_main
+            thread.start()
+            while len(main._read_state()["watchers"]) < 2:
+                time.sleep(0.01)
+            main.ready()
+
+    with pytest.raises(RuntimeError):
+        run_main()
+    assert not main.is_main
+    thread.join(timeout=30)
+    assert not thread.is_alive()
+    assert recovered == {"is_main": True, "is_recovering": True}
+    assert len(calls) == 2
+    assert not Path("/tmp/test_resource_recover.shared").exists()
@@ -1,7 +1,12 @@
 """Tests for module ``robottelo.utils.ssh``."""
 
+import hashlib
+import io
+from pathlib import Path
 from unittest import mock
 
+import pytest
+
 from robottelo import ssh
 
 
@@ -102,3 +107,214 @@ class TestSSH:
 
         ret = ssh.command('ls -la')
         assert ret[1].cmd == 'ls -la'
+
+
+class MockPooledClient:
+    """A mock pooled client recording how often it was probed and closed."""
+
+    def __init__(self, healthy=True, **kwargs):
+        self.hostname = kwargs.get('hostname')
+        self.healthy = healthy
+        self.execute_ = 0
+        self.close_ = 0
+
+    def execute(self, cmd, *args, **kwargs):
+        self.execute_ += 1
+        if not self.healthy:
+            raise ConnectionError('connection dropped')
+        return mock.Mock(status=0, stdout='', stderr='')
+
+    def close(self):
+        self.close_ += 1
+
+
+class TestSSHConnectionPool:
+    """Tests for ``robottelo.ssh.SSHConnectionPool``."""
+
+    client_kwargs = {'hostname': 'example.com', 'username': 'root', 'port': 22}
+
+    def test_reuses_client(self):
+        pool = ssh.SSHConnectionPool(client_factory=MockPooledClient)
+        first = pool.get(**self.client_kwargs)
+        second = pool.get(**self.client_kwargs)
+        assert first is second
+        assert pool.stats['hits'] == 1
+        assert pool.stats['misses'] == 1
+        assert first.execute_ == 0
+
+    def test_key_per_host_and_user(self):
+        pool = ssh.SSHConnectionPool(client_factory=MockPooledClient)
+        first = pool.get(**self.client_kwargs)
+        other_user = pool.get(**{**self.client_kwargs, 'username': 'admin'})
+        other_host = pool.get(**{**self.client_kwargs, 'hostname': 'example.net'})
+        assert len({id(first), id(other_user), id(other_host)}) == 3
+        assert pool.stats['size'] == 3
+
+    def test_unhealthy_client_is_replaced(self):
+        pool = ssh.SSHConnectionPool(client_factory=MockPooledClient, health_check_interval=0)
+        first = pool.get(**self.client_kwargs)
+        first.healthy = False
+        second = pool.get(**self.client_kwargs)
+        assert first is not second
+        assert first.close_ == 1
+        assert pool.stats['reconnects'] == 1
+
+    def test_idle_client_is_evicted(self):
+        pool = ssh.SSHConnectionPool(client_factory=MockPooledClient, idle_timeout=-1)
+        first = pool.get(**self.client_kwargs)
+        pool.evict_idle()
+        assert first.close_ == 1
+        assert not pool.owns(first)
+        assert pool.stats['evictions'] == 1
+
+    def test_close_all(self):
+        pool = ssh.SSHConnectionPool(client_factory=MockPooledClient)
+        client = pool.get(**self.client_kwargs)
+        pool.close_all()
+        assert client.close_ == 1
+        assert pool.stats['size'] == 0
+
+    def test_dropped_command_is_not_retried(self):
+        pool = ssh.SSHConnectionPool(client_factory=MockPooledClient)
+        client = pool.get(**self.client_kwargs)
+        client.healthy = False
+        with (
+            mock.patch.object(ssh, 'get_connection_pool', return_value=pool),
+            mock.patch.object(ssh, 'get_client', side_effect=lambda **kwargs: client),
+            pytest.raises(ConnectionError),
+        ):
+            ssh.command('yum -y install foo')
+        # the command may have run, it is sent once and the session is dropped
+        assert client.execute_ == 1
+        assert client.close_ == 1
+        assert not pool.owns(client)
+
+
+class MockStreamChannel:
+    """A fake ssh2 channel returning its stdout in chunks"""
+
+    def __init__(self, chunks, status=0, stderr=()):
+        self.chunks = list(chunks)
+        self.status = status
+        self.stderr = list(stderr)
+        self.closed = False
+        self.wait_closed_ = False
+
+    def execute(self, cmd):
+        self.cmd = cmd
+
+    def read(self):
+        if self.chunks:
+            data = self.chunks.pop(0)
+            return len(data), data
+        return 0, b''
+
+    def wait_eof(self):
+        pass
+
+    def get_exit_status(self):
+        return self.status if self.wait_closed_ else 0
+
+    def read_stderr(self):
+        if self.stderr:
+            data = self.stderr.pop(0)
+            return len(data), data
+        return 0, b''
+
+    def close(self):
+        self.closed = True
+
+    def wait_closed(self):
+        assert self.closed
+        self.wait_closed_ = True
+
+
+class TestStreamedResult:
+    """Tests for ``robottelo.ssh.StreamedResult``."""
+
+    def test_streams_chunks(self):
+        data = 'Name\nchårs\n'.encode()
+        # split in the middle of the two bytes character
+        channel = MockStreamChannel([data[:8], data[8:]], status=1, stderr=[b'err', b'or'])
+        client = mock.Mock()
+        client.session.session.open_session.return_value = channel
+        result = ssh.StreamedResult(client, 'hammer host list', timeout='1m')
+        assert ''.join(result) == 'Name\nchårs\n'
+        assert channel.cmd == 'hammer host list'
+        assert channel.closed
+        assert result.status == 1
+        assert result.stderr == 'error'
+        client.session.session.set_timeout.assert_called_once_with(60000)
+
+    def test_buffered_fallback(self):
+        client = mock.Mock()
+        client.session.session = None
+        client.execute.return_value = mock.Mock(status=0, stdout='output', stderr='')
+        result = ssh.StreamedResult(client, 'true')
+        assert list(result) == ['output']
+        assert result.status == 0
+
+
+class MockSFTPHandle:
+    """A fake ssh2 sftp file handle"""
+
+    def __init__(self, content=b''):
+        self.content = content
+        self.writes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def write(self, data):
+        self.writes.append(data)
+        return 0, len(data)
+
+    def read(self, size):
+        data, self.content = self.content[:size], self.content[size:]
+        return len(data), data
+
+
+class TestSFTPStreaming:
+    """Tests for ``robottelo.ssh.sftp_write_data`` and ``robottelo.ssh.sftp_read_into``."""
+
+    @pytest.fixture
+    def client(self):
+        client = mock.Mock()
+        client.handle = MockSFTPHandle(b'x' * (ssh.SFTP_CHUNK_SIZE + 10))
+        client.session.session.sftp_init.return_value.open.return_value = client.handle
+        return client
+
+    @pytest.mark.parametrize(
+        'data',
+        [b'x' * (ssh.SFTP_CHUNK_SIZE + 10), io.BytesIO(b'x' * (ssh.SFTP_CHUNK_SIZE + 10))],
+        ids=['bytes', 'file'],
+    )
+    def test_write_data(self, client, data):
+        ssh.sftp_write_data(client, data, '/var/tmp/manifest.zip')
+        client.execute.assert_called_once_with('mkdir -p /var/tmp')
+        assert [len(chunk) for chunk in client.handle.writes] == [ssh.SFTP_CHUNK_SIZE, 10]
+        assert client.session.sftp_write.call_count == 0
+
+    @pytest.mark.parametrize('remote_path', ['manifest.zip', None], ids=['no_sftp', 'no_path'])
+    def test_write_data_fallback(self, client, tmp_path, remote_path):
+        if remote_path:
+            client.session.session = None
+        client.session.sftp_write.side_effect = lambda source, destination: (
+            client.written.append((Path(source).read_bytes(), destination))
+        )
+        client.written = []
+        with mock.patch('robottelo.config.robottelo_tmp_dir', tmp_path):
+            ssh.sftp_write_data(client, memoryview(b'data'), remote_path)
+        assert client.written == [(b'data', remote_path)]
+        assert client.execute.call_count == 0
+
+    def test_read_into(self, client):
+        content = client.handle.content
+        sink = ssh.sftp_read_into(client, '/var/log/messages', io.BytesIO())
+        assert sink.getvalue() == content
+        client.handle.content = content
+        digest = ssh.sftp_read_into(client, '/var/log/messages', hashlib.sha256())
+        assert digest.hexdigest() == hashlib.sha256(content).hexdigest()
@@ -0,0 +1,132 @@
+"""Tests for ``robottelo.host_helpers.task_watcher``."""
+
+import threading
+import time
+from unittest import mock
+
+from nailgun.entity_mixins import TaskFailedError, TaskTimedOutError
+import pytest
+
+from robottelo.host_helpers.task_watcher import ForemanTaskWatcher
+
+
+class FakeTasks:
+    """Answer bulk task searches from a dictionary of task states"""
+
+    def __init__(self, states):
+        self.states = states
+        self.queries = []
+        self.lock = threading.Lock()
+
+    def search_json(self, query):
+        self.queries.append(query)
+        with self.lock:
+            return {
+                'results': [
+                    {'id': task_id, 'state': state, 'result': result}
+                    for task_id, (state, result) in self.states.items()
+                ]
+            }
+
+
+@pytest.fixture
+def tasks():
+    return FakeTasks({})
+
+
+@pytest.fixture
+def watcher(tasks):
+    satellite = mock.Mock(hostname='satellite.example.com')
+    satellite.api.ForemanTask.return_value = tasks
+    return ForemanTaskWatcher(satellite, min_interval=0.01, max_interval=0.05)
+
+
+def test_wait_returns_finished_tasks(watcher, tasks):
+    tasks.states = {'1': ('stopped', 'success'), '2': ('stopped', 'success')}
+    result = watcher.wait(['2', '1'], timeout=5)
+    assert [task['id'] for task in result] == ['2', '1']
+    assert tasks.queries[0]['search'] == 'id ^ (2, 1)'
+
+
+def test_wait_polls_in_bulk(watcher, tasks):
+    """Concurrent waiters share the searches of a single polling thread"""
+    tasks.states = {str(i): ('running', 'pending') for i in range(4)}
+    results = {}
+
+    def waiter(task_id):
+        results[task_id] = watcher.wait([task_id], timeout=5)
+
+    threads = [threading.Thread(target=waiter, args=(str(i),)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    while len(watcher._futures) < 4:
+        time.sleep(0.01)
+    searched = len(tasks.queries)
+    while len(tasks.queries) < searched + 2:
+        time.sleep(0.01)
+    # a single search covers every waiter
+    assert tasks.queries[-1]['search'] == f'id ^ ({", ".join(watcher._futures)})'
+    with tasks.lock:
+        tasks.states = {str(i): ('stopped', 'success') for i in range(4)}
+    for thread in threads:
+        thread.join()
+    assert sorted(results) == ['0', '1', '2', '3']
+
+
+def test_wait_chunks_large_searches(watcher, tasks):
+    watcher.chunk_size = 2
+    tasks.states = {str(i): ('stopped', 'success') for i in range(5)}
+    watcher.wait([str(i) for i in range(5)], timeout=5)
+    assert [query['per_page'] for query in tasks.queries[:3]] == [2, 2, 1]
+
+
+def test_wait_failed_task(watcher, tasks):
+    tasks.states = {'1': ('paused', 'error')}
+    with pytest.raises(TaskFailedError):
+        watcher.wait(['1'], timeout=5)
+    assert watcher.wait(['1'], timeout=5, must_succeed=False)[0]['result'] == 'error'
+
+
+def test_wait_timeout(watcher, tasks):
+    tasks.states = {'1': ('running', 'pending')}
+    with pytest.raises(TaskTimedOutError):
+        watcher.wait(['1'], timeout=0.1)
+    # nobody waits for the task anymore, so the polling thread stops
+    if watcher._thread:
+        watcher._thread.join(timeout=5)
+    assert not watcher._futures
+
+
+def test_search_errors_are_raised_to_waiters(watcher, tasks):
+    watcher.max_errors = 2
+    tasks.search_json = mock.Mock(side_effect=ConnectionError('refused'))
+    with pytest.raises(ConnectionError):
+        watcher.wait(['1'], timeout=5)
+    assert tasks.search_json.call_count == 2
+
+
+def test_search_errors_are_counted_again_for_new_waiters(watcher, tasks):
+    class Futures(dict):
+        """Register a new waiter right after the failed waiters are dropped"""
+
+        def clear(self):
+            super().clear()
+            if late:
+                late.append(watcher.watch(late.pop()))
+
+    late = ['2']
+    watcher.max_errors = 2
+    watcher._futures = Futures()
+    tasks.search_json = mock.Mock(
+        side_effect=[
+            ConnectionError('refused'),
+            ConnectionError('refused'),
+            ConnectionError('refused'),
+            {'results': [{'id': '2', 'state': 'stopped', 'result': 'success'}]},
+        ]
+    )
+    with pytest.raises(ConnectionError):
+        watcher.wait(['1'], timeout=5)
+    # the new waiter is not failed by the single error following the failure
+    assert late[0].result(timeout=5)['result'] == 'success'
+    assert tasks.search_json.call_count == 4
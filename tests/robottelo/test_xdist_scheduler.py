@@ -0,0 +1,56 @@
+from unittest import mock
+
+import pytest
+
+from pytest_plugins.xdist_scheduler import DurationScopeScheduling
+from robottelo.utils.durations import DurationEstimates
+
+COLLECTION = [
+    'tests/test_short.py::test_a',
+    'tests/test_short.py::test_b',
+    'tests/test_long.py::TestLong::test_a',
+    'tests/test_long.py::test_b',
+    'tests/test_medium.py::test_a',
+    'tests/test_unknown.py::test_a',
+]
+
+
+@pytest.fixture
+def estimates():
+    estimates = DurationEstimates()
+    estimates.update(
+        {
+            'tests/test_short.py::test_a': 1,
+            'tests/test_short.py::test_b': 1,
+            'tests/test_long.py::TestLong::test_a': 50,
+            'tests/test_long.py::test_b': 50,
+            'tests/test_medium.py::test_a': 20,
+        }
+    )
+    return estimates
+
+
+def make_node():
+    node = mock.Mock(shutting_down=False)
+    node.assigned = []
+    node.send_runtest_some.side_effect = lambda indexes: node.assigned.extend(
+        COLLECTION[index] for index in indexes
+    )
+    return node
+
+
+def test_longest_module_first(estimates):
+    config = mock.Mock()
+    config.getvalue.return_value = ['2*popen']
+    scheduler = DurationScopeScheduling(config, estimates=estimates)
+    nodes = [make_node(), make_node()]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, COLLECTION)
+    scheduler.schedule()
+    first, second = nodes
+    # the tests of a module, whatever their class, go to the same worker
+    assert first.assigned[:2] == COLLECTION[2:4]
+    # the unknown module is estimated with the median, 20s
+    assert {first.assigned[2], second.assigned[0]} == {COLLECTION[4], COLLECTION[5]}
+    assert sorted(first.assigned + second.assigned) == sorted(COLLECTION)